@@ -1,9 +1,9 @@
-import json
 import uuid
 
-# Load existing questions
-with open('packages/question-bank/src/questions.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+from iqbank.rescale import rescale_questions
+from iqbank.store import BankStore
+
+store = BankStore()
 
 # New questions to add (50 total: 10 per domain)
 new_questions = [
@@ -614,16 +614,8 @@ new_questions = [
     }
 ]
 
-# Add new questions to existing data
-data['questions'].extend(new_questions)
-
-# Update metadata
-data['version'] = '1.2.0'
-data['lastUpdated'] = '2025-11-26T00:00:00Z'
-
-# Save updated file
-with open('packages/question-bank/src/questions.json', 'w', encoding='utf-8') as f:
-    json.dump(data, f, ensure_ascii=False, indent=2)
+# Append new questions to the bank journal, 0-1 difficulty ratings converted to logits
+store.append(rescale_questions(new_questions))
 
 print(f"Successfully added {len(new_questions)} questions!")
-print(f"Total questions now: {len(data['questions'])}")
+print(f"Pending journal records: {store.pending()} (run `python -m iqbank.publish` to publish them as a new bank version)")
@@ -1,11 +1,9 @@
-import json
 import uuid
 
-# Load existing questions
-with open('packages/question-bank/src/questions.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+from iqbank.rescale import rescale_questions
+from iqbank.store import BankStore
 
-print(f"Current question count: {len(data['questions'])}")
+store = BankStore()
 
 # Phase 2: Generate 130 more questions (26 per domain)
 # Target: 40 questions per domain total
@@ -184,21 +182,12 @@ new_questions_phase2.extend(gwm_questions)
 new_questions_phase2.extend(gv_questions)
 new_questions_phase2.extend(gs_questions)
 
-# Add to existing data
-data['questions'].extend(new_questions_phase2)
-
-# Update metadata
-data['version'] = '2.0.0'
-data['lastUpdated'] = '2025-11-26T13:00:00Z'
-
-# Save
-with open('packages/question-bank/src/questions.json', 'w', encoding='utf-8') as f:
-    json.dump(data, f, ensure_ascii=False, indent=2)
+# Append to the bank journal, 0-1 difficulty ratings converted to logits
+store.append(rescale_questions(new_questions_phase2))
 
 print(f"✅ Phase 2 Complete!")
 print(f"Added: {len(new_questions_phase2)} questions")
-print(f"Total: {len(data['questions'])} questions")
-print(f"\nBreakdown per domain:")
+print(f"\nAdded per domain:")
 for domain in ['Gf', 'Gc', 'Gwm', 'Gv', 'Gs']:
-    count = sum(1 for q in data['questions'] if q['domain'] == domain)
+    count = sum(1 for q in new_questions_phase2 if q['domain'] == domain)
     print(f"  {domain}: {count} questions")
@@ -1,5 +1,6 @@
 import { FastifyInstance, FastifyRequest, FastifyReply } from 'fastify';
 import { z } from 'zod';
+import { getAnswerFeedback } from '@iq-test/question-bank';
 import { getScoringEngine } from '../services/scoring-engine';
 import { getQuestionBank } from '../services/question-bank';
 import { logger } from '../utils/logger';
@@ -64,15 +65,16 @@ export async function answersRouter(fastify: FastifyInstance) {
         sessionStore.updateTheta(sessionId, updatedTheta);
 
         logger.info(
-          `Answer submitted for session ${sessionId}: ${isCorrect ? 'correct' : 'incorrect'}`
+          `Answer submitted for session ${sessionId}: ${isCorrect ? 'correct' : 'incorrect'}`,
+          { sessionId, questionId, isCorrect }
         );
 
         return {
           isCorrect,
           updatedTheta,
-          feedback: isCorrect
-            ? 'صحيح! إجابة ممتازة'
-            : 'غير صحيح. المحاولة مرة أخرى',
+          feedback:
+            getAnswerFeedback(questionId, question.options.indexOf(answer)) ??
+            (isCorrect ? 'صحيح! إجابة ممتازة' : 'غير صحيح. المحاولة مرة أخرى'),
         };
       } catch (error) {
         logger.error('Error submitting answer', error);
@@ -1,5 +1,7 @@
 import { FastifyInstance, FastifyRequest, FastifyReply } from 'fastify';
 import { z } from 'zod';
+import { getMostInformative } from '@iq-test/question-bank';
+import { AdaptiveScoringEngine } from '@iq-test/scoring-engine';
 import { getScoringEngine } from '../services/scoring-engine';
 import { getQuestionBank } from '../services/question-bank';
 import { logger } from '../utils/logger';
@@ -19,11 +21,14 @@ export async function questionsRouter(fastify: FastifyInstance) {
       const questionBank = await getQuestionBank();
       const scoringEngine = await getScoringEngine();
 
-      // Get the next best question based on adaptive logic
+      // Get the next best question based on adaptive logic, ranked by the
+      // precomputed information table when one was built for this bank version
+      const usedIds = Object.keys(currentResponses);
       const nextQuestion = await scoringEngine.getNextQuestion(
         questionBank.questions,
-        Object.keys(currentResponses),
-        currentTheta
+        usedIds,
+        currentTheta,
+        getMostInformative(currentTheta, usedIds, AdaptiveScoringEngine.CANDIDATES)
       );
 
       if (!nextQuestion) {
@@ -32,7 +37,10 @@ export async function questionsRouter(fastify: FastifyInstance) {
         });
       }
 
-      logger.info(`Served question ${nextQuestion.id} for session ${sessionId}`);
+      logger.info(`Served question ${nextQuestion.id} for session ${sessionId}`, {
+        sessionId,
+        questionId: nextQuestion.id,
+      });
 
       return {
         question: {
@@ -1,5 +1,8 @@
 import { FastifyInstance, FastifyRequest, FastifyReply } from 'fastify';
 import { z } from 'zod';
+import { getInterpretation } from '@iq-test/question-bank';
+import { scoreResponses } from '@iq-test/scoring-engine';
+import { getQuestionBank } from '../services/question-bank';
 import { logger } from '../utils/logger';
 
 const GetResultsSchema = z.object({
@@ -28,53 +31,48 @@ export async function resultsRouter(fastify: FastifyInstance) {
         // Mark session as ended
         sessionStore.endSession(sessionId);
 
-        // Calculate scores by domain
-        const domains: Record<string, { score: number; percentile: number }> = {};
-        const domainStats: Record<string, { correct: number; total: number }> = {};
-
-        // Initialize domain stats
-        ['Gf', 'Gc', 'Gwm', 'Gv', 'Gs'].forEach(domain => {
-          domainStats[domain] = { correct: 0, total: 0 };
-        });
+        // Score the engine's θ, replayed over the responses, through the norm tables
+        const questionBank = await getQuestionBank();
+        const discrimination = new Map<string, number>(
+          questionBank.questions.map((q: any) => [q.id, q.discrimination])
+        );
+        const scored = scoreResponses(
+          session.responses.map(r => ({
+            domain: r.domain,
+            isCorrect: r.isCorrect,
+            difficulty: r.difficulty,
+            discrimination: discrimination.get(r.questionId) ?? 1,
+          }))
+        );
 
-        // Count correct answers per domain
-        session.responses.forEach(response => {
-          if (!domainStats[response.domain]) {
-            domainStats[response.domain] = { correct: 0, total: 0 };
-          }
-          domainStats[response.domain].total++;
-          if (response.isCorrect) {
-            domainStats[response.domain].correct++;
+        const clampPercentile = (p: number) => Math.min(99, Math.max(1, Math.round(p)));
+        const domains: Record<string, { score: number; percentile: number }> = {};
+        // Only the domains the session answered items in; untested domains are left out
+        Object.entries(scored.domains).forEach(([domain, scale]) => {
+          if (scale) {
+            domains[domain] = { score: Math.round(scale.score), percentile: clampPercentile(scale.percentile) };
           }
         });
+        const totalScore = Math.round(scored.total.score);
+        const percentile = clampPercentile(scored.total.percentile);
 
-        // Calculate scores (simple percentage to IQ scale conversion)
-        Object.entries(domainStats).forEach(([domain, stats]) => {
-          const percentage = stats.total > 0 ? (stats.correct / stats.total) * 100 : 0;
-          const score = 100 + (percentage - 50) * 0.6; // Convert to IQ scale
-          const percentile = Math.min(99, Math.max(1, Math.round(percentage)));
-          domains[domain] = { score: Math.round(score), percentile };
-        });
-
-        // Calculate total score
-        const totalCorrect = session.responses.filter(r => r.isCorrect).length;
-        const totalQuestions = session.responses.length;
-        const totalPercentage = totalQuestions > 0 ? (totalCorrect / totalQuestions) * 100 : 0;
-        const totalScore = Math.round(100 + (totalPercentage - 50) * 0.6);
-        const percentile = Math.min(99, Math.max(1, Math.round(totalPercentage)));
-
-        // Generate interpretation
-        let interpretation = '';
-        if (totalScore >= 130) {
-          interpretation = 'نتيجة استثنائية! أنت في الفئة العليا جداً من حيث الذكاء العام.';
-        } else if (totalScore >= 120) {
-          interpretation = 'نتيجة ممتازة جداً. أنت في الفئة العليا من حيث الذكاء العام.';
-        } else if (totalScore >= 110) {
-          interpretation = 'نتيجة جيدة جداً. أنت فوق المتوسط في الذكاء العام.';
-        } else if (totalScore >= 90) {
-          interpretation = 'نتيجة جيدة. أنت في المتوسط من حيث الذكاء العام.';
-        } else {
-          interpretation = 'نتيجة مقبولة. هناك مجال للتحسين.';
+        // Generate interpretation: pregenerated text for this score profile if available
+        const domainScores = Object.fromEntries(
+          Object.entries(domains).map(([domain, { score }]) => [domain, score])
+        );
+        let interpretation = getInterpretation(totalScore, domainScores) ?? '';
+        if (!interpretation) {
+          if (totalScore >= 130) {
+            interpretation = 'نتيجة استثنائية! أنت في الفئة العليا جداً من حيث الذكاء العام.';
+          } else if (totalScore >= 120) {
+            interpretation = 'نتيجة ممتازة جداً. أنت في الفئة العليا من حيث الذكاء العام.';
+          } else if (totalScore >= 110) {
+            interpretation = 'نتيجة جيدة جداً. أنت فوق المتوسط في الذكاء العام.';
+          } else if (totalScore >= 90) {
+            interpretation = 'نتيجة جيدة. أنت في المتوسط من حيث الذكاء العام.';
+          } else {
+            interpretation = 'نتيجة مقبولة. هناك مجال للتحسين.';
+          }
         }
 
         logger.info(`Results retrieved for session ${sessionId}`);
@@ -1,16 +1,29 @@
-import { loadQuestionBank } from '@iq-test/question-bank';
+import { loadQuestionBank, refreshQuestionBank } from '@iq-test/question-bank';
+
+// How often to check for a newly published bank version (one stat() per check)
+const REFRESH_INTERVAL_MS = 5000;
 
 let questionBankCache: any = null;
+let lastRefresh = 0;
 
 export async function getQuestionBank() {
   if (!questionBankCache) {
     try {
       questionBankCache = loadQuestionBank();
+      lastRefresh = Date.now();
     } catch (error) {
       console.error('Failed to load question bank', error);
       // Return empty question bank as fallback
       questionBankCache = { questions: [] };
     }
+  } else if (Date.now() - lastRefresh > REFRESH_INTERVAL_MS) {
+    lastRefresh = Date.now();
+    try {
+      questionBankCache = refreshQuestionBank();
+    } catch (error) {
+      // Keep serving the version already loaded
+      console.error('Failed to refresh question bank', error);
+    }
   }
   return questionBankCache;
 }
@@ -3,7 +3,7 @@ import winston from 'winston';
 export function initializeLogger() {
   return winston.createLogger({
     level: process.env.LOG_LEVEL || 'info',
-    format: winston.format.json(),
+    format: winston.format.combine(winston.format.timestamp(), winston.format.json()),
     defaultMeta: { service: 'iq-test-backend' },
     transports: [
       new winston.transports.File({ filename: 'error.log', level: 'error' }),
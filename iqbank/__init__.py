@@ -0,0 +1,6 @@
+"""Offline tooling for the Arabic IQ question bank.
+
+The TypeScript packages under packages/ serve the bank; this package holds the
+Python side that builds, calibrates and analyses it. Run modules from the
+repository root, e.g. ``python -m iqbank.store status``.
+"""
@@ -0,0 +1,26 @@
+"""Arabic text normalization for matching item stems and options."""
+
+import re
+
+# Tashkeel (fathatan..sukun), superscript alef and tatweel.
+_DIACRITICS = re.compile('[ً-ْٰـ]')
+
+_TRANSLATE = str.maketrans({
+    # Arabic-Indic and Eastern Arabic-Indic digits
+    **{chr(0x0660 + i): str(i) for i in range(10)},
+    **{chr(0x06f0 + i): str(i) for i in range(10)},
+    # Alef variants, alef maksura, teh marbuta
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ى': 'ي',
+    'ة': 'ه',
+    # Arabic separators
+    '،': ',', '؛': ';', '؟': '?', '٫': '.', '٬': ',',
+})
+
+_SEPARATORS = re.compile(r'[\s,;:?!.\'"()\[\]{}«»\-–—_/\\|]+')
+
+
+def normalize(text):
+    """Fold diacritics, letter variants, digits and separators to a canonical form."""
+    text = _DIACRITICS.sub('', text).translate(_TRANSLATE).lower()
+    return ' '.join(_SEPARATORS.sub(' ', text).split())
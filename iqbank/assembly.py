@@ -0,0 +1,211 @@
+"""Content-balanced test assembly with shadow tests.
+
+Before each item, a full-length "shadow" test is assembled that contains
+every item already administered, has exactly ``test_length`` items, meets
+the per-domain quotas and has maximum information at the current θ; the
+next item is the most informative not-yet-administered item of that shadow
+test, and there is none once the session has reached full length.
+
+With domain quotas as the only constraints the 0-1 program
+
+    max Σ I_i(θ) x_i   s.t.   Σ_{i ∈ d} x_i = q_d for each domain d,
+                              x_i = 1 for administered items,  x_i ∈ {0, 1}
+
+separates by domain, so taking the top ``q_d - used_d`` remaining items of
+each domain is an exact optimum, not an approximation. That is one
+argpartition per domain, well under a millisecond for a 5k-item bank. When
+administered items overfill a domain, the quotas of the other domains can no
+longer all be met within ``test_length``; the slots left are then spread over
+the domains still short, taking one item at a time from the domain furthest
+below its quota, its least informative pick first.
+
+PlanCache memoizes shadow tests by (θ rounded to a grid step, used items)
+and can precompute the starting plans for a grid of θ.
+
+    python -m iqbank.assembly --theta 0.4 [--used ID,ID,...] [--test-length 20]
+    python -m iqbank.assembly --precompute plans.json
+    python -m iqbank.assembly --benchmark --items 5000
+"""
+
+import argparse
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .irt import ItemBank, item_information
+from .store import DEFAULT_BANK_PATH, DOMAINS
+
+TEST_LENGTH = 20
+
+
+def domain_quotas(test_length=TEST_LENGTH, n_domains=len(DOMAINS)):
+    """Spread ``test_length`` evenly over domains, earlier domains taking the remainder."""
+    quotas = np.full(n_domains, test_length // n_domains, dtype=np.int64)
+    quotas[:test_length % n_domains] += 1
+    return quotas
+
+
+@dataclass
+class ShadowTest:
+    items: np.ndarray  # bank rows, administered items first
+    free: np.ndarray  # rows of ``items`` not administered yet, most informative first
+    information: float  # test information at θ
+
+    @property
+    def next_item(self):
+        return int(self.free[0]) if len(self.free) else None
+
+
+class ShadowTestAssembler:
+    def __init__(self, bank, test_length=TEST_LENGTH, quotas=None, model='2pl'):
+        self.bank = bank
+        self.test_length = test_length
+        self.quotas = np.asarray(quotas if quotas is not None else domain_quotas(test_length), dtype=np.int64)
+        if self.quotas.sum() != test_length:
+            raise ValueError(f'quotas sum to {self.quotas.sum()}, not the test length {test_length}')
+        self.model = model
+        self._c = bank.guessing if model == '3pl' else None
+        self._rows = [np.flatnonzero(bank.domain == d) for d in range(len(DOMAINS))]
+        short = [DOMAINS[d] for d, rows in enumerate(self._rows) if len(rows) < self.quotas[d]]
+        if short:
+            raise ValueError(f"bank has fewer items than the quota for {', '.join(short)}")
+
+    def assemble(self, theta, used=()):
+        """Shadow test at ``theta`` containing the administered bank rows ``used``."""
+        used = np.asarray(list(used), dtype=np.int64)
+        info = item_information(float(theta), self.bank.discrimination, self.bank.difficulty, self._c)
+        used_info = float(info[used].sum())
+        info[used] = -np.inf
+        short = np.maximum(self.quotas - np.bincount(self.bank.domain[used], minlength=len(DOMAINS)), 0)
+        slots = max(self.test_length - len(used), 0)
+
+        picks = []  # per domain, its top ``short[d]`` items, most informative first
+        for d, rows in enumerate(self._rows):
+            k = int(short[d])
+            if k <= 0:
+                picks.append(np.empty(0, dtype=np.int64))
+                continue
+            domain_info = info[rows]
+            top = rows[np.argpartition(-domain_info, k - 1)[:k] if k < len(rows) else np.arange(len(rows))]
+            picks.append(top[np.argsort(-info[top], kind='stable')])
+        take = short.copy()
+        for _ in range(int(short.sum()) - slots):
+            d = max((d for d in range(len(DOMAINS)) if take[d]),
+                    key=lambda d: (take[d], -info[picks[d][take[d] - 1]]))
+            take[d] -= 1
+
+        free = np.concatenate([top[:k] for top, k in zip(picks, take)])
+        free = free[np.argsort(-info[free], kind='stable')]
+        return ShadowTest(items=np.concatenate([used, free]), free=free,
+                          information=used_info + float(info[free].sum()))
+
+    def next_item(self, theta, used=()):
+        return self.assemble(theta, used).next_item
+
+
+class PlanCache:
+    """LRU cache of shadow tests keyed by (θ on a ``theta_step`` grid, administered rows)."""
+
+    def __init__(self, assembler, theta_step=0.05, maxsize=4096):
+        self.assembler = assembler
+        self.theta_step = theta_step
+        self.maxsize = maxsize
+        self._plans = OrderedDict()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._plans)
+
+    def _theta(self, step):
+        return round(step * self.theta_step, 6)
+
+    def _key(self, theta, used):
+        return round(theta / self.theta_step), tuple(sorted(int(u) for u in used))
+
+    def get(self, theta, used=()):
+        key = self._key(theta, used)
+        plan = self._plans.get(key)
+        if plan is not None:
+            self._plans.move_to_end(key)
+            self.hits += 1
+            return plan
+        self.misses += 1
+        plan = self.assembler.assemble(self._theta(key[0]), key[1])
+        self._plans[key] = plan
+        if len(self._plans) > self.maxsize:
+            self._plans.popitem(last=False)
+        return plan
+
+    def precompute(self, thetas, used=()):
+        """Fill the cache for each θ in ``thetas`` at the given (usually empty) state."""
+        for theta in thetas:
+            self.get(theta, used)
+
+    def save(self, path):
+        """Write cached plans as JSON: bank ids per state, for serving without numpy."""
+        ids = self.assembler.bank.ids
+        plans = [{'theta': self._theta(step), 'used': [ids[u] for u in used],
+                  'items': [ids[i] for i in plan.items], 'next': ids[plan.next_item]}
+                 for (step, used), plan in self._plans.items() if plan.next_item is not None]
+        Path(path).write_text(json.dumps({'thetaStep': self.theta_step, 'plans': plans}), encoding='utf-8')
+
+
+def _benchmark(n_items, test_length, repeat=200, seed=0):
+    from .synth import synthetic_questions
+
+    bank = ItemBank.from_questions(synthetic_questions(n_items, seed))
+    assembler = ShadowTestAssembler(bank, test_length)
+    rng = np.random.default_rng(seed)
+    times = []
+    for _ in range(repeat):
+        used = rng.choice(n_items, size=int(rng.integers(0, test_length)), replace=False)
+        started = time.perf_counter()
+        assembler.assemble(float(rng.uniform(-3, 3)), used)
+        times.append(time.perf_counter() - started)
+    times = np.array(times) * 1000
+    print(f'{n_items} items, length {test_length}: median {np.median(times):.3f} ms, '
+          f'p99 {np.percentile(times, 99):.3f} ms, max {times.max():.3f} ms')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Assemble a content-balanced shadow test')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH)
+    parser.add_argument('--theta', type=float, default=0.0)
+    parser.add_argument('--used', default='', help='Comma-separated ids of administered items')
+    parser.add_argument('--test-length', type=int, default=TEST_LENGTH)
+    parser.add_argument('--model', choices=['2pl', '3pl'], default='2pl')
+    parser.add_argument('--precompute', type=Path, help='Write starting plans for θ in [-3, 3] to this JSON file')
+    parser.add_argument('--benchmark', action='store_true', help='Time solves on a synthetic bank')
+    parser.add_argument('--items', type=int, default=5000, help='Synthetic bank size for --benchmark')
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        _benchmark(args.items, args.test_length)
+        return
+
+    bank = ItemBank.load(args.bank)
+    assembler = ShadowTestAssembler(bank, args.test_length, model=args.model)
+    if args.precompute:
+        cache = PlanCache(assembler)
+        cache.precompute(np.arange(-3, 3 + 1e-9, cache.theta_step))
+        cache.save(args.precompute)
+        print(f'Wrote {len(cache)} starting plans to {args.precompute}')
+        return
+
+    used = [bank.row(item_id) for item_id in args.used.split(',') if item_id]
+    shadow = assembler.assemble(args.theta, used)
+    free = set(shadow.free.tolist())
+    for row in shadow.items:
+        mark = '*' if row == shadow.next_item else (' ' if row in free else 'x')
+        print(f'{mark} {DOMAINS[bank.domain[row]]:4s} a={bank.discrimination[row]:.2f} '
+              f'b={bank.difficulty[row]:+.2f}  {bank.ids[row]}')
+    print(f'\nTest information at θ={args.theta:+.2f}: {shadow.information:.2f} '
+          f'(x administered, * next)')
+
+
+if __name__ == '__main__':
+    main()
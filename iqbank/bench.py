@@ -0,0 +1,217 @@
+"""Benchmarks for the question-bank hot paths.
+
+For synthetic banks of each requested size this times
+
+- load:      json.load of questions.json vs. opening the compiled bank,
+- lookup:    id -> item by linear scan (as questionBank.questions.find does)
+             vs. the dict in ItemBank vs. the compiled hash index,
+- domain:    filtering all items of one domain vs. the domain index range,
+- info:      item information for the whole bank at one θ,
+- select:    top-15 selection as in AdaptiveScoringEngine.getNextQuestion
+             (full sort) vs. argpartition vs. the precomputed info table,
+
+and appends one JSON record per measurement to a history file, comparing
+each against the previous run of the same benchmark on the same machine.
+
+    python -m iqbank.bench --sizes 1000 10000 100000 [--history benchmarks/history.jsonl]
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from .build import artifact_path, build
+from .compiled import CompiledBank
+from .indexes import BankIndex
+from .infotable import InfoTable
+from .irt import ItemBank
+from .store import DOMAINS, REPO_ROOT
+from .synth import write_synthetic_bank
+
+DEFAULT_HISTORY_PATH = REPO_ROOT / 'benchmarks' / 'history.jsonl'
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+# A result this much slower than the previous run is reported as a regression.
+REGRESSION_RATIO = 1.2
+
+TOP_N = 15
+
+
+def measure(fn, repeat=5, number=1):
+    """Best and median seconds per call over ``repeat`` rounds of ``number`` calls."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - started) / number)
+    return min(times), float(np.median(times))
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(size, workdir, repeat=5, seed=0):
+    """Yield (benchmark, best, median) for a synthetic bank of ``size`` items."""
+    bank_path = Path(workdir) / f'bank-{size}' / 'questions.json'
+    bank_path.parent.mkdir(parents=True, exist_ok=True)
+    write_synthetic_bank(bank_path, size, seed)
+    build(bank_path)
+    compiled_path = artifact_path(bank_path, 'bank')
+
+    def load_json():
+        with open(bank_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def open_compiled():
+        bank = CompiledBank(compiled_path)
+        return float(bank.difficulty.sum())
+
+    yield 'load.json', *measure(load_json, repeat=min(repeat, 3))
+    yield 'load.compiled', *measure(open_compiled, repeat=repeat, number=10)
+
+    questions = load_json()['questions']
+    items = ItemBank.from_questions(questions)
+    index = BankIndex(artifact_path(bank_path, 'index'))
+    table = InfoTable(artifact_path(bank_path, 'info'))
+    rng = random.Random(seed)
+    probe_ids = [questions[rng.randrange(size)]['id'] for _ in range(100)]
+    items.row(probe_ids[0])  # build the dict outside the timed region
+
+    def linear_lookup():
+        for item_id in probe_ids[:10]:
+            next(q for q in questions if q['id'] == item_id)
+
+    def dict_lookup():
+        for item_id in probe_ids:
+            items.row(item_id)
+
+    def index_lookup():
+        for item_id in probe_ids:
+            index.row(item_id)
+
+    yield 'lookup.linear', *(t / 10 for t in measure(linear_lookup, repeat=repeat))
+    yield 'lookup.dict', *(t / 100 for t in measure(dict_lookup, repeat=repeat, number=10))
+    yield 'lookup.index', *(t / 100 for t in measure(index_lookup, repeat=repeat, number=10))
+
+    domain = DOMAINS[2]
+    yield 'domain.filter', *measure(lambda: [q for q in questions if q['domain'] == domain], repeat=repeat)
+    yield 'domain.index', *measure(lambda: index.domain_rows(domain), repeat=repeat, number=100)
+    yield 'domain.near', *measure(lambda: index.near(domain, 0.5, 0.1), repeat=repeat, number=100)
+
+    theta = 0.3
+    used_rows = rng.sample(range(size), min(20, size - TOP_N))
+    used_mask = np.zeros(size, dtype=bool)
+    used_mask[used_rows] = True
+    used_set = set(used_rows)
+
+    def sort_select():
+        info = items.information(theta)
+        info[used_mask] = -np.inf
+        return np.argsort(-info)[:TOP_N]
+
+    def partition_select():
+        info = items.information(theta)
+        info[used_mask] = -np.inf
+        return np.argpartition(-info, TOP_N)[:TOP_N]
+
+    yield 'info.vectorized', *measure(lambda: items.information(theta), repeat=repeat, number=10)
+    yield 'select.sort', *measure(sort_select, repeat=repeat, number=10)
+    yield 'select.partition', *measure(partition_select, repeat=repeat, number=10)
+    yield 'select.table', *measure(lambda: table.top_n(theta, used_set, TOP_N), repeat=repeat, number=100)
+
+
+def read_history(path):
+    path = Path(path)
+    if not path.exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def previous_results(history, machine):
+    """Latest best time per (benchmark, size) recorded on ``machine``."""
+    latest = {}
+    for record in history:
+        if record.get('machine') == machine:
+            latest[(record['benchmark'], record['size'])] = record['best']
+    return latest
+
+
+def run(sizes, history_path=DEFAULT_HISTORY_PATH, repeat=5, seed=0, record=True):
+    """Run every benchmark for ``sizes``; returns the new records."""
+    machine = f'{platform.node()}/{platform.machine()}'
+    previous = previous_results(read_history(history_path), machine)
+    common = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'machine': machine,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+    }
+
+    records = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            for name, best, median in run_size(size, workdir, repeat, seed):
+                before = previous.get((name, size))
+                records.append(dict(common, benchmark=name, size=size, best=best, median=median,
+                                    ratio=best / before if before else None))
+
+    if record:
+        history_path = Path(history_path)
+        history_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(history_path, 'a', encoding='utf-8') as f:
+            for r in records:
+                f.write(json.dumps(r) + '\n')
+    return records
+
+
+def _format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:8.2f} {unit}'
+    return f'{seconds / 1e-9:8.2f} ns'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark question-bank load, lookup and selection')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--history', default=DEFAULT_HISTORY_PATH, type=Path)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--no-record', action='store_true', help='Do not append to the history file')
+    args = parser.parse_args(argv)
+
+    records = run(args.sizes, args.history, args.repeat, record=not args.no_record)
+    regressions = 0
+    print(f"{'benchmark':18s} {'size':>9s} {'best':>11s} {'median':>11s}  vs. last")
+    for r in records:
+        change = ''
+        if r['ratio'] is not None:
+            change = f"{r['ratio']:.2f}x"
+            if r['ratio'] > REGRESSION_RATIO:
+                change += '  REGRESSION'
+                regressions += 1
+        print(f"{r['benchmark']:18s} {r['size']:9d} {_format_seconds(r['best'])} "
+              f"{_format_seconds(r['median'])}  {change}")
+    if not args.no_record:
+        print(f"\nAppended {len(records)} results to {args.history}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+"""Binary container shared by the compiled bank artifacts.
+
+Layout (all integers little-endian):
+
+    offset 0   8 bytes   magic b'IQBANK\\x00\\x01'
+    offset 8   u32       header length in bytes
+    offset 12  header    UTF-8 JSON: {"kind", "meta", "arrays": {name: {"dtype", "shape", "offset"}}}
+    ...        arrays    raw C-order array data, each starting on a 64-byte boundary
+
+Offsets are absolute, so any reader that can parse JSON and map a file (Python
+``np.memmap``, Node ``Buffer``/``TypedArray``) can read arrays without copying.
+
+A string column ``<name>`` is stored as two arrays: ``<name>.heap`` (uint8,
+the UTF-8 strings concatenated) and ``<name>.offsets`` (int64, n + 1), string
+i being ``heap[offsets[i]:offsets[i + 1]]``.
+"""
+
+import json
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b'IQBANK\x00\x01'
+ALIGN = 64
+
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def string_column(values):
+    """(heap, offsets) arrays for the strings ``values``."""
+    encoded = [v.encode('utf-8') for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(v) for v in encoded], out=offsets[1:])
+    heap = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return heap, offsets
+
+
+def write_binfile(path, kind, arrays, meta=None):
+    """Write ``arrays`` (name -> ndarray) to ``path`` atomically."""
+    path = Path(path)
+    arrays = {name: np.ascontiguousarray(value) for name, value in arrays.items()}
+
+    # The header size depends on the offsets it records; iterate until stable.
+    header_len = 0
+    while True:
+        offset = _align(len(MAGIC) + 4 + header_len)
+        layout = {}
+        for name, value in arrays.items():
+            layout[name] = {'dtype': value.dtype.str, 'shape': list(value.shape), 'offset': offset}
+            offset = _align(offset + value.nbytes)
+        header = json.dumps({'kind': kind, 'meta': meta or {}, 'arrays': layout},
+                            ensure_ascii=False).encode('utf-8')
+        if len(header) == header_len:
+            break
+        header_len = len(header)
+
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        for name, value in arrays.items():
+            f.seek(layout[name]['offset'])
+            f.write(value.tobytes())
+        f.truncate(offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class BinFile:
+    """Read-only memory-mapped view of a container written by ``write_binfile``."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._map = np.memmap(self.path, dtype=np.uint8, mode='r')
+        if bytes(self._map[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f'{self.path} is not an iqbank binary file')
+        (header_len,) = struct.unpack('<I', bytes(self._map[len(MAGIC):len(MAGIC) + 4]))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(self._map[start:start + header_len]).decode('utf-8'))
+        self.kind = header['kind']
+        self.meta = header['meta']
+        self._layout = header['arrays']
+        self._arrays = {}
+
+    def __contains__(self, name):
+        return name in self._layout
+
+    def __getitem__(self, name):
+        if name not in self._arrays:
+            spec = self._layout[name]
+            dtype = np.dtype(spec['dtype'])
+            count = int(np.prod(spec['shape'], dtype=np.int64))
+            start = spec['offset']
+            view = self._map[start:start + count * dtype.itemsize].view(dtype)
+            self._arrays[name] = view.reshape(spec['shape'])
+        return self._arrays[name]
+
+    def names(self):
+        return list(self._layout)
+
+    def strings(self, name):
+        """Every string of the string column ``name``, decoded."""
+        heap, offsets = bytes(self[f'{name}.heap']), self[f'{name}.offsets'].tolist()
+        return [heap[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+
+def read_binfile(path, kind=None):
+    binfile = BinFile(path)
+    if kind is not None and binfile.kind != kind:
+        raise ValueError(f'{path} holds {binfile.kind!r}, expected {kind!r}')
+    return binfile
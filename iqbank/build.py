@@ -0,0 +1,80 @@
+"""Build the binary artifacts that ship next to questions.json.
+
+    python -m iqbank.build [--bank path/to/questions.json] [--out-dir dir]
+
+Artifacts are built from the published bank file (unpublished journal edits
+are left out, as the backend does not serve them), are named after it and
+record the bank version and content hash they were built from. The backend image builds them
+(``npm run build:artifacts -w @iq-test/question-bank`` in
+apps/backend/Dockerfile); the questions route ranks candidates with the
+information table through getMostInformative in @iq-test/question-bank while
+it matches the served bank version, and computes information otherwise.
+
+- ``questions.bank.bin``  columnar, memory-mappable bank (compiled.py)
+- ``questions.index.bin`` id hash, domain and difficulty-bucket indexes (indexes.py)
+- ``questions.info.bin``  theta-grid information table (infotable.py)
+- ``questions.minhash.bin`` MinHash signatures for near-duplicate checks (dedup.py)
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from .compiled import compile_bank
+from .dedup import MinHashIndex
+from .indexes import write_index
+from .infotable import write_info_table
+from .irt import ItemBank
+from .store import DEFAULT_BANK_PATH, BankStore, content_hash
+
+
+def artifact_path(bank_path, name, out_dir=None):
+    bank_path = Path(bank_path)
+    return Path(out_dir or bank_path.parent) / f'{bank_path.stem}.{name}.bin'
+
+
+def build(bank_path=DEFAULT_BANK_PATH, out_dir=None):
+    """Build every artifact for the bank at ``bank_path``. Returns the written paths."""
+    bank = BankStore(bank_path).published()
+    items = ItemBank.from_questions(bank['questions'])
+    meta = {
+        'version': bank['version'],
+        'lastUpdated': bank['lastUpdated'],
+        'contentHash': content_hash(bank['questions']),
+    }
+
+    if out_dir is not None:
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+    written = []
+    path = artifact_path(bank_path, 'bank', out_dir)
+    compile_bank(path, bank, meta)
+    written.append(path)
+
+    path = artifact_path(bank_path, 'index', out_dir)
+    write_index(path, items, meta)
+    written.append(path)
+
+    path = artifact_path(bank_path, 'info', out_dir)
+    write_info_table(path, items, meta)
+    written.append(path)
+
+    path = artifact_path(bank_path, 'minhash', out_dir)
+    MinHashIndex.build(bank['questions']).save(path, meta)
+    written.append(path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build binary question bank artifacts')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH, type=Path)
+    parser.add_argument('--out-dir', default=None, type=Path)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    for path in build(args.bank, args.out_dir):
+        print(f"Wrote {path} ({path.stat().st_size:,} bytes)")
+    print(f"Done in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
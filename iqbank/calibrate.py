@@ -0,0 +1,309 @@
+"""Marginal maximum likelihood item calibration (Bock–Aitkin EM).
+
+Fits 2-PL or 3-PL parameters from logged responses over a fixed quadrature
+grid with a standard normal ability prior. The E-step is vectorized per
+shard of examinees and the shards are spread over a process pool; the M-step
+runs Fisher scoring for every item at once.
+
+Responses are read from JSON Lines in the shape of QuestionResponse in
+apps/backend/src/services/session-store.ts, either one session per line
+
+    {"sessionId": "...", "responses": [{"questionId": "...", "isCorrect": true}, ...]}
+
+or one response per line with a ``sessionId`` field, or from the day-partitioned
+store written by iqbank.ingest (``--store``).
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .ingest import ResponseStore
+from .irt import ItemBank
+from .schema import PARAM_RANGES
+from .sparse import ResponseMatrix, iter_response_records  # noqa: F401 (re-exported)
+from .store import DEFAULT_BANK_PATH, BankStore
+
+# Parameter bounds used while fitting; within QuestionSchema so fits can be written as they are.
+A_BOUNDS = (0.05, PARAM_RANGES['discrimination'][1])
+B_BOUNDS = PARAM_RANGES['difficulty']
+C_BOUNDS = (0.0, 0.5)
+
+# Beta(α, β) prior on the 3-PL guessing parameter, centred near 1/4 options.
+GUESSING_PRIOR = (5.0, 17.0)
+
+# Responses handled by one E-step task.
+SHARD_RESPONSES = 200_000
+
+
+# Calibration's name for the sparse response matrix.
+ResponseData = ResponseMatrix
+
+
+def load_responses(paths, bank):
+    """Build ResponseData for ``bank`` from JSON Lines response logs."""
+    return ResponseMatrix.from_logs(paths, bank)
+
+
+def load_store_responses(store, bank, start=None, end=None):
+    """Build ResponseData from an iqbank.ingest ResponseStore, one part at a time."""
+    return ResponseMatrix.from_store(store, bank, start, end)
+
+
+def quadrature(points=41, bound=4.0):
+    """Equally spaced nodes with normalized standard normal log weights."""
+    nodes = np.linspace(-bound, bound, points)
+    log_w = -0.5 * nodes ** 2
+    log_w -= np.log(np.exp(log_w).sum())
+    return nodes, log_w
+
+
+def _item_probabilities(a, b, c, nodes):
+    s = 1.0 / (1.0 + np.exp(-a[:, None] * (nodes[None, :] - b[:, None])))
+    p = c[:, None] + (1.0 - c[:, None]) * s
+    return np.clip(p, 1e-9, 1.0 - 1e-9)
+
+
+# -- E-step -------------------------------------------------------------------
+
+_shared = {}
+
+
+def _init_worker(ptr, items, scores):
+    _shared.update(ptr=ptr, items=items, scores=scores)
+
+
+def _estep_shard(lo, hi, log_p, log_q, log_w):
+    """Expected counts over quadrature nodes for persons ``lo:hi``."""
+    ptr, items, scores = _shared['ptr'], _shared['items'], _shared['scores']
+    start, end = ptr[lo], ptr[hi]
+    it = items[start:end]
+    u = scores[start:end].astype(np.intp)
+    n_items, n_nodes = log_p.shape
+
+    # Looping over nodes with 1-D take/bincount is far cheaper than 2-D fancy
+    # indexing over (responses × nodes).
+    table = np.concatenate([log_q, log_p]).T.copy()
+    cell = it + u * n_items
+    person = np.repeat(np.arange(hi - lo), np.diff(ptr[lo:hi + 1]))
+    person_ll = np.empty((n_nodes, hi - lo))
+    for q in range(n_nodes):
+        person_ll[q] = np.bincount(person, weights=table[q].take(cell), minlength=hi - lo)
+    person_ll += log_w[:, None]
+    peak = person_ll.max(axis=0)
+    post = np.exp(person_ll - peak)
+    total = post.sum(axis=0)
+    post /= total
+    marginal = float((np.log(total) + peak).sum())
+
+    expected_n = np.empty((n_items, n_nodes))
+    expected_r = np.empty((n_items, n_nodes))
+    for q in range(n_nodes):
+        weight = post[q].take(person)
+        expected_n[:, q] = np.bincount(it, weights=weight, minlength=n_items)
+        expected_r[:, q] = np.bincount(it, weights=weight * u, minlength=n_items)
+    return expected_r, expected_n, marginal
+
+
+def _shards(ptr, target=SHARD_RESPONSES):
+    bounds = [0]
+    next_cut = target
+    for p in range(1, len(ptr) - 1):
+        if ptr[p] >= next_cut:
+            bounds.append(p)
+            next_cut = ptr[p] + target
+    bounds.append(len(ptr) - 1)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+# -- M-step -------------------------------------------------------------------
+
+def mstep(r, n, nodes, a, b, c, fit_guessing=False, iterations=5):
+    """Fisher scoring on every item's expected-count log likelihood at once."""
+    a, b, c = a.copy(), b.copy(), c.copy()
+    n_params = 3 if fit_guessing else 2
+    alpha, beta = GUESSING_PRIOR
+
+    for _ in range(iterations):
+        dt = nodes[None, :] - b[:, None]
+        s = 1.0 / (1.0 + np.exp(-a[:, None] * dt))
+        p = np.clip(c[:, None] + (1.0 - c[:, None]) * s, 1e-9, 1.0 - 1e-9)
+        pq = p * (1.0 - p)
+        dp_dz = (1.0 - c[:, None]) * s * (1.0 - s)
+        resid = (r - n * p) / pq
+        weight = n / pq
+
+        da, db = dp_dz * dt, -dp_dz * a[:, None]
+        grad = [(resid * da).sum(1), (resid * db).sum(1)]
+        derivs = [da, db]
+        if fit_guessing:
+            dc = 1.0 - s
+            derivs.append(dc)
+            grad.append((resid * dc).sum(1) + (alpha - 1) / c - (beta - 1) / (1 - c))
+
+        info = np.empty((len(a), n_params, n_params))
+        for i in range(n_params):
+            for j in range(i, n_params):
+                info[:, i, j] = info[:, j, i] = (weight * derivs[i] * derivs[j]).sum(1)
+        if fit_guessing:
+            info[:, 2, 2] += (alpha - 1) / c ** 2 + (beta - 1) / (1 - c) ** 2
+        info += 1e-6 * np.eye(n_params)
+
+        step = np.linalg.solve(info, np.stack(grad, axis=1)[..., None])[..., 0]
+        step = np.clip(step, -1.0, 1.0)
+        a = np.clip(a + step[:, 0], *A_BOUNDS)
+        b = np.clip(b + step[:, 1], *B_BOUNDS)
+        if fit_guessing:
+            c = np.clip(c + step[:, 2], C_BOUNDS[0] + 1e-4, C_BOUNDS[1])
+    return a, b, c
+
+
+# -- driver -------------------------------------------------------------------
+
+@dataclass
+class CalibrationResult:
+    discrimination: np.ndarray
+    difficulty: np.ndarray
+    guessing: np.ndarray
+    n_responses: np.ndarray
+    fitted: np.ndarray  # bool, items with enough responses to be updated
+    iterations: int
+    converged: bool
+    log_likelihood: list
+
+
+def calibrate(data, n_items, model='2pl', init=None, min_responses=20,
+              quad_points=41, max_iter=200, tol=1e-4, workers=None):
+    """Fit item parameters by MML/EM. ``init`` is an optional (a, b, c) tuple."""
+    if model not in ('2pl', '3pl'):
+        raise ValueError(f'Unknown IRT model: {model!r}')
+    nodes, log_w = quadrature(quad_points)
+    counts = np.bincount(data.items, minlength=n_items)
+    fitted = counts >= min_responses
+
+    if init is None:
+        correct = np.bincount(data.items, weights=data.scores, minlength=n_items)
+        prop = np.clip((correct + 0.5) / (counts + 1.0), 0.05, 0.95)
+        a = np.ones(n_items)
+        b = -np.log(prop / (1 - prop))
+        c = np.full(n_items, 0.2 if model == '3pl' else 0.0)
+    else:
+        a, b, c = (np.array(x, dtype=np.float64) for x in init)
+        if model == '2pl':
+            c = np.zeros(n_items)
+
+    shards = _shards(data.ptr)
+    workers = workers or os.cpu_count() or 1
+    pool = None
+    if workers > 1 and len(shards) > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(data.ptr, data.items, data.scores))
+    else:
+        _init_worker(data.ptr, data.items, data.scores)
+
+    history = []
+    converged = False
+    try:
+        for iteration in range(1, max_iter + 1):
+            p = _item_probabilities(a, b, c, nodes)
+            log_p, log_q = np.log(p), np.log1p(-p)
+            args = [(lo, hi, log_p, log_q, log_w) for lo, hi in shards]
+            if pool is None:
+                parts = [_estep_shard(*arg) for arg in args]
+            else:
+                parts = list(pool.map(_estep_shard, *zip(*args)))
+            r = sum(part[0] for part in parts)
+            n = sum(part[1] for part in parts)
+            history.append(sum(part[2] for part in parts))
+
+            new_a, new_b, new_c = mstep(r, n, nodes, a, b, c, fit_guessing=model == '3pl')
+            change = max(
+                np.abs(new_a - a)[fitted].max(initial=0.0),
+                np.abs(new_b - b)[fitted].max(initial=0.0),
+                np.abs(new_c - c)[fitted].max(initial=0.0),
+            )
+            a = np.where(fitted, new_a, a)
+            b = np.where(fitted, new_b, b)
+            c = np.where(fitted, new_c, c)
+            if change < tol:
+                converged = True
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        _shared.clear()
+
+    return CalibrationResult(
+        discrimination=a, difficulty=b, guessing=c, n_responses=counts,
+        fitted=fitted, iterations=iteration, converged=converged, log_likelihood=history,
+    )
+
+
+def apply_calibration(store, bank, result, model='2pl'):
+    """Upsert fitted parameters into the bank journal. Returns the number of items written.
+
+    Raises ValueError, writing nothing, if a value falls outside QuestionSchema.
+    """
+    questions = {q['id']: q for q in store.iter_questions()}
+    fields = {'difficulty': result.difficulty, 'discrimination': result.discrimination}
+    if model == '3pl':
+        fields['guessing'] = result.guessing
+
+    updated = []
+    for row in np.flatnonzero(result.fitted):
+        item = dict(questions[bank.ids[row]])
+        for name, values in fields.items():
+            lo, hi = PARAM_RANGES[name]
+            value = round(float(values[row]), 4)
+            if not lo <= value <= hi:
+                raise ValueError(f'{name} {value} of item {item["id"]} is outside [{lo}, {hi}]')
+            item[name] = value
+        updated.append(item)
+    store.upsert(updated)
+    return len(updated)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Calibrate item parameters from logged responses')
+    parser.add_argument('responses', nargs='*', help='JSON Lines response logs')
+    parser.add_argument('--store', type=Path, help='Read responses from an iqbank.ingest store instead')
+    parser.add_argument('--since', help='First day (YYYY-MM-DD) to read from --store')
+    parser.add_argument('--until', help='Last day (YYYY-MM-DD) to read from --store')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH)
+    parser.add_argument('--model', choices=['2pl', '3pl'], default='2pl')
+    parser.add_argument('--min-responses', type=int, default=20)
+    parser.add_argument('--max-iter', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--write', action='store_true', help='Upsert fitted parameters into the bank journal')
+    args = parser.parse_args(argv)
+    if bool(args.responses) == bool(args.store):
+        parser.error('give either response logs or --store')
+
+    store = BankStore(args.bank)
+    bank = ItemBank.from_questions(store.iter_questions())
+    if args.store:
+        data = load_store_responses(ResponseStore(args.store), bank, args.since, args.until)
+    else:
+        data = load_responses(args.responses, bank)
+    print(f"Loaded {data.n_responses} responses from {data.n_persons} sessions "
+          f"({data.skipped} skipped for unknown items)")
+
+    result = calibrate(data, len(bank), model=args.model, min_responses=args.min_responses,
+                       max_iter=args.max_iter, workers=args.workers)
+    status = 'converged' if result.converged else 'stopped'
+    print(f"EM {status} after {result.iterations} iterations, "
+          f"log likelihood {result.log_likelihood[-1]:.1f}")
+    print(f"Fitted {int(result.fitted.sum())} of {len(bank)} items "
+          f"(min {args.min_responses} responses)")
+
+    if args.write:
+        updated = apply_calibration(store, bank, result, args.model)
+        print(f"Upserted {updated} items into {store.journal_path}")
+
+
+if __name__ == '__main__':
+    main()
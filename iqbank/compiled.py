@@ -0,0 +1,159 @@
+"""Columnar binary question bank.
+
+Compiles questions.json into a container (see binfile.py) with
+
+- fixed-width numeric columns: ``domain`` (uint8 index into DOMAINS),
+  ``difficulty``, ``discrimination``, ``guessing``, ``exposure`` (float64;
+  Sympson-Hetter ``exposureControl``, 1 when absent), ``flags`` (uint8),
+- string columns stored as a UTF-8 heap plus int64 offsets:
+  ``<name>.heap`` / ``<name>.offsets`` for id, text_ar, correct,
+  explanation_ar, culturalContext and extra (JSON of any other fields),
+- ``options.heap`` / ``options.offsets`` holding every option string, with
+  ``options.ptr`` giving each item's slice of options.
+
+Opening the file only parses the header; columns are memory-mapped, so cold
+start and per-process memory stay flat as the bank grows. Items are decoded
+on demand and round-trip to the same dicts as questions.json.
+"""
+
+import json
+
+import numpy as np
+
+from .binfile import read_binfile, string_column, write_binfile
+from .irt import ItemBank
+from .store import DOMAINS
+
+KIND = 'bank'
+
+STRING_FIELDS = ['id', 'text_ar', 'correct', 'explanation_ar', 'culturalContext']
+KNOWN_FIELDS = {'id', 'domain', 'difficulty', 'discrimination', 'guessing', 'text_ar',
+                'options', 'correct', 'explanation_ar', 'culturalContext'}
+
+# Bits in the ``flags`` column recording which optional fields are present.
+HAS_GUESSING = 1
+HAS_EXPLANATION = 2
+HAS_CULTURAL_CONTEXT = 4
+HAS_EXTRA = 8
+
+
+def compile_arrays(questions):
+    """Column arrays for ``questions``; the inverse of ``CompiledBank.question``."""
+    questions = list(questions)
+    domain_index = {d: i for i, d in enumerate(DOMAINS)}
+    arrays = {
+        'domain': np.array([domain_index[q['domain']] for q in questions], dtype=np.uint8),
+        'difficulty': np.array([q['difficulty'] for q in questions], dtype=np.float64),
+        'discrimination': np.array([q['discrimination'] for q in questions], dtype=np.float64),
+        'guessing': np.array([q.get('guessing', 0.25) for q in questions], dtype=np.float64),
+        'exposure': np.array([q.get('exposureControl', 1.0) for q in questions], dtype=np.float64),
+    }
+
+    flags = np.zeros(len(questions), dtype=np.uint8)
+    strings = {name: [] for name in STRING_FIELDS + ['extra']}
+    options, option_counts = [], []
+    for row, q in enumerate(questions):
+        flags[row] = (
+            (HAS_GUESSING if 'guessing' in q else 0)
+            | (HAS_EXPLANATION if 'explanation_ar' in q else 0)
+            | (HAS_CULTURAL_CONTEXT if 'culturalContext' in q else 0)
+        )
+        for name in STRING_FIELDS:
+            strings[name].append(q.get(name, ''))
+        extra = {k: v for k, v in q.items() if k not in KNOWN_FIELDS}
+        if extra:
+            flags[row] |= HAS_EXTRA
+        strings['extra'].append(json.dumps(extra, ensure_ascii=False) if extra else '')
+        options.extend(q['options'])
+        option_counts.append(len(q['options']))
+    arrays['flags'] = flags
+
+    for name, values in strings.items():
+        arrays[f'{name}.heap'], arrays[f'{name}.offsets'] = string_column(values)
+    arrays['options.heap'], arrays['options.offsets'] = string_column(options)
+    arrays['options.ptr'] = np.zeros(len(questions) + 1, dtype=np.int64)
+    np.cumsum(option_counts, out=arrays['options.ptr'][1:])
+    return arrays
+
+
+def compile_bank(path, bank, meta=None):
+    """Write ``bank`` (a questions.json dict) to ``path`` in columnar form."""
+    meta = dict(meta or {}, version=bank['version'], lastUpdated=bank['lastUpdated'],
+                items=len(bank['questions']))
+    write_binfile(path, KIND, compile_arrays(bank['questions']), meta)
+
+
+class CompiledBank:
+    """Memory-mapped reader for a compiled bank."""
+
+    def __init__(self, path):
+        self._file = read_binfile(path, KIND)
+        self.meta = self._file.meta
+        self.domain = self._file['domain']
+        self.difficulty = self._file['difficulty']
+        self.discrimination = self._file['discrimination']
+        self.guessing = self._file['guessing']
+        self.exposure = self._file['exposure']
+        self.flags = self._file['flags']
+
+    def __len__(self):
+        return len(self.domain)
+
+    def string(self, name, row):
+        offsets = self._file[f'{name}.offsets']
+        start, end = offsets[row], offsets[row + 1]
+        return bytes(self._file[f'{name}.heap'][start:end]).decode('utf-8')
+
+    def item_id(self, row):
+        return self.string('id', row)
+
+    def ids(self):
+        return self._file.strings('id')
+
+    def options(self, row):
+        ptr = self._file['options.ptr']
+        return [self.string('options', i) for i in range(ptr[row], ptr[row + 1])]
+
+    def question(self, row):
+        """Decode one item into the same dict stored in questions.json."""
+        flags = int(self.flags[row])
+        item = {
+            'id': self.string('id', row),
+            'domain': DOMAINS[self.domain[row]],
+            'difficulty': float(self.difficulty[row]),
+            'discrimination': float(self.discrimination[row]),
+        }
+        if flags & HAS_GUESSING:
+            item['guessing'] = float(self.guessing[row])
+        item['text_ar'] = self.string('text_ar', row)
+        item['options'] = self.options(row)
+        item['correct'] = self.string('correct', row)
+        if flags & HAS_EXPLANATION:
+            item['explanation_ar'] = self.string('explanation_ar', row)
+        if flags & HAS_CULTURAL_CONTEXT:
+            item['culturalContext'] = self.string('culturalContext', row)
+        if flags & HAS_EXTRA:
+            item.update(json.loads(self.string('extra', row)))
+        return item
+
+    def iter_questions(self):
+        for row in range(len(self)):
+            yield self.question(row)
+
+    def to_bank(self):
+        return {
+            'version': self.meta['version'],
+            'lastUpdated': self.meta['lastUpdated'],
+            'questions': list(self.iter_questions()),
+        }
+
+    def item_bank(self):
+        """ItemBank over the mapped numeric columns (no per-item decoding)."""
+        return ItemBank(
+            ids=self.ids(),
+            domain=self.domain,
+            difficulty=self.difficulty,
+            discrimination=self.discrimination,
+            guessing=self.guessing,
+            exposure=self.exposure,
+        )
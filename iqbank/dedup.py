@@ -0,0 +1,192 @@
+"""Near-duplicate item detection with MinHash and locality-sensitive hashing.
+
+Each item is reduced to character shingles of its normalized stem plus its
+normalized options (see arabic.py) and summarised by a MinHash signature.
+Signatures are cut into bands; items that agree on every value of any band are candidates,
+and candidates are confirmed by their estimated Jaccard similarity.
+
+The index keeps, per band, the sorted 64-bit band keys and the rows they came
+from, so a query is one binary search per band (no pairwise comparison) and
+a saved index can be memory-mapped without rebuilding any dict.
+
+    python -m iqbank.dedup                      # near-duplicates within the bank
+    python -m iqbank.dedup --batch new.json     # a batch against the bank
+"""
+
+import argparse
+import json
+import zlib
+
+import numpy as np
+
+from .arabic import normalize
+from .binfile import read_binfile, write_binfile
+from .store import DEFAULT_BANK_PATH, BankStore
+
+KIND = 'minhash'
+
+# 42 bands of 3 rows: pairs at Jaccard 0.45 become candidates ~98% of the
+# time, pairs at 0.05 about 0.5% of the time.
+NUM_PERM = 126
+BANDS = 42
+SHINGLE = 3
+THRESHOLD = 0.45
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+_SEED = 20251126
+
+
+def _permutations(num_perm, bands):
+    rng = np.random.default_rng(_SEED)
+    a = rng.integers(1, 2 ** 31, num_perm, dtype=np.uint64)
+    b = rng.integers(0, 2 ** 32, num_perm, dtype=np.uint64)
+    mix = rng.integers(1, 2 ** 63, num_perm // bands, dtype=np.uint64) | np.uint64(1)
+    return a, b, mix
+
+
+def shingles(text, size=SHINGLE):
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def item_shingles(item):
+    """Character shingles of the stem plus each option as one whole token.
+
+    Options count once each, so stems dominate and rewordings with fresh
+    distractors still match.
+    """
+    grams = shingles(normalize(item.get('text_ar', '')))
+    grams.update('\x00' + normalize(o) for o in item.get('options', []))
+    return np.array([zlib.crc32(g.encode('utf-8')) for g in grams], dtype=np.uint64)
+
+
+def signatures(items, num_perm=NUM_PERM, bands=BANDS):
+    a, b, _ = _permutations(num_perm, bands)
+    out = np.empty((len(items), num_perm), dtype=np.uint64)
+    for row, item in enumerate(items):
+        x = item_shingles(item)
+        out[row] = ((x[:, None] * a + b) % _PRIME).min(axis=0)
+    return out
+
+
+def band_keys(sigs, bands=BANDS):
+    """(n, bands) uint64 key per band; equal keys mean (almost surely) equal bands."""
+    _, _, mix = _permutations(sigs.shape[1], bands)
+    rows = sigs.shape[1] // bands
+    return (sigs[:, :bands * rows].reshape(len(sigs), bands, rows) * mix).sum(axis=2)
+
+
+class MinHashIndex:
+    def __init__(self, ids, sigs, bands=BANDS):
+        self.ids = list(ids)
+        self.sigs = sigs
+        self.bands = bands
+        keys = band_keys(sigs, bands)
+        self.order = np.argsort(keys, axis=0, kind='stable')
+        self.sorted_keys = np.take_along_axis(keys, self.order, axis=0)
+
+    @classmethod
+    def build(cls, items, bands=BANDS):
+        items = list(items)
+        return cls([q['id'] for q in items], signatures(items, bands=bands), bands)
+
+    def save(self, path, meta=None):
+        write_binfile(path, KIND, {
+            'ids': np.array([i.encode('utf-8') for i in self.ids], dtype=bytes),
+            'signatures': self.sigs,
+        }, dict(meta or {}, bands=self.bands))
+
+    @classmethod
+    def load(cls, path):
+        binfile = read_binfile(path, KIND)
+        ids = [i.decode('utf-8') for i in binfile['ids']]
+        return cls(ids, binfile['signatures'], binfile.meta['bands'])
+
+    def candidates(self, sig):
+        """Rows sharing at least one band with ``sig``."""
+        keys = band_keys(sig[None, :], self.bands)[0]
+        found = set()
+        for band, key in enumerate(keys):
+            column = self.sorted_keys[:, band]
+            lo = np.searchsorted(column, key, side='left')
+            hi = np.searchsorted(column, key, side='right')
+            found.update(self.order[lo:hi, band].tolist())
+        return found
+
+    def query(self, sig, threshold=THRESHOLD):
+        """[(id, estimated Jaccard)] of indexed items similar to ``sig``, best first."""
+        rows = np.fromiter(self.candidates(sig), dtype=np.int64)
+        if not len(rows):
+            return []
+        similarity = (self.sigs[rows] == sig).mean(axis=1)
+        keep = similarity >= threshold
+        ranked = sorted(zip(rows[keep].tolist(), similarity[keep].tolist()), key=lambda p: -p[1])
+        return [(self.ids[row], sim) for row, sim in ranked]
+
+    def duplicates_of(self, items, threshold=THRESHOLD):
+        """{item id: [(bank id, similarity), ...]} for items that match the index."""
+        found = {}
+        for item, sig in zip(items, signatures(items, bands=self.bands)):
+            matches = [(i, s) for i, s in self.query(sig, threshold) if i != item.get('id')]
+            if matches:
+                found[item.get('id')] = matches
+        return found
+
+    def clusters(self, threshold=THRESHOLD):
+        """Groups of indexed ids that are near-duplicates of each other."""
+        parent = list(range(len(self.ids)))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for band in range(self.bands):
+            column = self.sorted_keys[:, band]
+            rows = self.order[:, band]
+            starts = np.flatnonzero(np.r_[True, column[1:] != column[:-1]])
+            ends = np.r_[starts[1:], len(column)]
+            for start, end in zip(starts[ends - starts > 1], ends[ends - starts > 1]):
+                group = rows[start:end]
+                for other in group[1:]:
+                    if (self.sigs[group[0]] == self.sigs[other]).mean() >= threshold:
+                        parent[find(int(other))] = find(int(group[0]))
+
+        groups = {}
+        for row in range(len(self.ids)):
+            groups.setdefault(find(row), []).append(self.ids[row])
+        return [g for g in groups.values() if len(g) > 1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Find near-duplicate items')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH)
+    parser.add_argument('--batch', help='JSON file with a list of new items (or a bank dict)')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+
+    questions = BankStore(args.bank).load()['questions']
+    text_by_id = {q['id']: q['text_ar'] for q in questions}
+    index = MinHashIndex.build(questions)
+
+    if args.batch:
+        with open(args.batch, 'r', encoding='utf-8') as f:
+            batch = json.load(f)
+        batch = batch['questions'] if isinstance(batch, dict) else batch
+        found = index.duplicates_of(batch, args.threshold)
+        for item in batch:
+            for bank_id, sim in found.get(item.get('id'), []):
+                print(f"{sim:.2f}  {item['text_ar']}  ~  {text_by_id[bank_id]} ({bank_id})")
+        print(f"\n{len(found)} of {len(batch)} batch items have near-duplicates in the bank")
+    else:
+        clusters = index.clusters(args.threshold)
+        for group in clusters:
+            print('\n'.join(f'  {item_id}  {text_by_id[item_id]}' for item_id in group))
+            print()
+        print(f"{len(clusters)} near-duplicate groups in {len(questions)} items")
+
+
+if __name__ == '__main__':
+    main()
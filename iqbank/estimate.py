@@ -0,0 +1,180 @@
+"""EAP and MAP ability estimates with posterior standard errors.
+
+updateTheta in packages/scoring-engine/src/irt.ts takes a fixed-size
+gradient step and ignores guessing. Here θ is estimated from the full
+posterior over a fixed quadrature grid under the 3-PL (or 2-PL):
+
+- LikelihoodTable holds log P and log (1 - P) for every item at every grid
+  node, computed once per bank,
+- Posterior adds one row of that table per response, O(grid) per update,
+- score_sessions scores many sessions at once: per grid node, one take and
+  one bincount over all responses of a shard, with shards spread over a
+  process pool.
+
+EAP is the posterior mean with the posterior SD as its SE. MAP is the grid
+mode refined by a parabola through its neighbours, with the SE taken from
+the curvature there.
+
+    python -m iqbank.estimate responses.jsonl [--method map] [--out scores.csv]
+    python -m iqbank.estimate --store var/responses
+"""
+
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .calibrate import _shards, load_responses, load_store_responses
+from .ingest import ResponseStore
+from .irt import ItemBank, probability
+from .store import DEFAULT_BANK_PATH
+
+GRID_POINTS = 81
+GRID_BOUND = 4.0
+
+
+@dataclass
+class Estimate:
+    theta: float
+    se: float
+
+
+class LikelihoodTable:
+    """Per-item log-likelihood vectors over a fixed θ grid."""
+
+    def __init__(self, bank, model='3pl', nodes=None, prior_mean=0.0, prior_sd=1.0):
+        if model not in ('2pl', '3pl'):
+            raise ValueError(f'Unknown IRT model: {model!r}')
+        self.nodes = np.linspace(-GRID_BOUND, GRID_BOUND, GRID_POINTS) if nodes is None else np.asarray(nodes)
+        c = bank.guessing if model == '3pl' else None
+        p = np.clip(probability(self.nodes, bank.discrimination, bank.difficulty, c), 1e-12, 1 - 1e-12)
+        # Item-major so one response is one contiguous row.
+        self.log_p = np.ascontiguousarray(np.log(p).T)
+        self.log_q = np.ascontiguousarray(np.log1p(-p).T)
+        self.log_prior = -0.5 * ((self.nodes - prior_mean) / prior_sd) ** 2
+
+    def __len__(self):
+        return len(self.log_p)
+
+    def row(self, item, correct):
+        return self.log_p[item] if correct else self.log_q[item]
+
+
+def eap(log_post, nodes):
+    """(θ, SE) arrays for log posteriors of shape (..., grid)."""
+    w = np.exp(log_post - log_post.max(axis=-1, keepdims=True))
+    w /= w.sum(axis=-1, keepdims=True)
+    mean = w @ nodes
+    var = w @ nodes ** 2 - mean ** 2
+    return mean, np.sqrt(np.maximum(var, 0.0))
+
+
+def map_estimate(log_post, nodes):
+    """(θ, SE) arrays: grid mode refined by parabolic interpolation, SE from curvature."""
+    log_post = np.atleast_2d(log_post)
+    step = nodes[1] - nodes[0]
+    k = np.clip(log_post.argmax(axis=-1), 1, len(nodes) - 2)
+    rows = np.arange(len(log_post))
+    left, mid, right = log_post[rows, k - 1], log_post[rows, k], log_post[rows, k + 1]
+    second = left - 2 * mid + right
+    concave = second < 0
+    second = np.where(concave, second, -1.0)  # flat posteriors: no refinement, infinite SE
+    shift = np.where(concave, (left - right) / (2 * second) * step, 0.0)
+    theta = nodes[k] + np.clip(shift, -step, step)
+    se = np.where(concave, step / np.sqrt(-second), np.inf)
+    return theta, se
+
+
+class Posterior:
+    """Running log posterior for one session; each response costs O(grid)."""
+
+    def __init__(self, table):
+        self.table = table
+        self.log_post = table.log_prior.copy()
+        self.n = 0
+
+    def update(self, item, correct):
+        self.log_post += self.table.row(item, correct)
+        self.n += 1
+        return self
+
+    def eap(self):
+        theta, se = eap(self.log_post, self.table.nodes)
+        return Estimate(float(theta), float(se))
+
+    def map(self):
+        theta, se = map_estimate(self.log_post, self.table.nodes)
+        return Estimate(float(theta[0]), float(se[0]))
+
+
+def _score_shard(ptr, items, scores, log_p, log_q, log_prior, nodes, method):
+    n_persons, n_items = len(ptr) - 1, len(log_p)
+    cell = items + scores.astype(np.intp) * n_items
+    table = np.concatenate([log_q, log_p]).T.copy()
+    person = np.repeat(np.arange(n_persons), np.diff(ptr))
+    log_post = np.empty((n_persons, len(nodes)))
+    for g in range(len(nodes)):
+        log_post[:, g] = np.bincount(person, weights=table[g].take(cell), minlength=n_persons)
+    log_post += log_prior
+    return eap(log_post, nodes) if method == 'eap' else map_estimate(log_post, nodes)
+
+
+def score_sessions(table, data, method='eap', workers=None):
+    """(θ, SE) arrays with one entry per person of ``data`` (a sparse.ResponseMatrix)."""
+    if method not in ('eap', 'map'):
+        raise ValueError(f'Unknown method: {method!r}')
+    shards = _shards(data.ptr)
+    args = []
+    for lo, hi in shards:
+        start, end = data.ptr[lo], data.ptr[hi]
+        args.append((data.ptr[lo:hi + 1] - start, data.items[start:end], data.scores[start:end],
+                     table.log_p, table.log_q, table.log_prior, table.nodes, method))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(shards) <= 1:
+        parts = [_score_shard(*arg) for arg in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_score_shard, *zip(*args)))
+    if not parts:
+        return np.empty(0), np.empty(0)
+    return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Score sessions with EAP or MAP ability estimates')
+    parser.add_argument('responses', nargs='*', help='JSON Lines response logs')
+    parser.add_argument('--store', type=Path, help='Read responses from an iqbank.ingest store instead')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH)
+    parser.add_argument('--method', choices=['eap', 'map'], default='eap')
+    parser.add_argument('--model', choices=['2pl', '3pl'], default='3pl')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--out', type=Path, help='Write session,theta,se,responses as CSV')
+    args = parser.parse_args(argv)
+    if bool(args.responses) == bool(args.store):
+        parser.error('give either response logs or --store')
+
+    bank = ItemBank.load(args.bank)
+    if args.store:
+        data = load_store_responses(ResponseStore(args.store), bank)
+    else:
+        data = load_responses(args.responses, bank)
+    theta, se = score_sessions(LikelihoodTable(bank, args.model), data, args.method, args.workers)
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['session', 'theta', 'se', 'responses'])
+            for session, t, s, n in zip(data.persons, theta, se, np.diff(data.ptr)):
+                writer.writerow([session, f'{t:.4f}', f'{s:.4f}', int(n)])
+    print(f'Scored {data.n_persons} sessions ({data.n_responses} responses, {data.skipped} skipped) '
+          f'with {args.method.upper()}/{args.model}')
+    if len(theta):
+        print(f'θ mean {theta.mean():+.3f} sd {theta.std():.3f}; median SE {np.median(se):.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""Sympson-Hetter exposure control parameters, calibrated by simulation.
+
+The selector draws an item as before and administers it with probability
+``exposureControl`` (K); otherwise it sets the item aside and draws again.
+K is found iteratively: simulate the adaptive policy with the current K,
+measure each item's selection rate P(S), and set
+
+    K = r_max / P(S)   if P(S) > r_max,   else 1,
+
+until no item's administration rate P(A) = P(S)·K exceeds r_max (plus a
+tolerance). Each round is one vectorized run of simulate.simulate.
+
+    python -m iqbank.exposure --r-max 0.25 --examinees 20000 [--write]
+"""
+
+import argparse
+import json
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .irt import ItemBank
+from .simulate import SimulationConfig, sample_population, simulate
+from .store import DEFAULT_BANK_PATH, DOMAINS, BankStore
+
+R_MAX = 0.25
+TOLERANCE = 0.01
+
+
+@dataclass
+class ExposureResult:
+    k: np.ndarray
+    selection_rate: np.ndarray  # P(S) in the last round
+    exposure_rate: np.ndarray  # P(A) in the last round
+    converged: bool
+    history: list = field(default_factory=list)  # one per-domain report per round
+
+
+def domain_report(bank, k, selection_rate, exposure_rate, r_max):
+    """Per-domain exposure statistics for one round."""
+    report = {}
+    for code, domain in enumerate(DOMAINS):
+        sel = bank.domain == code
+        if not sel.any():
+            continue
+        report[domain] = {
+            'items': int(sel.sum()),
+            'max_exposure': float(exposure_rate[sel].max()),
+            'over_r_max': int((exposure_rate[sel] > r_max).sum()),
+            'controlled': int((k[sel] < 1).sum()),
+            'min_k': float(k[sel].min()),
+            'never_used': int((exposure_rate[sel] == 0).sum()),
+        }
+    return report
+
+
+def sympson_hetter(bank, r_max=R_MAX, examinees=20_000, max_rounds=40, tol=TOLERANCE,
+                   config=None, population='normal', workers=None, seed=0):
+    """Iterate K until max P(A) <= r_max + tol; starts from K = 1."""
+    if r_max * len(bank) < (config or SimulationConfig()).test_length:
+        raise ValueError(f'r_max={r_max} is infeasible: {len(bank)} items cannot cover '
+                         f'{(config or SimulationConfig()).test_length} items per test')
+    seeds = np.random.SeedSequence(seed).spawn(max_rounds)
+    k = np.ones(len(bank))
+    history = []
+    converged = False
+    for round_seed in seeds:
+        pop_seed, sim_seed = round_seed.generate_state(2)
+        theta = sample_population(examinees, population, int(pop_seed))
+        result = simulate(bank, theta, config, workers=workers, seed=int(sim_seed), exposure=k)
+        selection_rate = result.selection_counts / examinees
+        exposure_rate = result.exposure_rate
+        history.append(domain_report(bank, k, selection_rate, exposure_rate, r_max))
+        if exposure_rate.max() <= r_max + tol:
+            converged = True
+            break
+        over = selection_rate > r_max
+        k = np.where(over, r_max / np.maximum(selection_rate, 1e-12), 1.0)
+    return ExposureResult(k=k, selection_rate=selection_rate, exposure_rate=exposure_rate,
+                          converged=converged, history=history)
+
+
+def apply_exposure(store, bank, k):
+    """Write K into the bank journal as ``exposureControl``; K = 1 removes the field.
+
+    Returns the number of items changed.
+    """
+    changed = []
+    for q in store.iter_questions():
+        row = bank.row(q['id'])
+        value = round(float(k[row]), 4)
+        item = dict(q)
+        if value < 1:
+            item['exposureControl'] = value
+        else:
+            item.pop('exposureControl', None)
+        if item != q:
+            changed.append(item)
+    store.upsert(changed)
+    return len(changed)
+
+
+def format_round(i, report, r_max):
+    worst = max(r['max_exposure'] for r in report.values())
+    lines = [f'Round {i}: max exposure {worst:.3f} (r_max {r_max:.2f})']
+    for domain, r in report.items():
+        lines.append(f"  {domain:4s} items={r['items']:<4d} max={r['max_exposure']:.3f} "
+                     f"over={r['over_r_max']:<3d} controlled={r['controlled']:<3d} "
+                     f"min K={r['min_k']:.3f} unused={r['never_used']}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Calibrate Sympson-Hetter exposure control parameters')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH)
+    parser.add_argument('--r-max', type=float, default=R_MAX, help='Target maximum exposure rate')
+    parser.add_argument('--examinees', type=int, default=20_000, help='Simulated examinees per round')
+    parser.add_argument('--max-rounds', type=int, default=40)
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    parser.add_argument('--test-length', type=int, default=SimulationConfig.test_length)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help='Print the per-round reports as JSON')
+    parser.add_argument('--write', action='store_true', help='Upsert exposureControl into the bank journal')
+    args = parser.parse_args(argv)
+
+    store = BankStore(args.bank)
+    bank = ItemBank.from_questions(store.iter_questions())
+    config = SimulationConfig(test_length=args.test_length)
+    result = sympson_hetter(bank, args.r_max, args.examinees, args.max_rounds, args.tolerance,
+                            config, workers=args.workers, seed=args.seed)
+
+    if args.json:
+        print(json.dumps(result.history, indent=2))
+    else:
+        for i, report in enumerate(result.history, 1):
+            print(format_round(i, report, args.r_max))
+        status = 'converged' if result.converged else 'did not converge'
+        print(f"\n{status} after {len(result.history)} rounds; "
+              f"{int((result.k < 1).sum())} of {len(bank)} items controlled")
+
+    if args.write:
+        changed = apply_exposure(store, bank, result.k)
+        print(f'Upserted exposureControl for {changed} items into {store.journal_path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""Secondary indexes over the compiled bank.
+
+Built alongside questions.bank.bin so lookups never scan the whole bank:
+
+- ``id.slots``: open-addressing hash table (linear probing) of bank rows,
+  keyed by ``id.hash`` (64-bit BLAKE2b of the id); id -> row is O(1).
+- ``by_domain``: bank rows sorted by (domain, difficulty), with
+  ``domain.ptr`` marking each domain's range and ``difficulty.sorted``
+  aligned to it, so "items in Gwm near θ" is a binary search plus a range scan.
+- ``bucket.ptr`` (domains × buckets + 1): sub-ranges of ``by_domain`` per
+  difficulty bucket, with edges in ``bucket.edges``.
+"""
+
+import hashlib
+
+import numpy as np
+
+from .binfile import read_binfile, write_binfile
+from .store import DOMAINS
+
+KIND = 'index'
+DIFFICULTY_BUCKETS = 10
+EMPTY = -1
+
+
+def id_hash(item_id):
+    digest = hashlib.blake2b(item_id.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def _hash_slots(hashes):
+    """Insert every row into a power-of-two table by linear probing, vectorized per round."""
+    size = 1 << max(int(2 * len(hashes) - 1).bit_length(), 1)
+    mask = np.uint64(size - 1)
+    slots = np.full(size, EMPTY, dtype=np.int32)
+    pending = np.arange(len(hashes))
+    probe = np.zeros(len(hashes), dtype=np.uint64)
+    while len(pending):
+        slot = ((hashes[pending] + probe[pending]) & mask).astype(np.int64)
+        free = slots[slot] == EMPTY
+        # Among rows racing for the same free slot, the first one wins.
+        _, first = np.unique(slot, return_index=True)
+        winner = np.zeros(len(pending), dtype=bool)
+        winner[first] = True
+        winner &= free
+        slots[slot[winner]] = pending[winner]
+        pending = pending[~winner]
+        probe[pending] += np.uint64(1)
+    return slots
+
+
+def build_index_arrays(item_bank, buckets=DIFFICULTY_BUCKETS):
+    ids = item_bank.ids
+    hashes = np.array([id_hash(item_id) for item_id in ids], dtype=np.uint64)
+    domain = np.asarray(item_bank.domain)
+    difficulty = np.asarray(item_bank.difficulty)
+
+    by_domain = np.lexsort((difficulty, domain)).astype(np.int32)
+    domain_ptr = np.searchsorted(domain[by_domain], np.arange(len(DOMAINS) + 1)).astype(np.int64)
+    sorted_difficulty = difficulty[by_domain]
+
+    lo = float(difficulty.min()) if len(difficulty) else 0.0
+    hi = float(difficulty.max()) if len(difficulty) else 1.0
+    edges = np.linspace(lo, hi if hi > lo else lo + 1.0, buckets + 1)
+    bucket_ptr = np.empty((len(DOMAINS), buckets + 1), dtype=np.int64)
+    for d in range(len(DOMAINS)):
+        start, end = domain_ptr[d], domain_ptr[d + 1]
+        inner = np.searchsorted(sorted_difficulty[start:end], edges[1:-1], side='left')
+        bucket_ptr[d] = np.concatenate([[start], start + inner, [end]])
+
+    return {
+        'ids': np.array([item_id.encode('utf-8') for item_id in ids], dtype=bytes),
+        'id.hash': hashes,
+        'id.slots': _hash_slots(hashes),
+        'by_domain': by_domain,
+        'domain.ptr': domain_ptr,
+        'difficulty.sorted': sorted_difficulty,
+        'bucket.edges': edges,
+        'bucket.ptr': bucket_ptr,
+    }
+
+
+def write_index(path, item_bank, meta=None, buckets=DIFFICULTY_BUCKETS):
+    meta = dict(meta or {}, items=len(item_bank), buckets=buckets)
+    write_binfile(path, KIND, build_index_arrays(item_bank, buckets), meta)
+
+
+class BankIndex:
+    def __init__(self, path):
+        self._file = read_binfile(path, KIND)
+        self.meta = self._file.meta
+        self.ids = self._file['ids']
+        self.hashes = self._file['id.hash']
+        self.slots = self._file['id.slots']
+        self.by_domain = self._file['by_domain']
+        self.domain_ptr = self._file['domain.ptr']
+        self.sorted_difficulty = self._file['difficulty.sorted']
+        self.bucket_edges = self._file['bucket.edges']
+        self.bucket_ptr = self._file['bucket.ptr']
+        self._mask = len(self.slots) - 1
+
+    def row(self, item_id):
+        """Bank row of ``item_id``, or None if it is not in the bank."""
+        h = id_hash(item_id)
+        key = item_id.encode('utf-8')
+        slot = h & self._mask
+        while True:
+            row = int(self.slots[slot])
+            if row == EMPTY:
+                return None
+            if int(self.hashes[row]) == h and self.ids[row] == key:
+                return row
+            slot = (slot + 1) & self._mask
+
+    def _domain_range(self, domain):
+        d = DOMAINS.index(domain)
+        return int(self.domain_ptr[d]), int(self.domain_ptr[d + 1])
+
+    def domain_rows(self, domain):
+        """Bank rows in ``domain``, ordered by difficulty."""
+        start, end = self._domain_range(domain)
+        return self.by_domain[start:end]
+
+    def bucket(self, difficulty):
+        edges = self.bucket_edges
+        return int(np.clip(np.searchsorted(edges, difficulty, side='right') - 1, 0, len(edges) - 2))
+
+    def bucket_rows(self, domain, bucket):
+        d = DOMAINS.index(domain)
+        return self.by_domain[self.bucket_ptr[d, bucket]:self.bucket_ptr[d, bucket + 1]]
+
+    def near(self, domain, theta, width=1.0):
+        """Rows in ``domain`` with |difficulty - θ| <= width, by binary search."""
+        start, end = self._domain_range(domain)
+        keys = self.sorted_difficulty[start:end]
+        lo = np.searchsorted(keys, theta - width, side='left')
+        hi = np.searchsorted(keys, theta + width, side='right')
+        return self.by_domain[start + lo:start + hi]
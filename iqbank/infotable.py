@@ -0,0 +1,94 @@
+"""Precomputed item-information lookup table.
+
+For a fixed theta grid the table stores
+
+- ``info``  (grid × items) float32 item information,
+- ``order`` (grid × items) int32 bank rows sorted by descending information,
+- ``ids``   bank row -> question id,
+
+so the next-item choice at a given θ is a walk down ``order`` at the nearest
+grid point, skipping used items until ``top_n`` candidates are found. That is
+O(top_n + used) per request instead of computing and sorting information for
+the whole bank.
+"""
+
+import numpy as np
+
+from .binfile import read_binfile, write_binfile
+from .irt import item_information
+
+KIND = 'infotable'
+
+# Matches the ±3 clamp in AdaptiveScoringEngine.updateTheta, 0.1 steps.
+GRID_MIN, GRID_MAX, GRID_POINTS = -3.0, 3.0, 61
+
+
+def build_info_arrays(bank, grid=None, model='2pl'):
+    """Compute the grid, information matrix and per-grid-point item order."""
+    if grid is None:
+        grid = np.linspace(GRID_MIN, GRID_MAX, GRID_POINTS)
+    c = bank.guessing if model == '3pl' else None
+    info = item_information(grid, bank.discrimination, bank.difficulty, c)
+    # Stable sort on -info keeps bank order between equally informative items.
+    order = np.argsort(-info, axis=1, kind='stable').astype(np.int32)
+    return {
+        'ids': np.array([item_id.encode('utf-8') for item_id in bank.ids], dtype=bytes),
+        'grid': np.asarray(grid, dtype=np.float64),
+        'info': info.astype(np.float32),
+        'order': order,
+    }
+
+
+def write_info_table(path, bank, meta=None, grid=None, model='2pl'):
+    arrays = build_info_arrays(bank, grid, model)
+    meta = dict(meta or {}, model=model, items=len(bank))
+    write_binfile(path, KIND, arrays, meta)
+
+
+class InfoTable:
+    def __init__(self, path):
+        self._file = read_binfile(path, KIND)
+        self.meta = self._file.meta
+        self.ids = self._file['ids']
+        self.grid = self._file['grid']
+        self.info = self._file['info']
+        self.order = self._file['order']
+
+    def __len__(self):
+        return self.info.shape[1]
+
+    def grid_index(self, theta):
+        """Index of the grid point nearest to ``theta``."""
+        step = (self.grid[-1] - self.grid[0]) / max(len(self.grid) - 1, 1)
+        i = int(round((theta - self.grid[0]) / step)) if step else 0
+        return min(max(i, 0), len(self.grid) - 1)
+
+    def information(self, theta):
+        """Item information at ``theta``, linearly interpolated between grid points."""
+        theta = min(max(theta, self.grid[0]), self.grid[-1])
+        hi = int(np.searchsorted(self.grid, theta))
+        if hi == 0:
+            return np.asarray(self.info[0], dtype=np.float64)
+        lo = hi - 1
+        w = (theta - self.grid[lo]) / (self.grid[hi] - self.grid[lo])
+        return (1 - w) * self.info[lo] + w * self.info[hi]
+
+    def top_n(self, theta, used=(), n=15):
+        """The ``n`` most informative unused rows at the grid point nearest ``theta``."""
+        used = used if isinstance(used, (set, frozenset)) else set(used)
+        picked = []
+        for row in self.order[self.grid_index(theta)]:
+            row = int(row)
+            if row not in used:
+                picked.append(row)
+                if len(picked) == n:
+                    break
+        return picked
+
+    def select(self, theta, used=(), n=15, rng=None):
+        """Random pick among the top ``n`` rows, as AdaptiveScoringEngine does."""
+        candidates = self.top_n(theta, used, n)
+        if not candidates:
+            return None
+        rng = rng or np.random.default_rng()
+        return candidates[int(rng.integers(len(candidates)))]
@@ -0,0 +1,313 @@
+"""Ingest responses from the backend's winston log into a columnar store.
+
+The backend logs one JSON object per line to ``apps/backend/combined.log``:
+
+    {"level":"info","message":"Served question <qid> for session <sid>", ...}
+    {"level":"info","message":"Answer submitted for session <sid>: correct", ...}
+
+An answer is paired with the last question served to its session (or with
+the ``questionId`` field when the log line carries one). Lines flow through a
+generator pipeline (read -> parse -> pair -> batch), so memory is bounded by
+the batch size and the number of sessions with an unanswered question.
+
+Rows are appended to a store partitioned by day::
+
+    <store>/day=2025-11-26/part-<inode>-<offset>.npz
+
+Each part is an ``np.savez_compressed`` file with the columns ``timestamp``
+(ms since epoch), ``session``, ``question`` (UTF-8 bytes), ``correct`` (uint8)
+and ``latency`` (ms from serve to answer, -1 if unknown). Parts are named
+after the log position they were read from, so re-ingesting after a crash
+overwrites rather than duplicates. A checkpoint next to the store keeps the
+log inode, byte offset and the pending served questions; rotation (rename or
+truncation) is detected from the inode and size.
+
+    python -m iqbank.ingest [--log apps/backend/combined.log] [--follow]
+    python -m iqbank.ingest --compact
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from .store import REPO_ROOT, write_json_atomic
+
+DEFAULT_LOG_PATH = REPO_ROOT / 'apps' / 'backend' / 'combined.log'
+DEFAULT_STORE_DIR = REPO_ROOT / 'var' / 'responses'
+
+COLUMNS = ('timestamp', 'session', 'question', 'correct', 'latency')
+
+# Rows per part file.
+BATCH_ROWS = 100_000
+
+# Served questions with no answer after this long are forgotten (sessions expire after 24h).
+PENDING_TTL_MS = 24 * 3600 * 1000
+
+_SERVED = re.compile(r'^Served question (?P<question>\S+) for session (?P<session>\S+)$')
+_ANSWERED = re.compile(r'^Answer submitted for session (?P<session>\S+): (?P<result>correct|incorrect)$')
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+def _timestamp_ms(value):
+    if not value:
+        return None
+    try:
+        return int(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp() * 1000)
+    except (TypeError, ValueError):
+        return None
+
+
+def _day(ms):
+    return datetime.fromtimestamp(ms / 1000, timezone.utc).strftime('%Y-%m-%d')
+
+
+class LogTailer:
+    """Reads complete lines appended to a log since the last checkpoint.
+
+    ``state`` is ``{"inode": ..., "offset": ...}``. If the log was rotated by
+    renaming, the remainder of the old file is read first (found by inode
+    among its siblings); if it was truncated in place, reading restarts at 0.
+    """
+
+    def __init__(self, path, state=None):
+        self.path = Path(path)
+        self.inode = (state or {}).get('inode')
+        self.offset = (state or {}).get('offset', 0)
+
+    @property
+    def state(self):
+        return {'inode': self.inode, 'offset': self.offset}
+
+    def _rotated(self):
+        for sibling in self.path.parent.glob(self.path.name + '*'):
+            if sibling != self.path and sibling.stat().st_ino == self.inode:
+                return sibling
+        return None
+
+    def _read(self, path, inode):
+        """Yield (inode, line offset, line) for complete lines from ``self.offset``."""
+        with open(path, 'rb') as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # partially written; picked up next time
+                yield inode, self.offset, line
+                self.offset += len(line)
+
+    def lines(self):
+        if not self.path.exists():
+            return
+        stat = self.path.stat()
+        if self.inode is not None and stat.st_ino != self.inode:
+            old = self._rotated()
+            if old is not None:
+                yield from self._read(old, self.inode)
+            self.inode, self.offset = stat.st_ino, 0
+        elif self.inode is None or stat.st_size < self.offset:
+            self.inode, self.offset = stat.st_ino, 0
+        yield from self._read(self.path, self.inode)
+
+
+def parse_events(lines):
+    """Yield (kind, session, question, correct, timestamp, position) for served/answered lines."""
+    for inode, offset, line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(record, dict):
+            continue
+        message = record.get('message', '')
+        ts = _timestamp_ms(record.get('timestamp'))
+        position = (inode, offset)
+        match = _SERVED.match(message)
+        if match:
+            yield 'served', match['session'], match['question'], None, ts, position
+            continue
+        match = _ANSWERED.match(message)
+        if match:
+            yield ('answered', match['session'], record.get('questionId'), match['result'] == 'correct',
+                   ts, position)
+
+
+def pair_responses(events, pending, stats=None):
+    """Yield response rows, pairing answers with the session's last served question.
+
+    ``pending`` maps session -> [question, served ms or None] and is updated in
+    place so it can be checkpointed between runs.
+    """
+    stats = stats if stats is not None else {}
+    for kind, session, question, correct, ts, position in events:
+        now = ts if ts is not None else _now_ms()
+        stats['latest'] = max(stats.get('latest', 0), now)
+        if kind == 'served':
+            pending[session] = [question, ts]
+            continue
+        served = pending.pop(session, None)
+        if question is None:
+            if served is None:
+                stats['unmatched'] = stats.get('unmatched', 0) + 1
+                continue
+            question = served[0]
+        latency = now - served[1] if served and served[1] is not None and ts is not None else -1
+        yield position, (now, session, question, correct, latency)
+
+
+def expire_pending(pending, now_ms, ttl_ms=PENDING_TTL_MS):
+    """Forget served questions older than ``ttl_ms`` before ``now_ms`` (log time, not wall time)."""
+    for session in [s for s, (_, ts) in pending.items() if ts is not None and now_ms - ts > ttl_ms]:
+        del pending[session]
+
+
+def batches(rows, size=BATCH_ROWS):
+    """Group (position, row) pairs into (first position, [rows])."""
+    batch, first = [], None
+    for position, row in rows:
+        if not batch:
+            first = position
+        batch.append(row)
+        if len(batch) >= size:
+            yield first, batch
+            batch = []
+    if batch:
+        yield first, batch
+
+
+class ResponseStore:
+    """Day-partitioned directory of compressed columnar part files."""
+
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        self.root = Path(root)
+
+    @property
+    def checkpoint_path(self):
+        return self.root / 'checkpoint.json'
+
+    def load_checkpoint(self):
+        if self.checkpoint_path.exists():
+            return json.loads(self.checkpoint_path.read_text(encoding='utf-8'))
+        return {}
+
+    def save_checkpoint(self, checkpoint):
+        self.root.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(self.checkpoint_path, checkpoint)
+
+    def _write_part(self, path, columns):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez_compressed(f, **columns)
+        os.replace(tmp, path)
+
+    def append(self, rows, name):
+        """Write ``rows`` (timestamp, session, question, correct, latency) as parts named ``name``."""
+        timestamp = np.array([r[0] for r in rows], dtype=np.int64)
+        days = np.array([_day(ms) for ms in timestamp])
+        columns = {
+            'timestamp': timestamp,
+            'session': np.array([r[1].encode('utf-8') for r in rows], dtype=bytes),
+            'question': np.array([r[2].encode('utf-8') for r in rows], dtype=bytes),
+            'correct': np.array([r[3] for r in rows], dtype=np.uint8),
+            'latency': np.array([r[4] for r in rows], dtype=np.int64).clip(-1, 2 ** 31 - 1).astype(np.int32),
+        }
+        for day in np.unique(days):
+            keep = days == day
+            self._write_part(self.root / f'day={day}' / f'{name}.npz',
+                             {k: v[keep] for k, v in columns.items()})
+
+    def days(self):
+        return sorted(p.name[4:] for p in self.root.glob('day=*') if p.is_dir())
+
+    def parts(self, start=None, end=None):
+        """Part files for days in [start, end] (ISO dates, inclusive)."""
+        for day in self.days():
+            if (start and day < start) or (end and day > end):
+                continue
+            yield from sorted((self.root / f'day={day}').glob('*.npz'))
+
+    def iter_columns(self, start=None, end=None, columns=COLUMNS):
+        """Yield one dict of arrays per part; only one part is in memory at a time."""
+        for part in self.parts(start, end):
+            with np.load(part) as data:
+                yield {name: data[name] for name in columns}
+
+    def iter_responses(self, start=None, end=None):
+        """Yield (session id, question id, correct) in the shape calibrate expects."""
+        for cols in self.iter_columns(start, end, ('session', 'question', 'correct')):
+            for session, question, correct in zip(cols['session'].tolist(), cols['question'].tolist(),
+                                                  cols['correct'].tolist()):
+                yield session.decode('utf-8'), question.decode('utf-8'), bool(correct)
+
+    def compact(self, day):
+        """Merge the parts of ``day`` into one file sorted by timestamp."""
+        parts = sorted((self.root / f'day={day}').glob('*.npz'))
+        if len(parts) <= 1:
+            return 0
+        loaded = []
+        for part in parts:
+            with np.load(part) as data:
+                loaded.append({name: data[name] for name in COLUMNS})
+        merged = {name: np.concatenate([p[name] for p in loaded]) for name in COLUMNS}
+        order = np.argsort(merged['timestamp'], kind='stable')
+        self._write_part(self.root / f'day={day}' / 'compacted.npz', {k: v[order] for k, v in merged.items()})
+        for part in parts:
+            if part.name != 'compacted.npz':
+                part.unlink()
+        return len(parts)
+
+
+def ingest(log_path=DEFAULT_LOG_PATH, store=None, batch_rows=BATCH_ROWS):
+    """Ingest everything appended since the last checkpoint; returns (rows, unmatched answers)."""
+    store = store or ResponseStore()
+    checkpoint = store.load_checkpoint()
+    tailer = LogTailer(log_path, checkpoint.get('log'))
+    pending = checkpoint.get('pending', {})
+    stats = {}
+    rows = 0
+    for (inode, offset), batch in batches(pair_responses(parse_events(tailer.lines()), pending, stats),
+                                          batch_rows):
+        store.append(batch, f'part-{inode}-{offset:012d}')
+        rows += len(batch)
+    latest = max(stats.get('latest', 0), checkpoint.get('latest', 0))
+    expire_pending(pending, latest)
+    store.save_checkpoint({'log': tailer.state, 'pending': pending, 'latest': latest})
+    return rows, stats.get('unmatched', 0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ingest logged responses into the columnar store')
+    parser.add_argument('--log', default=DEFAULT_LOG_PATH, type=Path)
+    parser.add_argument('--store', default=DEFAULT_STORE_DIR, type=Path)
+    parser.add_argument('--follow', action='store_true', help='Keep polling the log for new lines')
+    parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --follow')
+    parser.add_argument('--compact', action='store_true', help='Merge each day into a single part')
+    args = parser.parse_args(argv)
+
+    store = ResponseStore(args.store)
+    if args.compact:
+        for day in store.days():
+            merged = store.compact(day)
+            if merged:
+                print(f'{day}: merged {merged} parts')
+        return
+
+    while True:
+        rows, unmatched = ingest(args.log, store)
+        if rows or unmatched or not args.follow:
+            print(f'Ingested {rows} responses ({unmatched} answers without a served question) into {args.store}')
+        if not args.follow:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""Precomputed result interpretations and answer feedback.
+
+generateResultInterpretation and generateAnswerFeedback build their prompts
+only from (overall score, domain scores) and from (question, answer,
+correctness), so both can be generated ahead of time:
+
+- score profiles are quantized to the overall bands the results route already
+  uses (<90, 90-109, 110-119, 120-129, 130+) and four levels per domain
+  (<90, 90-109, 110+, or ``-`` when the session had no items in it):
+  5 × 4^5 = 5120 profiles, keyed ``"<band>:<levels>"``, e.g. ``"2:2-110"``
+  (Gf, Gc, Gwm, Gv, Gs order);
+- feedback is generated for every (item, option) pair, keyed ``"<id>:<option index>"``.
+
+The store is a single JSON file (``packages/question-bank/src/interpretations.json``)
+that the backend loads once and serves from with a dict lookup. Each entry
+records a short hash of its prompt; regeneration only calls the model for
+entries whose prompt changed or that are missing.
+
+    python -m iqbank.interpret [--profiles-only | --feedback-only] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+from .llm import DEFAULT_BASE_URL, DEFAULT_MODEL, ClientConfig, LLMError, MessagesClient
+from .store import DEFAULT_BANK_PATH, DOMAINS, BankStore, content_hash, write_json_atomic
+
+STORE_VERSION = 1
+
+DEFAULT_STORE_PATH = DEFAULT_BANK_PATH.parent / 'interpretations.json'
+
+# Lower edges of overall bands 1..4 and of domain levels 1..2 (results.ts thresholds).
+OVERALL_BANDS = [90, 110, 120, 130]
+DOMAIN_LEVELS = [90, 110]
+UNTESTED = '-'
+
+# Score used in the prompt for each band/level: scores come from the norm
+# tables (iqbank.norming, within 40-160; 100 + 15θ for θ in [-3, 3] without
+# them), so the open-ended outer bands are represented by scores both reach.
+OVERALL_REPRESENTATIVE = [75, 100, 115, 125, 137]
+DOMAIN_REPRESENTATIVE = [75, 100, 125]
+
+INTERPRETATION_MAX_TOKENS = 1024
+FEEDBACK_MAX_TOKENS = 150
+
+
+def _level(score, edges):
+    return sum(score >= edge for edge in edges)
+
+
+def profile_key(total_score, domain_scores):
+    """Lookup key for a result; ``domain_scores`` maps each tested domain -> score."""
+    levels = ''.join(str(_level(domain_scores[d], DOMAIN_LEVELS)) if d in domain_scores else UNTESTED
+                     for d in DOMAINS)
+    return f'{_level(total_score, OVERALL_BANDS)}:{levels}'
+
+
+def feedback_key(item_id, option_index):
+    return f'{item_id}:{option_index}'
+
+
+def interpretation_prompt(overall_score, domain_scores):
+    """The generateResultInterpretation prompt from claude-integration.ts."""
+    scores = {d: domain_scores.get(d, 'not tested') for d in DOMAINS}
+    return f"""
+You are an expert psychometrician specializing in Arabic IQ testing.
+Provide a detailed interpretation of the following test results in Arabic.
+
+Overall Score: {overall_score}
+Domain Scores:
+- Fluid Reasoning (Gf): {scores['Gf']}
+- Crystallized Intelligence (Gc): {scores['Gc']}
+- Working Memory (Gwm): {scores['Gwm']}
+- Visual Processing (Gv): {scores['Gv']}
+- Processing Speed (Gs): {scores['Gs']}
+
+Please provide:
+1. Overall assessment of cognitive abilities
+2. Strengths and areas for development
+3. Recommendations for further learning
+
+Use formal Arabic (Fusha) and make it culturally appropriate for Arabic speakers.
+"""
+
+
+def feedback_prompt(question, user_answer, is_correct):
+    """The generateAnswerFeedback prompt from claude-integration.ts."""
+    explanation = f"Explanation: {question['explanation_ar']}" if question.get('explanation_ar') else ''
+    return f"""
+Generate brief, encouraging feedback in Arabic for an IQ test taker:
+
+Question: {question['text_ar']}
+User's Answer: {user_answer}
+Correct Answer: {question['correct']}
+Is Correct: {'true' if is_correct else 'false'}
+
+{explanation}
+
+Provide constructive feedback that:
+1. Is culturally appropriate for Arabic speakers
+2. Is encouraging even if the answer is wrong
+3. Briefly explains why the answer is correct/incorrect
+4. Is in formal Arabic (Fusha)
+5. Is max 2-3 sentences
+
+Keep feedback concise and supportive.
+"""
+
+
+def profile_prompts():
+    """Yield (key, prompt) for every quantized score profile."""
+    for overall in OVERALL_REPRESENTATIVE:
+        for representatives in itertools.product([*DOMAIN_REPRESENTATIVE, None], repeat=len(DOMAINS)):
+            scores = {d: score for d, score in zip(DOMAINS, representatives) if score is not None}
+            yield profile_key(overall, scores), interpretation_prompt(overall, scores)
+
+
+def feedback_prompts(questions):
+    """Yield (key, prompt) for every (item, option) pair."""
+    for q in questions:
+        for index, option in enumerate(q['options']):
+            yield feedback_key(q['id'], index), feedback_prompt(q, option, option == q['correct'])
+
+
+def _prompt_hash(prompt, model):
+    return content_hash({'model': model, 'prompt': prompt})[:16]
+
+
+class InterpretationStore:
+    """``{"interpretations": {key: text}, "feedback": {key: text}}`` plus prompt hashes."""
+
+    SECTIONS = ('interpretations', 'feedback')
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self.data = {section: {} for section in self.SECTIONS}
+        self.hashes = {section: {} for section in self.SECTIONS}
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            if data.get('version') == STORE_VERSION:
+                for section in self.SECTIONS:
+                    self.data[section] = data[section]
+                    self.hashes[section] = data['hashes'][section]
+        self.dirty = False
+
+    def get(self, section, key, prompt_hash=None):
+        if prompt_hash is not None and self.hashes[section].get(key) != prompt_hash:
+            return None
+        return self.data[section].get(key)
+
+    def put(self, section, key, text, prompt_hash):
+        self.data[section][key] = text
+        self.hashes[section][key] = prompt_hash
+        self.dirty = True
+
+    def retain(self, section, keys):
+        """Drop entries of ``section`` not in ``keys`` (e.g. removed items)."""
+        stale = set(self.data[section]) - set(keys)
+        for key in stale:
+            del self.data[section][key]
+            self.hashes[section].pop(key, None)
+        self.dirty = self.dirty or bool(stale)
+
+    def save(self):
+        if self.dirty:
+            write_json_atomic(self.path, {'version': STORE_VERSION, **self.data, 'hashes': self.hashes})
+            self.dirty = False
+
+
+@dataclass
+class GenerationReport:
+    generated: int
+    cached: int
+    failed: list  # (section, key, error)
+
+
+async def generate_async(client, store, questions=None, profiles=True):
+    """Fill ``store`` with profile interpretations and, given ``questions``, answer feedback."""
+    model = client.config.model
+    jobs = []
+    if profiles:
+        jobs.extend(('interpretations', key, prompt, INTERPRETATION_MAX_TOKENS)
+                    for key, prompt in profile_prompts())
+    if questions is not None:
+        prompts = list(feedback_prompts(questions))
+        store.retain('feedback', [key for key, _ in prompts])
+        jobs.extend(('feedback', key, prompt, FEEDBACK_MAX_TOKENS) for key, prompt in prompts)
+
+    todo = [job for job in jobs if store.get(job[0], job[1], _prompt_hash(job[2], model)) is None]
+    failed = []
+
+    async def run(section, key, prompt, max_tokens):
+        try:
+            text = await client.complete(prompt, max_tokens)
+        except LLMError as e:
+            failed.append((section, key, str(e)))
+            return
+        store.put(section, key, text.strip(), _prompt_hash(prompt, model))
+
+    try:
+        await asyncio.gather(*(run(*job) for job in todo))
+    finally:
+        store.save()
+    return GenerationReport(generated=len(todo) - len(failed), cached=len(jobs) - len(todo), failed=failed)
+
+
+def generate(client, store, questions=None, profiles=True):
+    return asyncio.run(generate_async(client, store, questions, profiles))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pregenerate result interpretations and answer feedback')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH)
+    parser.add_argument('--out', default=DEFAULT_STORE_PATH, type=Path)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--profiles-only', action='store_true')
+    group.add_argument('--feedback-only', action='store_true')
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL)
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rpm', type=float, default=50, help='Requests per minute')
+    parser.add_argument('--tpm', type=float, default=40_000, help='Tokens per minute')
+    args = parser.parse_args(argv)
+
+    questions = None if args.profiles_only else BankStore(args.bank).load()['questions']
+    client = MessagesClient(ClientConfig(base_url=args.base_url, model=args.model, concurrency=args.concurrency,
+                                         requests_per_minute=args.rpm, tokens_per_minute=args.tpm))
+    report = generate(client, InterpretationStore(args.out), questions,
+                      profiles=not args.feedback_only)
+
+    for section, key, error in report.failed:
+        print(f'FAILED {section} {key}: {error}')
+    print(f'{report.generated} generated, {report.cached} unchanged, {len(report.failed)} failed -> {args.out}')
+    return 1 if report.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
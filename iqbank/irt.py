@@ -0,0 +1,129 @@
+"""Vectorized Item Response Theory core.
+
+Mirrors packages/scoring-engine/src/irt.ts, but evaluates whole theta grids
+against whole item banks in one call. Every function broadcasts ``theta`` of
+shape (...,) against item arrays of shape (n_items,) and returns
+(..., n_items).
+
+The TypeScript engine uses the 2-PL model and ignores the stored guessing
+parameter; pass ``c`` to get the 3-PL model instead.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .store import DEFAULT_BANK_PATH, DOMAINS, BankStore
+
+
+def _logistic(theta, a, b):
+    theta = np.asarray(theta, dtype=np.float64)[..., None]
+    return 1.0 / (1.0 + np.exp(-a * (theta - b)))
+
+
+def probability(theta, a, b, c=None):
+    """P(θ) = c + (1 - c) / (1 + e^(-a(θ - b))); 2-PL when ``c`` is None."""
+    p = _logistic(theta, a, b)
+    if c is None:
+        return p
+    return c + (1.0 - c) * p
+
+
+def item_information(theta, a, b, c=None):
+    """Fisher information of each item at each theta.
+
+    2-PL: I(θ) = a²P(θ)(1-P(θ))
+    3-PL: I(θ) = a²·(Q/P)·((P - c)/(1 - c))²
+    """
+    p = _logistic(theta, a, b)
+    if c is None:
+        return a * a * p * (1.0 - p)
+    p3 = c + (1.0 - c) * p
+    return a * a * ((1.0 - p3) / p3) * ((p3 - c) / (1.0 - c)) ** 2
+
+
+def test_information(theta, a, b, c=None, mask=None):
+    """Sum of item information over the items selected by ``mask``."""
+    info = item_information(theta, a, b, c)
+    if mask is not None:
+        info = np.where(mask, info, 0.0)
+    return info.sum(axis=-1)
+
+
+def select_next(theta, a, b, used, c=None):
+    """Index of the most informative unused item for each theta.
+
+    ``used`` is a boolean array broadcastable to (..., n_items).
+    """
+    info = item_information(theta, a, b, c)
+    info = np.where(used, -np.inf, info)
+    return info.argmax(axis=-1)
+
+
+@dataclass
+class ItemBank:
+    """Item parameters held as contiguous float arrays, indexed by bank row."""
+
+    ids: list
+    domain: np.ndarray  # uint8 index into DOMAINS
+    difficulty: np.ndarray  # b
+    discrimination: np.ndarray  # a
+    guessing: np.ndarray  # c
+    exposure: np.ndarray = None  # Sympson-Hetter exposureControl, 1 when absent
+    _row_by_id: dict = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.exposure is None:
+            self.exposure = np.ones(len(self.ids))
+
+    @classmethod
+    def from_questions(cls, questions):
+        questions = list(questions)
+        domain_index = {d: i for i, d in enumerate(DOMAINS)}
+        return cls(
+            ids=[q['id'] for q in questions],
+            domain=np.array([domain_index[q['domain']] for q in questions], dtype=np.uint8),
+            difficulty=np.array([q['difficulty'] for q in questions], dtype=np.float64),
+            discrimination=np.array([q['discrimination'] for q in questions], dtype=np.float64),
+            guessing=np.array([q.get('guessing', 0.25) for q in questions], dtype=np.float64),
+            exposure=np.array([q.get('exposureControl', 1.0) for q in questions], dtype=np.float64),
+        )
+
+    @classmethod
+    def load(cls, path=DEFAULT_BANK_PATH):
+        """Load from questions.json (plus journal) or a compiled ``.bin`` bank."""
+        if str(path).endswith('.bin'):
+            from .compiled import CompiledBank
+
+            return CompiledBank(path).item_bank()
+        return cls.from_questions(BankStore(path).iter_questions())
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row(self, item_id):
+        if self._row_by_id is None:
+            self._row_by_id = {item_id: i for i, item_id in enumerate(self.ids)}
+        return self._row_by_id[item_id]
+
+    def domain_mask(self, domain):
+        return self.domain == DOMAINS.index(domain)
+
+    def _c(self, model):
+        if model == '2pl':
+            return None
+        if model == '3pl':
+            return self.guessing
+        raise ValueError(f'Unknown IRT model: {model!r}')
+
+    def probability(self, theta, model='2pl'):
+        return probability(theta, self.discrimination, self.difficulty, self._c(model))
+
+    def information(self, theta, model='2pl'):
+        return item_information(theta, self.discrimination, self.difficulty, self._c(model))
+
+    def test_information(self, theta, mask=None, model='2pl'):
+        return test_information(theta, self.discrimination, self.difficulty, self._c(model), mask)
+
+    def select_next(self, theta, used, model='2pl'):
+        return select_next(theta, self.discrimination, self.difficulty, used, self._c(model))
@@ -0,0 +1,474 @@
+"""Item fit and differential item functioning (DIF) over logged responses.
+
+Each session's posterior over a θ grid is computed once. Every response is
+then predicted from its session's *other* responses: the posterior divided
+by the response's own likelihood gives a rest-θ (its mean) and the expected
+P (the mean of P over it). This plays the part of S-X²'s rest score, since
+summed scores are not comparable across adaptive forms, and keeps an item's
+own response from pulling its group and prediction towards it. Per item:
+
+- infit / outfit: information-weighted and unweighted mean squares of the
+  standardized residuals (x - P) / sqrt(P(1 - P)); 1 is perfect fit, values
+  outside ``MNSQ_RANGE`` are flagged,
+- χ²: observed against expected proportion correct in rest-θ quantile
+  groups, Σ_g N_g (O_g - E_g)² / (E_g (1 - E_g)) on (groups - parameters)
+  degrees of freedom.
+
+DIF compares each focal group with the reference group of a group variable
+(e.g. locale ``en`` against ``ar``) at equal rest-θ:
+
+- Mantel-Haenszel over the rest-θ strata: common odds ratio α, ETS delta
+  D = -2.35 ln α, continuity-corrected χ² and the ETS A/B/C class,
+- logistic regression logit P = β0 + β1θ + β2g + β3θg, with likelihood
+  ratio tests for uniform (β2) and non-uniform (β3) DIF and the Nagelkerke
+  R² gain of the full model over θ alone.
+
+Group labels are not in the backend log (the locale only lives in the
+frontend route, apps/frontend/src/app/[locale]); they are read from a CSV
+with a ``session`` column and one column per group variable.
+
+Statistics are computed for blocks of items at once from the item-major view
+of the response matrix (sparse.py), one bincount per sum, and the blocks are
+spread over a process pool.
+
+    python -m iqbank.itemfit --store var/responses --groups sessions.csv --group locale [--out report.csv]
+"""
+
+import argparse
+import csv
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from statistics import NormalDist
+
+import numpy as np
+
+from .calibrate import _shards, load_responses, load_store_responses
+from .estimate import GRID_BOUND, LikelihoodTable
+from .ingest import ResponseStore
+from .irt import ItemBank, probability
+from .norming import normal_cdf
+from .store import DEFAULT_BANK_PATH, DOMAINS
+
+# Rest-θ quantile groups for the χ² and strata for Mantel-Haenszel.
+STRATA = 10
+
+# Cells with fewer responses are left out of the χ² (and its degrees of freedom).
+MIN_CELL = 5
+
+# Responses each of the reference and focal group needs before an item gets DIF statistics.
+MIN_GROUP = 50
+
+# Infit/outfit mean squares outside this range are flagged.
+MNSQ_RANGE = (0.7, 1.3)
+
+# ETS delta thresholds between classes A/B and B/C.
+ETS_BOUNDS = (1.0, 1.5)
+
+# Nagelkerke R² gains between negligible/moderate and moderate/large DIF (Jodoin & Gierl).
+R2_BOUNDS = (0.035, 0.070)
+
+NEWTON_ITERATIONS = 10
+
+# Responses handled by one block of items.
+BLOCK_RESPONSES = 200_000
+
+# Posterior grid; coarser than estimate.py's since every response revisits it.
+GRID_POINTS = 41
+
+
+@dataclass
+class ItemFit:
+    responses: np.ndarray
+    p_correct: np.ndarray
+    infit: np.ndarray
+    outfit: np.ndarray
+    chi2: np.ndarray
+    df: np.ndarray
+    chi2_p: np.ndarray
+
+
+@dataclass
+class Dif:
+    variable: str
+    reference: str
+    focal: str
+    n_reference: np.ndarray
+    n_focal: np.ndarray
+    mh_alpha: np.ndarray
+    mh_delta: np.ndarray
+    mh_delta_se: np.ndarray
+    mh_chi2: np.ndarray
+    mh_p: np.ndarray
+    lr_uniform: np.ndarray  # χ² (1 df) for β2
+    lr_nonuniform: np.ndarray  # χ² (1 df) for β3
+    lr_p: np.ndarray  # p of both together (2 df)
+    r2_delta: np.ndarray
+    ets: np.ndarray = field(default=None)
+
+    def __post_init__(self):
+        if self.ets is None:
+            self.ets = ets_class(self.mh_delta, self.mh_delta_se, self.mh_p)
+
+
+def chi2_sf(x, df):
+    """P(χ²_df > x): exact for 1 and 2 degrees of freedom, Wilson-Hilferty otherwise."""
+    x, df = np.broadcast_arrays(np.maximum(np.asarray(x, dtype=np.float64), 0.0),
+                                np.asarray(df, dtype=np.float64))
+    k = np.maximum(df, 1.0)
+    z = ((x / k) ** (1 / 3) - (1 - 2 / (9 * k))) / np.sqrt(2 / (9 * k))
+    p = np.where(df == 1, 2.0 * (1.0 - normal_cdf(np.sqrt(x))),
+                 np.where(df == 2, np.exp(-0.5 * x), 1.0 - normal_cdf(z)))
+    return np.where(df > 0, np.clip(p, 0.0, 1.0), np.nan)
+
+
+def ets_class(delta, se, p, alpha=0.05):
+    """'A' (negligible), 'B' (moderate) or 'C' (large) per item; '' where there is no statistic.
+
+    C needs |D| >= 1.5 and |D| significantly above 1, B a significant MH χ² and |D| >= 1.
+    """
+    size = np.abs(delta)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        large = (size >= ETS_BOUNDS[1]) & ((size - ETS_BOUNDS[0]) / se > NormalDist().inv_cdf(1 - alpha))
+    moderate = (p < alpha) & (size >= ETS_BOUNDS[0])
+    return np.where(np.isnan(delta), '', np.where(large, 'C', np.where(moderate, 'B', 'A')))
+
+
+def strata_edges(theta, strata=STRATA):
+    """Inner boundaries of ``strata`` θ-quantile groups (fewer where quantiles tie)."""
+    if not len(theta):
+        return np.empty(0)
+    return np.unique(np.quantile(theta, np.linspace(0, 1, strata + 1)[1:-1]))
+
+
+def load_groups(path, variables):
+    """{variable: {session id: label}} from a CSV with a ``session`` column."""
+    groups = {v: {} for v in variables}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for record in csv.DictReader(f):
+            for v in variables:
+                if record.get(v):
+                    groups[v][record['session']] = record[v]
+    return groups
+
+
+def group_codes(sessions, labels, reference=None):
+    """(code per session, labels) with the reference label as code 0; -1 where unknown.
+
+    The reference defaults to the most frequent label.
+    """
+    counts = Counter(labels.get(s) for s in sessions)
+    counts.pop(None, None)
+    order = [label for label, _ in counts.most_common()]
+    if reference is not None:
+        if reference not in counts:
+            raise ValueError(f'reference group {reference!r} has no sessions')
+        order.remove(reference)
+        order.insert(0, reference)
+    index = {label: code for code, label in enumerate(order)}
+    return np.array([index.get(labels.get(s), -1) for s in sessions], dtype=np.int16), order
+
+
+# -- per-block statistics ------------------------------------------------------
+
+_shared = {}
+
+
+def _init_worker(ptr, persons, scores, post, codes):
+    _shared.update(ptr=ptr, persons=persons, scores=scores, post=post, codes=codes)
+
+
+def _logistic_loglik(item, columns, y, n_items):
+    """Maximized log likelihood per item of a logistic regression of ``y`` on ``columns``.
+
+    All items' Newton steps are taken together: the gradient and the k × k
+    information are bincounts over the responses' ``item``.
+    """
+    k = len(columns)
+    beta = np.zeros((n_items, k))
+    for _ in range(NEWTON_ITERATIONS):
+        eta = sum(beta[:, i].take(item) * col for i, col in enumerate(columns))
+        p = 1.0 / (1.0 + np.exp(-eta))
+        w, resid = p * (1.0 - p), y - p
+        grad = np.stack([np.bincount(item, weights=col * resid, minlength=n_items) for col in columns], axis=1)
+        info = np.empty((n_items, k, k))
+        for i in range(k):
+            for j in range(i, k):
+                info[:, i, j] = info[:, j, i] = np.bincount(item, weights=w * columns[i] * columns[j],
+                                                            minlength=n_items)
+        info += 1e-6 * np.eye(k)  # items where a group is all correct or all wrong
+        step = np.linalg.solve(info, grad[..., None])[..., 0]
+        beta += np.clip(step, -5.0, 5.0)
+    eta = sum(beta[:, i].take(item) * col for i, col in enumerate(columns))
+    return np.bincount(item, weights=y * eta - np.logaddexp(0.0, eta), minlength=n_items)
+
+
+def _nagelkerke(ll, ll0, n):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (1.0 - np.exp(2.0 * (ll0 - ll) / n)) / (1.0 - np.exp(2.0 * ll0 / n))
+
+
+def _dif_block(item, s, t, x, group, focal, n_items, n_strata):
+    keep = (group == 0) | (group == focal)
+    item, s, t, x, g = item[keep], s[keep], t[keep], x[keep], (group[keep] == focal).astype(np.float64)
+    n_ref = np.bincount(item, weights=1.0 - g, minlength=n_items)
+    n_focal = np.bincount(item, weights=g, minlength=n_items)
+    enough = (n_ref >= MIN_GROUP) & (n_focal >= MIN_GROUP)
+
+    # Mantel-Haenszel: per item and stratum a 2 × 2 table of group × correct.
+    cell = ((item.astype(np.int64) * n_strata + s) * 2 + g.astype(np.int64)) * 2 + x.astype(np.int64)
+    table = np.bincount(cell, minlength=n_items * n_strata * 4).reshape(n_items, n_strata, 2, 2).astype(np.float64)
+    a, b = table[:, :, 0, 1], table[:, :, 0, 0]  # reference right, wrong
+    c, d = table[:, :, 1, 1], table[:, :, 1, 0]  # focal right, wrong
+    total = a + b + c + d
+    with np.errstate(divide='ignore', invalid='ignore'):
+        num = np.where(total > 0, a * d / total, 0.0).sum(axis=1)
+        den = np.where(total > 0, b * c / total, 0.0).sum(axis=1)
+        alpha = num / den
+        # Robins-Breslow-Greenland variance of ln α.
+        r_k, s_k = np.where(total > 0, a * d / total, 0.0), np.where(total > 0, b * c / total, 0.0)
+        p_k, q_k = np.where(total > 0, (a + d) / total, 0.0), np.where(total > 0, (b + c) / total, 0.0)
+        log_var = ((p_k * r_k).sum(axis=1) / (2 * num ** 2)
+                   + (p_k * s_k + q_k * r_k).sum(axis=1) / (2 * num * den)
+                   + (q_k * s_k).sum(axis=1) / (2 * den ** 2))
+        n_r, n_f, m1, m0 = a + b, c + d, a + c, b + d
+        expected = np.where(total > 0, n_r * m1 / total, 0.0).sum(axis=1)
+        variance = np.where(total > 1, n_r * n_f * m1 * m0 / (total ** 2 * (total - 1)), 0.0).sum(axis=1)
+        mh_chi2 = np.maximum(np.abs(a.sum(axis=1) - expected) - 0.5, 0.0) ** 2 / variance
+        delta = -2.35 * np.log(alpha)
+    valid = enough & (variance > 0) & (num > 0) & (den > 0)
+
+    # Logistic regression: θ alone, + group, + group × θ.
+    one = np.ones_like(t)
+    ll = [_logistic_loglik(item, cols, x, n_items) for cols in ([one, t], [one, t, g], [one, t, g, t * g])]
+    n = n_ref + n_focal
+    right = np.bincount(item, weights=x, minlength=n_items)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p0 = np.clip(right / n, 1e-12, 1 - 1e-12)
+    ll0 = right * np.log(p0) + (n - right) * np.log1p(-p0)
+    uniform, nonuniform = 2.0 * (ll[1] - ll[0]), 2.0 * (ll[2] - ll[1])
+
+    blank = np.where(valid, 1.0, np.nan)
+    fitted = np.where(enough, 1.0, np.nan)
+    return {
+        'n_reference': n_ref.astype(np.int64), 'n_focal': n_focal.astype(np.int64),
+        'mh_alpha': alpha * blank, 'mh_delta': delta * blank, 'mh_delta_se': 2.35 * np.sqrt(log_var) * blank,
+        'mh_chi2': mh_chi2 * blank,
+        'mh_p': chi2_sf(mh_chi2, 1) * blank,
+        'lr_uniform': np.maximum(uniform, 0.0) * fitted, 'lr_nonuniform': np.maximum(nonuniform, 0.0) * fitted,
+        'lr_p': chi2_sf(uniform + nonuniform, 2) * fitted,
+        'r2_delta': (_nagelkerke(ll[2], ll0, n) - _nagelkerke(ll[0], ll0, n)) * fitted,
+    }
+
+
+def _rest_predictions(person, item, x, p_nodes, nodes):
+    """(P, θ) of each response from its person's posterior without that response.
+
+    The stored posterior is divided by the response's own likelihood node by
+    node, so grouping and prediction use only the person's other responses.
+    """
+    post = _shared['post']
+    weight_sum = np.zeros(len(person))
+    p_sum = np.zeros(len(person))
+    theta_sum = np.zeros(len(person))
+    correct = x > 0
+    for q in range(len(nodes)):
+        p = p_nodes[q].take(item)
+        w = post[q].take(person) / np.where(correct, p, 1.0 - p)
+        weight_sum += w
+        p_sum += w * p
+        theta_sum += w * nodes[q]
+    return p_sum / weight_sum, theta_sum / weight_sum
+
+
+def _item_block(lo, hi, a, b, c, n_params, nodes, edges, focal_groups):
+    """Fit and DIF statistics for items ``lo:hi``; ``focal_groups`` is [(variable index, focal code)]."""
+    ptr, persons, scores = _shared['ptr'], _shared['persons'], _shared['scores']
+    start, end = ptr[lo], ptr[hi]
+    person = persons[start:end]
+    x = scores[start:end].astype(np.float64)
+    m = hi - lo
+    item = np.repeat(np.arange(m), np.diff(ptr[lo:hi + 1]))
+    p_nodes = np.clip(probability(nodes[:, None], a[lo:hi], b[lo:hi], None if c is None else c[lo:hi]),
+                      1e-9, 1 - 1e-9)
+    p, t = _rest_predictions(person, item, x, p_nodes, nodes)
+    n_strata = len(edges) + 1
+    s = np.searchsorted(edges, t, side='right')
+
+    w = p * (1.0 - p)
+    sq = (x - p) ** 2
+    n = np.bincount(item, minlength=m).astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fit = {
+            'responses': n.astype(np.int64),
+            'p_correct': np.bincount(item, weights=x, minlength=m) / n,
+            'outfit': np.bincount(item, weights=sq / w, minlength=m) / n,
+            'infit': np.bincount(item, weights=sq, minlength=m) / np.bincount(item, weights=w, minlength=m),
+        }
+        cell = item * n_strata + s
+        count = np.bincount(cell, minlength=m * n_strata).reshape(m, n_strata)
+        observed = np.bincount(cell, weights=x, minlength=m * n_strata).reshape(m, n_strata) / count
+        expected = np.bincount(cell, weights=p, minlength=m * n_strata).reshape(m, n_strata) / count
+        use = count >= MIN_CELL
+        terms = count * (observed - expected) ** 2 / (expected * (1.0 - expected))
+    fit['chi2'] = np.where(use, terms, 0.0).sum(axis=1)
+    fit['df'] = use.sum(axis=1) - n_params
+    fit['chi2_p'] = chi2_sf(fit['chi2'], fit['df'])
+
+    codes = _shared['codes']
+    difs = [_dif_block(item, s, t, x, codes[v].take(person), focal, m, n_strata) for v, focal in focal_groups]
+    return fit, difs
+
+
+def posteriors(data, table):
+    """Normalized posterior of every person over ``table.nodes``: float32, nodes × persons."""
+    cell = data.items + data.scores.astype(np.intp) * len(table)
+    both = np.concatenate([table.log_q, table.log_p]).T.copy()
+    person = data.person_index()
+    log_post = np.empty((len(table.nodes), data.n_persons))
+    for q in range(len(table.nodes)):
+        log_post[q] = np.bincount(person, weights=both[q].take(cell), minlength=data.n_persons)
+    log_post += table.log_prior[:, None]
+    log_post -= log_post.max(axis=0)
+    post = np.exp(log_post)
+    post /= post.sum(axis=0)
+    return post.astype(np.float32)
+
+
+def analyze(data, bank, groups=None, model='2pl', strata=STRATA, workers=None):
+    """Item fit and DIF for every bank row.
+
+    ``data`` is a sparse.ResponseMatrix and ``groups`` {variable: (code per
+    person, labels)} as group_codes returns. Returns (ItemFit, [Dif per
+    variable and focal group]).
+    """
+    if model not in ('2pl', '3pl'):
+        raise ValueError(f'Unknown IRT model: {model!r}')
+    groups = groups or {}
+    variables = list(groups)
+    codes = [groups[v][0] for v in variables]
+    focal_groups = [(i, focal) for i, v in enumerate(variables) for focal in range(1, len(groups[v][1]))]
+    table = LikelihoodTable(bank, model, nodes=np.linspace(-GRID_BOUND, GRID_BOUND, GRID_POINTS))
+    post = posteriors(data, table)
+    edges = strata_edges(table.nodes @ post, strata)
+    c = bank.guessing if model == '3pl' else None
+    n_params = 3 if model == '3pl' else 2
+
+    csc = data.csc
+    shards = _shards(csc.ptr, BLOCK_RESPONSES)
+    args = [(lo, hi, bank.discrimination, bank.difficulty, c, n_params, table.nodes, edges, focal_groups)
+            for lo, hi in shards]
+    workers = workers or os.cpu_count() or 1
+    initargs = (csc.ptr, csc.persons, csc.scores, post, codes)
+    try:
+        if workers == 1 or len(shards) <= 1:
+            _init_worker(*initargs)
+            parts = [_item_block(*arg) for arg in args]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+                parts = list(pool.map(_item_block, *zip(*args)))
+    finally:
+        _shared.clear()
+
+    def joined(blocks):
+        return {name: np.concatenate([block[name] for block in blocks]) for name in blocks[0]}
+
+    fit = ItemFit(**joined([fit for fit, _ in parts]))
+    difs = [
+        Dif(variables[v], groups[variables[v]][1][0], groups[variables[v]][1][focal],
+            **joined([block_difs[k] for _, block_difs in parts]))
+        for k, (v, focal) in enumerate(focal_groups)
+    ]
+    return fit, difs
+
+
+# -- report -------------------------------------------------------------------
+
+def misfit(fit, alpha=0.01):
+    """Items whose mean squares leave MNSQ_RANGE or whose χ² is significant after Bonferroni."""
+    tested = np.isfinite(fit.chi2_p)
+    lo, hi = MNSQ_RANGE
+    with np.errstate(invalid='ignore'):
+        mnsq = (fit.infit < lo) | (fit.infit > hi) | (fit.outfit < lo) | (fit.outfit > hi)
+        chi2 = tested & (fit.chi2_p < alpha / max(int(tested.sum()), 1))
+    return mnsq | chi2
+
+
+def report_rows(bank, fit, difs, alpha=0.01):
+    """One dict per item with responses, for the CSV report."""
+    flagged = misfit(fit, alpha)
+    for row in np.flatnonzero(fit.responses):
+        record = {
+            'id': bank.ids[row], 'domain': DOMAINS[bank.domain[row]], 'responses': int(fit.responses[row]),
+            'p_correct': f'{fit.p_correct[row]:.4f}', 'infit': f'{fit.infit[row]:.3f}',
+            'outfit': f'{fit.outfit[row]:.3f}', 'chi2': f'{fit.chi2[row]:.2f}', 'df': int(fit.df[row]),
+            'chi2_p': f'{fit.chi2_p[row]:.4g}', 'misfit': int(flagged[row]),
+        }
+        for dif in difs:
+            prefix = f'{dif.variable}:{dif.focal}'
+            record.update({
+                f'{prefix}:mh_delta': f'{dif.mh_delta[row]:.3f}', f'{prefix}:ets': dif.ets[row],
+                f'{prefix}:lr_p': f'{dif.lr_p[row]:.4g}', f'{prefix}:r2_delta': f'{dif.r2_delta[row]:.4f}',
+            })
+        yield record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Item fit and DIF report over logged responses')
+    parser.add_argument('responses', nargs='*', help='JSON Lines response logs')
+    parser.add_argument('--store', type=Path, help='Read responses from an iqbank.ingest store instead')
+    parser.add_argument('--since', help='First day (YYYY-MM-DD) to read from --store')
+    parser.add_argument('--until', help='Last day (YYYY-MM-DD) to read from --store')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH)
+    parser.add_argument('--model', choices=['2pl', '3pl'], default='2pl')
+    parser.add_argument('--groups', type=Path, help='CSV with a session column and group variable columns')
+    parser.add_argument('--group', action='append', default=[], help='Group variable to test for DIF (repeatable)')
+    parser.add_argument('--reference', action='append', default=[], metavar='VARIABLE=LABEL',
+                        help='Reference group of a variable (default: its most frequent label)')
+    parser.add_argument('--strata', type=int, default=STRATA)
+    parser.add_argument('--alpha', type=float, default=0.01)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--out', type=Path, help='Write one CSV row per item')
+    args = parser.parse_args(argv)
+    if bool(args.responses) == bool(args.store):
+        parser.error('give either response logs or --store')
+    if args.group and not args.groups:
+        parser.error('--group needs --groups')
+
+    started = time.perf_counter()
+    bank = ItemBank.load(args.bank)
+    if args.store:
+        data = load_store_responses(ResponseStore(args.store), bank, args.since, args.until)
+    else:
+        data = load_responses(args.responses, bank)
+    references = dict(r.split('=', 1) for r in args.reference)
+    labels = load_groups(args.groups, args.group) if args.group else {}
+    groups = {v: group_codes(data.persons, labels[v], references.get(v)) for v in args.group}
+    fit, difs = analyze(data, bank, groups, args.model, args.strata, args.workers)
+    elapsed = time.perf_counter() - started
+
+    answered = fit.responses > 0
+    flagged = misfit(fit, args.alpha)
+    print(f'Analyzed {int(answered.sum())} items over {data.n_responses} responses from '
+          f'{data.n_persons} sessions in {elapsed:.1f} s')
+    print(f'  misfit: {int(flagged.sum())} items (mean squares outside {MNSQ_RANGE} or '
+          f'χ² p < {args.alpha} after Bonferroni)')
+    for dif in difs:
+        classes = Counter(dif.ets[answered].tolist())
+        large = int((dif.r2_delta >= R2_BOUNDS[1]).sum())
+        print(f'  DIF {dif.variable} {dif.focal} vs {dif.reference}: ETS B {classes["B"]}, C {classes["C"]}; '
+              f'{large} items with R² gain ≥ {R2_BOUNDS[1]}')
+    if args.out:
+        rows = list(report_rows(bank, fit, difs, args.alpha))
+        with open(args.out, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ['id'])
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f'Wrote {len(rows)} items to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
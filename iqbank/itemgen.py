@@ -0,0 +1,323 @@
+"""Parametric item models for the rule-based domains.
+
+scripts/generate_questions.py and add_questions*.py write every stem, option
+list and key by hand. An item model instead draws parameters, renders the
+stem from them and computes the key, the distractors and a predicted
+difficulty:
+
+- ``sequence`` (Gf): arithmetic, geometric, square, alternating and
+  Fibonacci-like series,
+- ``analogy`` (Gf): numeric analogies a -> b, c -> d, e -> ? under one
+  rule that no other rule fits,
+- ``ordering`` (Gf): transitive comparisons between 3-5 people,
+- ``counting`` (Gs): occurrences of a digit in a row of digits.
+
+Distractors are the answers of typical wrong rules (e.g. the arithmetic
+continuation of a geometric series), topped up with near misses, so every
+option is plausible and none equals the key. The predicted difficulty is a
+linear function of the model's features (rule, size of the numbers, chain
+length, ...) rated on [0, 1] and converted to the logit scale by
+iqbank.rescale, and discrimination starts at a common prior; both are
+starting values for iqbank.calibrate and iqbank.online.
+
+Items flow through a lazy pipeline, generate (endless) -> unique (drops
+stems already in the bank or drawn before, after Arabic normalization) ->
+islice -> batches -> BankStore.append, so memory is bounded by one batch and
+the set of stems seen.
+
+    python -m iqbank.itemgen --count 10000 [--models sequence ordering] [--seed 1] [--write]
+"""
+
+import argparse
+import random
+import time
+import uuid
+from itertools import islice
+
+from .arabic import normalize
+from .rescale import logit_difficulty
+from .store import DEFAULT_BANK_PATH, BankStore
+
+# Items per journal append.
+BATCH_SIZE = 1_000
+
+# Prior discrimination of generated items until they are calibrated.
+DEFAULT_DISCRIMINATION = 1.2
+
+OPTIONS = 4
+
+# Repeated stems in a row after which a stream counts as exhausted.
+MAX_MISSES = 10_000
+
+_NAMES = ['أحمد', 'سالم', 'خالد', 'عمر', 'يوسف', 'علي', 'حسن', 'كريم', 'ماجد', 'فهد', 'سعيد', 'ناصر']
+
+# (comparative, opposite comparative, superlative, opposite superlative)
+_RELATIONS = [
+    ('أطول', 'أقصر', 'الأطول', 'الأقصر'),
+    ('أكبر سنًا', 'أصغر سنًا', 'الأكبر سنًا', 'الأصغر سنًا'),
+    ('أسرع', 'أبطأ', 'الأسرع', 'الأبطأ'),
+    ('أثقل', 'أخف', 'الأثقل', 'الأخف'),
+]
+
+
+def _clip(value):
+    return round(min(max(value, 0.0), 1.0), 2)
+
+
+def _join(values):
+    return '، '.join(str(v) for v in values)
+
+
+def _options(rng, key, candidates, near_misses=True):
+    """Key plus distinct distractors, the ``candidates`` first, shuffled."""
+    options = [key]
+    for candidate in candidates:
+        if len(options) == OPTIONS:
+            break
+        if candidate not in options and (not isinstance(candidate, int) or candidate >= 0):
+            options.append(candidate)
+    step = 1
+    while near_misses and len(options) < OPTIONS:
+        for candidate in (key + step, key - step):
+            if len(options) < OPTIONS and candidate >= 0 and candidate not in options:
+                options.append(candidate)
+        step += 1
+    options = [str(o) for o in options]
+    rng.shuffle(options)
+    return options
+
+
+# -- item models ----------------------------------------------------------------
+
+def sequence(rng):
+    rule = rng.choice(['arithmetic', 'geometric', 'square', 'alternating', 'fibonacci'])
+    shown = rng.randint(4, 5)
+    if rule == 'arithmetic':
+        step = rng.randint(2, 25) * rng.choice([1, 1, -1])
+        start = rng.randint(1, 99) - min(step, 0) * shown
+        terms = [start + k * step for k in range(shown + 1)]
+        wrong = [terms[-1] + 2 * step, terms[-1] + step + 1, terms[-1] + step - 1]
+        explanation = f"كل حد {'يزيد' if step > 0 else 'ينقص'} بمقدار {abs(step)} عن الحد السابق"
+        base = 0.1 + 0.01 * abs(step) + (0.1 if step < 0 else 0.0)
+    elif rule == 'geometric':
+        ratio, start = rng.randint(2, 5), rng.randint(1, 12)
+        terms = [start * ratio ** k for k in range(shown + 1)]
+        wrong = [2 * terms[-2] - terms[-3], terms[-2] * (ratio + 1), terms[-2] + terms[-3]]
+        explanation = f'كل حد يساوي الحد السابق مضروبًا في {ratio}'
+        base = 0.25 + 0.05 * ratio
+    elif rule == 'square':
+        start, offset = rng.randint(1, 12), rng.choice([0, 0, 0, 1, 2, 3, 4, 5])
+        terms = [(start + k) ** 2 + offset for k in range(shown + 1)]
+        wrong = [2 * terms[-2] - terms[-3], terms[-1] + 2, terms[-1] - 2]
+        explanation = 'مربعات الأعداد المتتالية' + (f' مضافًا إليها {offset}' if offset else '')
+        base = 0.4 + (0.1 if offset else 0.0)
+    elif rule == 'alternating':
+        up, down = rng.randint(3, 12), rng.randint(1, 4)
+        shown += 1
+        terms = [rng.randint(1, 50)]
+        for k in range(shown):
+            terms.append(terms[-1] + (up if k % 2 == 0 else -down))
+        # The next step's sign is the one the series did not just take.
+        last_step = terms[-2] - terms[-3]
+        wrong = [terms[-2] + last_step, terms[-2] + up - down, terms[-3]]
+        explanation = f'الحدود تزيد بمقدار {up} ثم تنقص بمقدار {down} بالتناوب'
+        base = 0.5
+    else:
+        terms = [rng.randint(1, 12), rng.randint(1, 12)]
+        while len(terms) < shown + 1:
+            terms.append(terms[-1] + terms[-2])
+        wrong = [2 * terms[-2] - terms[-3], 2 * terms[-2], terms[-2] + terms[-4]]
+        explanation = 'كل حد يساوي مجموع الحدين السابقين له'
+        base = 0.55
+    *given, key = terms
+    difficulty = base + 0.05 * (len(str(max(terms))) - 1) + (0.05 if shown == 4 else 0.0)
+    return {
+        'text_ar': f'أكمل النمط: {_join(given)}، ؟',
+        'options': _options(rng, key, wrong),
+        'correct': str(key),
+        'explanation_ar': f'{explanation}، لذا الحد التالي هو {key}',
+        'difficulty': _clip(difficulty),
+    }
+
+
+_ANALOGY_RULES = {
+    # rule: (f(x, k), description, base difficulty, range of k)
+    'add': (lambda x, k: x + k, 'إضافة {k}', 0.15, (2, 20)),
+    'multiply': (lambda x, k: x * k, 'الضرب في {k}', 0.3, (2, 9)),
+    'square': (lambda x, k: x * x, 'تربيع العدد', 0.4, (2, 2)),
+    'square-plus': (lambda x, k: x * x + k, 'تربيع العدد ثم إضافة {k}', 0.55, (1, 9)),
+    'linear': (lambda x, k: 2 * x + k, 'الضرب في 2 ثم إضافة {k}', 0.5, (1, 9)),
+    'linear-3': (lambda x, k: 3 * x - k, 'الضرب في 3 ثم طرح {k}', 0.55, (1, 5)),
+}
+
+
+def _analogy_answers(pairs, x):
+    """Answers for ``x`` of every rule and k that maps all ``pairs``."""
+    return {f(x, k) for f, _, _, (lo, hi) in _ANALOGY_RULES.values() for k in range(lo, hi + 1)
+            if all(f(p, k) == q for p, q in pairs)}
+
+
+def analogy(rng):
+    f, description, base, (k_min, k_max) = _ANALOGY_RULES[rng.choice(list(_ANALOGY_RULES))]
+    # Two example pairs, redrawn until no other rule fits them with a different answer.
+    while True:
+        k = rng.randint(k_min, k_max)
+        a, c, e = rng.sample(range(2, 21), 3)
+        b, d, key = f(a, k), f(c, k), f(e, k)
+        if _analogy_answers([(a, b), (c, d)], e) == {key}:
+            break
+    wrong = [e + (b - a), e + (d - c), key + k]
+    if b % a == 0:
+        wrong.insert(0, e * (b // a))
+    difficulty = base + 0.05 * (len(str(key)) - 1)
+    return {
+        'text_ar': f'{a} يقابل {b}، و{c} يقابل {d}. ما العدد الذي يقابل {e}؟',
+        'options': _options(rng, key, wrong),
+        'correct': str(key),
+        'explanation_ar': f'القاعدة هي {description.format(k=k)}، لذا {e} يقابل {key}',
+        'difficulty': _clip(difficulty),
+    }
+
+
+def ordering(rng):
+    n = rng.randint(3, 5)
+    people = rng.sample(_NAMES, n)  # from most to least
+    more, less, most, least = rng.choice(_RELATIONS)
+    mixed = rng.random() < 0.5
+    premises = []
+    for upper, lower in zip(people, people[1:]):
+        if mixed and rng.random() < 0.5:
+            premises.append(f'{lower} {less} من {upper}')
+        else:
+            premises.append(f'{upper} {more} من {lower}')
+    shuffled = rng.random() < 0.5
+    if shuffled:
+        rng.shuffle(premises)
+    ask_most = rng.random() < 0.5
+    key = people[0] if ask_most else people[-1]
+    distractors = people[1:] if ask_most else people[-2::-1]
+    difficulty = 0.2 + 0.12 * (n - 3) + (0.1 if mixed else 0.0) + (0.08 if shuffled else 0.0)
+    return {
+        'text_ar': f"{'، و'.join(premises)}. من {most if ask_most else least}؟",
+        'options': _options(rng, key, distractors, near_misses=False),
+        'correct': key,
+        'explanation_ar': f'الترتيب من {most} إلى {least}: {_join(people)}، لذا الجواب {key}',
+        'difficulty': _clip(difficulty),
+    }
+
+
+def counting(rng):
+    length = rng.randint(12, 30)
+    target = rng.randint(0, 9)
+    digits = [rng.randint(0, 9) for _ in range(length)]
+    digits[rng.randrange(length)] = target
+    key = digits.count(target)
+    difficulty = 0.1 + 0.4 * (length - 12) / 18 + 0.03 * min(key, 5)
+    return {
+        'text_ar': f"كم مرة يظهر الرقم {target} في السلسلة: {' '.join(map(str, digits))}؟",
+        'options': _options(rng, key, [key + 1, key - 1, key + 2]),
+        'correct': str(key),
+        'explanation_ar': f'عدد مرات ظهور الرقم {target} في السلسلة هو {key}',
+        'difficulty': _clip(difficulty),
+    }
+
+
+# name: (domain, model, culturalContext)
+MODELS = {
+    'sequence': ('Gf', sequence, 'الأنماط العددية'),
+    'analogy': ('Gf', analogy, 'التناظر العددي'),
+    'ordering': ('Gf', ordering, 'الاستدلال المنطقي'),
+    'counting': ('Gs', counting, 'سرعة المعالجة'),
+}
+
+
+# -- pipeline -------------------------------------------------------------------
+
+def generate(models=None, seed=0, discrimination=DEFAULT_DISCRIMINATION):
+    """Endless stream of schema-valid items drawn round-robin-at-random from ``models``."""
+    rng = random.Random(seed)
+    names = list(models or MODELS)
+    for name in names:
+        if name not in MODELS:
+            raise ValueError(f'Unknown item model: {name!r}')
+    while True:
+        domain, model, context = MODELS[rng.choice(names)]
+        item = model(rng)
+        yield {
+            'id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            'domain': domain,
+            'difficulty': logit_difficulty(item['difficulty'], discrimination),
+            'discrimination': discrimination,
+            'guessing': round(1.0 / len(item['options']), 2),
+            'text_ar': item['text_ar'],
+            'options': item['options'],
+            'correct': item['correct'],
+            'explanation_ar': item['explanation_ar'],
+            'culturalContext': context,
+        }
+
+
+def unique(items, seen=None, max_misses=MAX_MISSES):
+    """Drop items whose normalized stem is in ``seen`` (extended in place) or repeats.
+
+    Stops after ``max_misses`` repeats in a row, i.e. once the models'
+    parameter space is used up.
+    """
+    seen = set() if seen is None else seen
+    misses = 0
+    for item in items:
+        stem = normalize(item['text_ar'])
+        if stem in seen:
+            misses += 1
+            if misses >= max_misses:
+                return
+            continue
+        misses = 0
+        seen.add(stem)
+        yield item
+
+
+def batches(items, size=BATCH_SIZE):
+    items = iter(items)
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
+def existing_stems(store):
+    return {normalize(q['text_ar']) for q in store.iter_questions()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate items from parametric item models')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH)
+    parser.add_argument('--count', type=int, default=1_000)
+    parser.add_argument('--models', nargs='+', choices=list(MODELS), default=list(MODELS))
+    parser.add_argument('--seed', type=int, default=None, help='Default: a fresh random seed')
+    parser.add_argument('--sample', type=int, default=3, help='Items to print')
+    parser.add_argument('--write', action='store_true', help='Append the items to the bank journal')
+    args = parser.parse_args(argv)
+
+    store = BankStore(args.bank)
+    seed = args.seed if args.seed is not None else random.SystemRandom().getrandbits(64)
+    items = islice(unique(generate(args.models, seed), existing_stems(store)), args.count)
+
+    started = time.perf_counter()
+    written = 0
+    for batch in batches(items):
+        if args.write:
+            store.append(batch)
+        for item in batch[:max(args.sample - written, 0)]:
+            print(f"  [{item['domain']} {item['difficulty']:.2f}] {item['text_ar']} "
+                  f"{item['options']} -> {item['correct']}")
+        written += len(batch)
+    elapsed = time.perf_counter() - started
+    action = f'Appended to {store.journal_path}' if args.write else 'Generated (dry run, use --write)'
+    print(f'{action}: {written} items from {", ".join(args.models)} (seed {seed}) in {elapsed:.2f} s '
+          f'({written / max(elapsed, 1e-9):,.0f} items/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+"""Link a separately calibrated item batch onto the bank's θ scale.
+
+A batch calibrated on its own (e.g. by ``iqbank.calibrate`` on a pilot
+sample) is on its own logit scale, θ_bank = A·θ_batch + B. Items present in
+both the bank and the batch (anchors) determine A and B:
+
+- mean/sigma: A = sd(b_bank) / sd(b_batch), B = mean(b_bank) - A·mean(b_batch)
+  over the anchors' difficulties,
+- Haebara: minimize Σ_θ w(θ) Σ_j [P_j(θ; bank) - P_j(θ; batch → bank)]²,
+  the item characteristic curves compared one by one,
+- Stocking-Lord: minimize Σ_θ w(θ) [Σ_j P_j(θ; bank) - Σ_j P_j(θ; batch → bank)]²,
+  the test characteristic curves,
+
+where batch → bank maps a to a / A and b to A·b + B (c is unchanged) and w
+is a standard normal weight over a quadrature grid. The criteria are
+evaluated as one (grid × anchors) array per call and minimized with
+Nelder-Mead from the mean/sigma solution: about a second for 10k anchors.
+
+Linked parameters are written as they are; a value outside the schema
+ranges is an error rather than clipped.
+
+    python -m iqbank.linking batch.json [--method stocking-lord] [--write]
+"""
+
+import argparse
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .irt import ItemBank, probability
+from .schema import PARAM_RANGES
+from .store import DEFAULT_BANK_PATH, BankStore
+
+METHODS = ('mean-sigma', 'haebara', 'stocking-lord')
+
+GRID_POINTS = 41
+GRID_BOUND = 4.0
+
+
+@dataclass
+class LinkResult:
+    method: str
+    slope: float  # A
+    intercept: float  # B
+    anchors: int
+    loss: float
+    evaluations: int = 0
+
+    def transform(self, a, b):
+        """Batch (a, b) on the bank scale."""
+        return np.asarray(a) / self.slope, self.slope * np.asarray(b) + self.intercept
+
+
+def load_batch(path):
+    """Items of a batch file: a questions.json-style dict or a plain list."""
+    data = json.loads(Path(path).read_text(encoding='utf-8'))
+    return data['questions'] if isinstance(data, dict) else data
+
+
+def anchor_rows(bank, batch):
+    """(bank rows, batch rows) of items present in both."""
+    bank_rows, batch_rows = [], []
+    for row, item_id in enumerate(batch.ids):
+        try:
+            bank_rows.append(bank.row(item_id))
+        except KeyError:
+            continue
+        batch_rows.append(row)
+    return np.array(bank_rows, dtype=np.int64), np.array(batch_rows, dtype=np.int64)
+
+
+def nelder_mead(f, x0, step=0.1, tol=1e-10, max_iter=500):
+    """Minimize ``f`` over R^n from ``x0``; returns (x, f(x), evaluations)."""
+    n = len(x0)
+    simplex = np.vstack([x0, x0 + step * np.eye(n)])
+    values = np.array([f(x) for x in simplex])
+    evaluations = n + 1
+    for _ in range(max_iter):
+        order = np.argsort(values)
+        simplex, values = simplex[order], values[order]
+        if values[-1] - values[0] <= tol * (abs(values[0]) + tol):
+            break
+        centroid = simplex[:-1].mean(axis=0)
+        reflected = centroid + (centroid - simplex[-1])
+        f_r = f(reflected)
+        evaluations += 1
+        if f_r < values[0]:
+            expanded = centroid + 2 * (centroid - simplex[-1])
+            f_e = f(expanded)
+            evaluations += 1
+            simplex[-1], values[-1] = (expanded, f_e) if f_e < f_r else (reflected, f_r)
+        elif f_r < values[-2]:
+            simplex[-1], values[-1] = reflected, f_r
+        else:
+            inside = f_r >= values[-1]
+            contracted = centroid + (0.5 if not inside else -0.5) * (centroid - simplex[-1])
+            f_c = f(contracted)
+            evaluations += 1
+            if f_c < min(f_r, values[-1]):
+                simplex[-1], values[-1] = contracted, f_c
+            else:
+                simplex[1:] = simplex[0] + 0.5 * (simplex[1:] - simplex[0])
+                values[1:] = [f(x) for x in simplex[1:]]
+                evaluations += n
+    best = int(np.argmin(values))
+    return simplex[best], float(values[best]), evaluations
+
+
+class Linker:
+    """Scale transformation from a batch onto the bank, from their common items."""
+
+    def __init__(self, bank, batch, model='3pl'):
+        if model not in ('2pl', '3pl'):
+            raise ValueError(f'Unknown IRT model: {model!r}')
+        self.bank_rows, self.batch_rows = anchor_rows(bank, batch)
+        if len(self.bank_rows) < 2:
+            raise ValueError(f'need at least 2 anchor items, found {len(self.bank_rows)}')
+        self.a_bank = bank.discrimination[self.bank_rows]
+        self.b_bank = bank.difficulty[self.bank_rows]
+        self.a_batch = batch.discrimination[self.batch_rows]
+        self.b_batch = batch.difficulty[self.batch_rows]
+        use_c = model == '3pl'
+        self.c_bank = bank.guessing[self.bank_rows] if use_c else None
+        self.c_batch = batch.guessing[self.batch_rows] if use_c else None
+        self.nodes = np.linspace(-GRID_BOUND, GRID_BOUND, GRID_POINTS)
+        weights = np.exp(-0.5 * self.nodes ** 2)
+        self.weights = weights / weights.sum()
+        self.target = probability(self.nodes, self.a_bank, self.b_bank, self.c_bank)  # (grid, anchors)
+
+    @property
+    def anchors(self):
+        return len(self.bank_rows)
+
+    def mean_sigma(self):
+        sd_batch = self.b_batch.std()
+        slope = float(self.b_bank.std() / sd_batch) if sd_batch > 0 else 1.0
+        return slope, float(self.b_bank.mean() - slope * self.b_batch.mean())
+
+    def _curves(self, slope, intercept):
+        return probability(self.nodes, self.a_batch / slope, slope * self.b_batch + intercept, self.c_batch)
+
+    def haebara_loss(self, slope, intercept):
+        diff = self.target - self._curves(slope, intercept)
+        return float(self.weights @ (diff * diff).sum(axis=1))
+
+    def stocking_lord_loss(self, slope, intercept):
+        diff = self.target.sum(axis=1) - self._curves(slope, intercept).sum(axis=1)
+        return float(self.weights @ (diff * diff))
+
+    def link(self, method='stocking-lord'):
+        if method not in METHODS:
+            raise ValueError(f'Unknown linking method: {method!r}')
+        slope, intercept = self.mean_sigma()
+        if method == 'mean-sigma':
+            return LinkResult(method, slope, intercept, self.anchors, self.stocking_lord_loss(slope, intercept))
+        loss = self.haebara_loss if method == 'haebara' else self.stocking_lord_loss
+        # Optimize log A so the slope stays positive.
+        x, value, evaluations = nelder_mead(lambda x: loss(np.exp(x[0]), x[1]),
+                                            np.array([np.log(slope), intercept]))
+        return LinkResult(method, float(np.exp(x[0])), float(x[1]), self.anchors, value, evaluations)
+
+
+def linked_items(batch_questions, result, include_anchors=False, bank_ids=()):
+    """Batch items with parameters on the bank scale.
+
+    Raises ValueError if a linked value falls outside QuestionSchema.
+    """
+    anchors = set(bank_ids)
+    items = []
+    for q in batch_questions:
+        if q['id'] in anchors and not include_anchors:
+            continue
+        a, b = result.transform(q['discrimination'], q['difficulty'])
+        item = dict(q)
+        for name, value in (('discrimination', float(a)), ('difficulty', float(b))):
+            lo, hi = PARAM_RANGES[name]
+            value = round(value, 4)
+            if not lo <= value <= hi:
+                raise ValueError(f'linked {name} {value} of item {q["id"]} is outside [{lo}, {hi}]')
+            item[name] = value
+        items.append(item)
+    return items
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Link a calibrated item batch onto the bank scale')
+    parser.add_argument('batch', type=Path, help='Batch items (JSON list or questions.json-style dict)')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH)
+    parser.add_argument('--method', choices=METHODS, default='stocking-lord')
+    parser.add_argument('--model', choices=['2pl', '3pl'], default='3pl')
+    parser.add_argument('--write', action='store_true', help='Upsert linked non-anchor items into the bank journal')
+    args = parser.parse_args(argv)
+
+    store = BankStore(args.bank)
+    bank = ItemBank.from_questions(store.iter_questions())
+    batch_questions = load_batch(args.batch)
+    linker = Linker(bank, ItemBank.from_questions(batch_questions), args.model)
+
+    results = {}
+    for method in METHODS:
+        started = time.perf_counter()
+        results[method] = linker.link(method)
+        r = results[method]
+        print(f'{method:14s} A={r.slope:.4f} B={r.intercept:+.4f} loss={r.loss:.3g} '
+              f'({r.evaluations} evaluations, {(time.perf_counter() - started) * 1000:.1f} ms)')
+    chosen = results[args.method]
+    items = linked_items(batch_questions, chosen, bank_ids=bank.ids)
+    print(f'{linker.anchors} anchors; {len(items)} new items linked with {args.method}')
+    if args.write:
+        store.upsert(items)
+        print(f'Upserted {len(items)} items into {store.journal_path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""Minimal asyncio client for the Anthropic Messages API.
+
+Requests go through ``urllib`` on worker threads, so there is no dependency
+beyond the standard library. Calls are bounded by a concurrency limit and by
+request- and token-per-minute budgets, and retried with exponential backoff on
+429, 5xx and connection errors (honouring ``retry-after``).
+
+The base URL is configurable so tests and local runs can point at a stub
+server speaking the same protocol.
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+
+DEFAULT_BASE_URL = os.environ.get('CLAUDE_API_URL', 'https://api.anthropic.com')
+DEFAULT_MODEL = 'claude-3-5-sonnet-20241022'
+API_VERSION = '2023-06-01'
+
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+class LLMError(Exception):
+    """A request failed permanently (bad request, or retries exhausted)."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+def estimate_tokens(text):
+    """Rough input token count; Arabic runs about 3 UTF-8 bytes per token."""
+    return len(text.encode('utf-8')) // 3 + 1
+
+
+class TokenBucket:
+    """Refills ``rate`` units per second up to ``capacity``; ``acquire`` waits for enough."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount=1.0):
+        amount = min(float(amount), self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.level < amount:
+                await asyncio.sleep((amount - self.level) / self.rate)
+                self._refill()
+            self.level -= amount
+
+
+@dataclass
+class ClientConfig:
+    api_key: str = None
+    base_url: str = DEFAULT_BASE_URL
+    model: str = DEFAULT_MODEL
+    concurrency: int = 8
+    requests_per_minute: float = 50
+    tokens_per_minute: float = 40_000
+    max_retries: int = 6
+    backoff: float = 1.0  # seconds before the first retry, doubled each time
+    max_backoff: float = 60.0
+    timeout: float = 60.0
+
+
+class MessagesClient:
+    def __init__(self, config=None):
+        self.config = config or ClientConfig()
+        if self.config.api_key is None:
+            self.config.api_key = os.environ.get('CLAUDE_API_KEY', '')
+        self._semaphore = None
+        self._requests = None
+        self._tokens = None
+        self.calls = 0  # HTTP requests made, including retries
+
+    def _limits(self):
+        # Created lazily so they bind to the running event loop.
+        if self._semaphore is None:
+            c = self.config
+            self._semaphore = asyncio.Semaphore(c.concurrency)
+            self._requests = TokenBucket(c.requests_per_minute / 60, max(1, c.requests_per_minute / 60))
+            self._tokens = TokenBucket(c.tokens_per_minute / 60, c.tokens_per_minute / 60 * 5)
+        return self._semaphore, self._requests, self._tokens
+
+    def _post(self, body):
+        request = urllib.request.Request(
+            self.config.base_url.rstrip('/') + '/v1/messages',
+            data=json.dumps(body).encode('utf-8'),
+            headers={
+                'content-type': 'application/json',
+                'x-api-key': self.config.api_key,
+                'anthropic-version': API_VERSION,
+            },
+            method='POST',
+        )
+        with urllib.request.urlopen(request, timeout=self.config.timeout) as response:
+            return json.loads(response.read())
+
+    def _delay(self, attempt, retry_after=None):
+        if retry_after:
+            try:
+                return min(float(retry_after), self.config.max_backoff)
+            except ValueError:
+                pass
+        delay = min(self.config.backoff * 2 ** attempt, self.config.max_backoff)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def complete(self, prompt, max_tokens=1024):
+        """Text of the model's reply to a single user message."""
+        semaphore, requests, tokens = self._limits()
+        body = {
+            'model': self.config.model,
+            'max_tokens': max_tokens,
+            'messages': [{'role': 'user', 'content': prompt}],
+        }
+        cost = estimate_tokens(prompt) + max_tokens
+
+        for attempt in range(self.config.max_retries + 1):
+            await requests.acquire()
+            await tokens.acquire(cost)
+            async with semaphore:
+                self.calls += 1
+                try:
+                    reply = await asyncio.to_thread(self._post, body)
+                except urllib.error.HTTPError as e:
+                    if e.code not in RETRY_STATUS or attempt == self.config.max_retries:
+                        raise LLMError(f'HTTP {e.code}: {e.read()[:200]!r}', e.code) from e
+                    delay = self._delay(attempt, e.headers.get('retry-after'))
+                except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+                    if attempt == self.config.max_retries:
+                        raise LLMError(f'request failed: {e}') from e
+                    delay = self._delay(attempt)
+                else:
+                    return ''.join(block.get('text', '') for block in reply.get('content', [])
+                                   if block.get('type') == 'text')
+            await asyncio.sleep(delay)
@@ -0,0 +1,178 @@
+"""Norming: smoothed θ → IQ and θ → percentile conversion tables.
+
+results.ts turned percent correct into IQ as 100 + (p - 50)·0.6 and
+AdaptiveScoringEngine.calculateScores as 100 + (p - 50)·3. Both now look up
+one table per scale (``overall`` and each domain) written by this module.
+
+The θ that is normed is the one the backend can reproduce at request time:
+the engine's updateTheta replayed over a session's responses in order (over
+all responses for ``overall``, over one domain's responses for a domain).
+For each scale the tables are equipercentile conversions of the norm sample:
+
+    percentile(θ) = 100 · F(θ),    IQ(θ) = 100 + 15 · Φ⁻¹(F(θ)),
+
+where F is the Gaussian-kernel smoothed CDF of the sample's θ, so the tables
+are smooth and monotone even where the engine's clamping at ±3 piles up mass.
+The sample is archived sessions from an iqbank.ingest store or, before there
+are enough of those, simulated examinees from a standard normal population.
+
+    python -m iqbank.norming --store var/responses [--since 2025-01-01]
+    python -m iqbank.norming --simulate 200000
+
+The committed ``packages/scoring-engine/src/norms.json`` is the simulated
+default (seed 0) for the published bank; rerun it after a publish that changes
+item parameters (``npm run build:norms -w @iq-test/scoring-engine``).
+"""
+
+import argparse
+from pathlib import Path
+from statistics import NormalDist
+
+import numpy as np
+
+from .calibrate import load_store_responses
+from .ingest import ResponseStore
+from .irt import ItemBank
+from .simulate import SimulationConfig, sample_population, simulate
+from .sparse import ResponseMatrix
+from .store import DEFAULT_BANK_PATH, DOMAINS, REPO_ROOT, write_json_atomic
+
+DEFAULT_NORMS_PATH = REPO_ROOT / 'packages' / 'scoring-engine' / 'src' / 'norms.json'
+NORMS_VERSION = 1
+
+# Table grid over the engine's θ range.
+THETA_MIN = -3.0
+THETA_MAX = 3.0
+THETA_STEP = 0.05
+
+IQ_MEAN = 100.0
+IQ_SD = 15.0
+IQ_BOUNDS = (40.0, 160.0)
+
+# Smallest sample a scale needs before it gets its own table.
+MIN_SESSIONS = 500
+
+
+def replay_theta(data, a, b, config=None):
+    """The engine's running θ after each session's responses, in order.
+
+    ``data`` is a sparse.ResponseMatrix; sessions are advanced together one
+    response position at a time.
+    """
+    config = config or SimulationConfig()
+    lengths = np.diff(data.ptr)
+    theta = np.full(data.n_persons, config.start_theta)
+    for k in range(int(lengths.max()) if len(lengths) else 0):
+        persons = np.flatnonzero(lengths > k)
+        item = data.items[data.ptr[persons] + k]
+        correct = data.scores[data.ptr[persons] + k]
+        a_i, b_i, t = a[item], b[item], theta[persons]
+        p = 1.0 / (1.0 + np.exp(-a_i * (t - b_i)))
+        theta[persons] = np.clip(t + a_i * (correct - p) * config.learning_rate,
+                                 config.theta_min, config.theta_max)
+    return theta
+
+
+def scale_thetas(data, bank, config=None):
+    """{scale: replayed θ per session}; a domain only counts sessions that answered its items."""
+    thetas = {'overall': replay_theta(data, bank.discrimination, bank.difficulty, config)}
+    domain = bank.domain[data.items]
+    for code, name in enumerate(DOMAINS):
+        keep = domain == code
+        if keep.any():
+            thetas[name] = replay_theta(data.select(keep), bank.discrimination, bank.difficulty, config)
+    return thetas
+
+
+def simulated_data(bank, examinees, config=None, seed=0, workers=None):
+    """ResponseMatrix of simulated sessions of a standard normal population."""
+    result = simulate(bank, sample_population(examinees, 'normal', seed), config, workers=workers, seed=seed)
+    given = result.administered >= 0
+    ptr = np.zeros(result.n_examinees + 1, dtype=np.int64)
+    np.cumsum(result.test_length, out=ptr[1:])
+    return ResponseMatrix(ptr=ptr, items=result.administered[given].astype(np.int32),
+                          scores=result.responses[given], n_items=len(bank))
+
+
+def normal_cdf(x):
+    """Φ(x), vectorized (Abramowitz & Stegun 7.1.26, |error| < 1.5e-7); norms.ts uses the same."""
+    z = np.abs(np.asarray(x, dtype=np.float64)) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def smoothed_cdf(sample, grid, bandwidth=None):
+    """Gaussian-kernel CDF of ``sample`` at ``grid``; Silverman bandwidth by default."""
+    sample = np.asarray(sample, dtype=np.float64)
+    if bandwidth is None:
+        bandwidth = max(1.06 * sample.std() * len(sample) ** -0.2, THETA_STEP)
+    # Sessions share few distinct θ values (the clamp, short tests): weight unique values.
+    values, counts = np.unique(np.round(sample, 3), return_counts=True)
+    return normal_cdf((grid[:, None] - values[None, :]) / bandwidth) @ counts / len(sample)
+
+
+def conversion_table(sample, grid, bandwidth=None):
+    """(IQ, percentile) arrays at ``grid`` for one scale's norm sample."""
+    f = np.clip(smoothed_cdf(sample, grid, bandwidth), 1e-4, 1 - 1e-4)
+    z = np.array([NormalDist().inv_cdf(p) for p in f])
+    iq = np.clip(IQ_MEAN + IQ_SD * z, *IQ_BOUNDS)
+    return iq, 100.0 * f
+
+
+def build_norms(thetas, source, min_sessions=MIN_SESSIONS, bandwidth=None):
+    """The norms.json document for {scale: θ sample}; scales below ``min_sessions`` are left out."""
+    points = int(round((THETA_MAX - THETA_MIN) / THETA_STEP)) + 1
+    grid = THETA_MIN + THETA_STEP * np.arange(points)
+    scales, sizes = {}, {}
+    for scale, sample in thetas.items():
+        if len(sample) < min_sessions:
+            continue
+        iq, percentile = conversion_table(sample, grid, bandwidth)
+        scales[scale] = {'iq': np.round(iq, 2).tolist(), 'percentile': np.round(percentile, 3).tolist()}
+        sizes[scale] = int(len(sample))
+    return {'version': NORMS_VERSION, 'source': source, 'thetaMin': THETA_MIN, 'thetaStep': THETA_STEP,
+            'sessions': sizes, 'scales': scales}
+
+
+def convert(norms, scale, theta):
+    """(IQ, percentile) for ``theta`` by linear interpolation, as norms.ts does."""
+    table = norms['scales'][scale]
+    grid = norms['thetaMin'] + norms['thetaStep'] * np.arange(len(table['iq']))
+    return float(np.interp(theta, grid, table['iq'])), float(np.interp(theta, grid, table['percentile']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build θ → IQ / percentile norm tables')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH)
+    parser.add_argument('--store', type=Path, help='Norm on archived sessions from an iqbank.ingest store')
+    parser.add_argument('--since', help='First day (YYYY-MM-DD) of archived sessions to use')
+    parser.add_argument('--until', help='Last day (YYYY-MM-DD) of archived sessions to use')
+    parser.add_argument('--simulate', type=int, default=200_000, metavar='N',
+                        help='Simulated examinees when no --store is given')
+    parser.add_argument('--min-sessions', type=int, default=MIN_SESSIONS)
+    parser.add_argument('--out', type=Path, default=DEFAULT_NORMS_PATH)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    bank = ItemBank.load(args.bank)
+    if args.store:
+        data = load_store_responses(ResponseStore(args.store), bank, args.since, args.until)
+        source = f'store:{args.since or "start"}..{args.until or "end"}'
+    else:
+        data = simulated_data(bank, args.simulate, seed=args.seed, workers=args.workers)
+        source = f'simulated:{args.simulate}'
+
+    norms = build_norms(scale_thetas(data, bank), source, args.min_sessions)
+    write_json_atomic(args.out, norms)
+    print(f'Wrote norms for {len(norms["scales"])} scales ({data.n_persons} sessions, {source}) to {args.out}')
+    for scale, size in norms['sessions'].items():
+        low, high = convert(norms, scale, -1.0), convert(norms, scale, 1.0)
+        print(f'  {scale:8s} n={size:<8d} θ=-1 → IQ {low[0]:5.1f} ({low[1]:4.1f}%)  '
+              f'θ=+1 → IQ {high[0]:5.1f} ({high[1]:4.1f}%)')
+
+
+if __name__ == '__main__':
+    main()
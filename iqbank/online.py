@@ -0,0 +1,301 @@
+"""Online item recalibration from streaming responses (stochastic EM).
+
+calibrate.py refits every item from the full response history. Here each
+item keeps the EM sufficient statistics instead, expected responses ``n``
+and expected correct ``r`` at every quadrature node, and they are updated as
+responses arrive:
+
+- responses are buffered per open session,
+- a session with no response in the last ``session_idle`` responses is
+  closed: its posterior over the nodes given all its responses is added to
+  ``n[i]`` (and to ``r[i]`` if correct) for every item i it answered,
+- every ``update_every`` responses idle sessions are closed, the statistics
+  are decayed by the half-life and one Fisher-scoring M-step
+  (calibrate.mstep) moves a and b.
+
+The statistics start from pseudo-counts at the bank's current parameters
+(``prior_weight`` responses' worth), so an item only moves once real data
+outweighs them, and the half-life lets the bank follow drift.
+
+Responses come from the backend log through the iqbank.ingest pipeline (the
+"Answer submitted" lines answers.ts writes next to sessionStore.addResponse),
+or from the rows of an ingest store past a per-day timestamp high-water
+mark. State, including the log position or the store marks and open
+sessions, is checkpointed to one .npz file. ``--write`` upserts the items
+whose parameters moved by more than ``--min-change`` since they were last
+written, at most every ``--write-every`` seconds while following, so the
+journal grows with real changes rather than with polls.
+
+    python -m iqbank.online [--log apps/backend/combined.log] [--follow] [--write]
+    python -m iqbank.online --store var/responses
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+
+from .calibrate import CalibrationResult, apply_calibration, mstep, quadrature
+from .ingest import DEFAULT_LOG_PATH, LogTailer, ResponseStore, pair_responses, parse_events
+from .irt import ItemBank
+from .store import DEFAULT_BANK_PATH, REPO_ROOT, BankStore
+
+DEFAULT_STATE_PATH = REPO_ROOT / 'var' / 'online' / 'state.npz'
+
+# Sessions whose posterior is kept; the least recently answered are dropped first.
+MAX_SESSIONS = 100_000
+
+
+class OnlineCalibrator:
+    def __init__(self, bank, model='2pl', prior_weight=50.0, half_life=200_000, update_every=5_000,
+                 session_idle=None, min_responses=20, quad_points=41, max_sessions=MAX_SESSIONS):
+        if model not in ('2pl', '3pl'):
+            raise ValueError(f'Unknown IRT model: {model!r}')
+        self.ids = list(bank.ids)
+        self.model = model
+        self.update_every = update_every
+        self.session_idle = update_every if session_idle is None else session_idle
+        self.half_life = half_life
+        self.min_responses = min_responses
+        self.max_sessions = max_sessions
+        self.nodes, self.log_w = quadrature(quad_points)
+        self.a = np.array(bank.discrimination, dtype=np.float64)
+        self.b = np.array(bank.difficulty, dtype=np.float64)
+        self.c = np.array(bank.guessing, dtype=np.float64) if model == '3pl' else np.zeros(len(self.ids))
+
+        # Pseudo-counts: prior_weight responses from N(0, 1) examinees answering at the current parameters.
+        weight = np.exp(self.log_w)
+        self.n = np.tile(prior_weight * weight, (len(self.ids), 1))
+        self.r = self.n * self._probabilities()
+        self.observed = np.zeros(len(self.ids), dtype=np.int64)  # real responses seen per item
+        self.responses = 0
+        # session id -> [rows, correct, response count at the last answer]; least recently answered first.
+        self.sessions = OrderedDict()
+
+    def _probabilities(self):
+        s = 1.0 / (1.0 + np.exp(-self.a[:, None] * (self.nodes[None, :] - self.b[:, None])))
+        return np.clip(self.c[:, None] + (1.0 - self.c[:, None]) * s, 1e-9, 1 - 1e-9)
+
+    def observe(self, session, row, correct):
+        """Record one response (bank row ``row``) of ``session``."""
+        entry = self.sessions.pop(session, None) or [[], [], 0]
+        entry[0].append(int(row))
+        entry[1].append(bool(correct))
+        self.responses += 1
+        entry[2] = self.responses
+        self.sessions[session] = entry
+        self.observed[row] += 1
+        if len(self.sessions) > self.max_sessions:
+            self.close([next(iter(self.sessions))])
+        if self.responses % self.update_every == 0:
+            self.update()
+
+    def close(self, sessions):
+        """E-step for finished ``sessions``: add their posteriors given all their responses to n and r."""
+        entries = [self.sessions.pop(s) for s in sessions]
+        if not entries:
+            return
+        lengths = np.array([len(rows) for rows, _, _ in entries])
+        rows = np.fromiter((r for e in entries for r in e[0]), dtype=np.int64, count=lengths.sum())
+        correct = np.fromiter((x for e in entries for x in e[1]), dtype=bool, count=lengths.sum())
+        p = self._probabilities()[rows]
+        log_lik = np.where(correct[:, None], np.log(p), np.log1p(-p))
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        log_post = self.log_w + np.add.reduceat(log_lik, starts, axis=0)
+        post = np.exp(log_post - log_post.max(axis=1, keepdims=True))
+        post /= post.sum(axis=1, keepdims=True)
+        post = np.repeat(post, lengths, axis=0)
+        np.add.at(self.n, rows, post)
+        np.add.at(self.r, rows[correct], post[correct])
+
+    def update(self, flush=False):
+        """Close idle sessions (all with ``flush``), decay the statistics and take one M-step."""
+        idle = self.responses - self.session_idle
+        self.close([s for s, (_, _, last) in self.sessions.items() if flush or last <= idle])
+        decay = 0.5 ** (self.update_every / self.half_life)
+        self.n *= decay
+        self.r *= decay
+        a, b, c = mstep(self.r, self.n, self.nodes, self.a, self.b, self.c,
+                        fit_guessing=self.model == '3pl', iterations=1)
+        ready = self.observed >= self.min_responses
+        self.a = np.where(ready, a, self.a)
+        self.b = np.where(ready, b, self.b)
+        self.c = np.where(ready, c, self.c)
+
+    def moved(self, a, b, c, tolerance):
+        """Fitted items whose parameters differ from ``a``, ``b`` (and ``c`` under 3-PL) by more than ``tolerance``."""
+        change = np.maximum(np.abs(self.a - a), np.abs(self.b - b))
+        if self.model == '3pl':
+            change = np.maximum(change, np.abs(self.c - c))
+        return (self.observed >= self.min_responses) & (change > tolerance)
+
+    def result(self):
+        """Current parameters as a CalibrationResult for calibrate.apply_calibration."""
+        return CalibrationResult(
+            discrimination=self.a, difficulty=self.b, guessing=self.c, n_responses=self.observed,
+            fitted=self.observed >= self.min_responses, iterations=self.responses // self.update_every,
+            converged=False, log_likelihood=[],
+        )
+
+    # -- checkpoint -----------------------------------------------------------
+
+    def save(self, path, extra=None):
+        """Write the state (and a JSON-serializable ``extra``) atomically to ``path``."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entries = list(self.sessions.values())
+        meta = {'ids': self.ids, 'model': self.model, 'responses': self.responses,
+                'sessions': list(self.sessions), 'extra': extra or {}}
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez(f, a=self.a, b=self.b, c=self.c, n=self.n, r=self.r, observed=self.observed,
+                     lengths=np.array([len(rows) for rows, _, _ in entries], dtype=np.int64),
+                     last=np.array([last for _, _, last in entries], dtype=np.int64),
+                     rows=np.array([r for rows, _, _ in entries for r in rows], dtype=np.int64),
+                     correct=np.array([x for _, xs, _ in entries for x in xs], dtype=bool),
+                     meta=np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def load(self, path):
+        """Restore a checkpoint; returns its ``extra``.
+
+        State is matched to the current bank by item id: items added since
+        the checkpoint keep their fresh pseudo-counts, and items removed from
+        the bank are dropped along with their buffered responses.
+        """
+        with np.load(path) as data:
+            meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+            if meta['model'] != self.model:
+                raise ValueError(f"{path} was written for the {meta['model']} model, not {self.model}")
+            position = {item_id: row for row, item_id in enumerate(self.ids)}
+            remap = np.array([position.get(item_id, -1) for item_id in meta['ids']], dtype=np.int64)
+            kept = remap >= 0
+            for name in ('a', 'b', 'c', 'n', 'r', 'observed'):
+                getattr(self, name)[remap[kept]] = data[name][kept]
+            bounds = np.concatenate([[0], np.cumsum(data['lengths'])]).tolist()
+            rows, correct = remap[data['rows']], data['correct']
+            self.sessions = OrderedDict()
+            for session, start, end, last in zip(meta['sessions'], bounds, bounds[1:], data['last'].tolist()):
+                keep = rows[start:end] >= 0
+                if keep.any():
+                    self.sessions[session] = [rows[start:end][keep].tolist(),
+                                              correct[start:end][keep].tolist(), last]
+        self.responses = meta['responses']
+        return meta['extra']
+
+
+def log_responses(tailer, pending):
+    """(session, question id, correct) for responses appended to the log since ``tailer``'s position."""
+    for _, (_, session, question, correct, _) in pair_responses(parse_events(tailer.lines()), pending):
+        yield session, question, correct
+
+
+def store_responses(store, marks):
+    """(session, question id, correct) from store rows past the per-day ``marks``, which are advanced in place.
+
+    ``marks`` maps a day to [timestamp, rows at that timestamp] consumed so
+    far. The mark is taken over the day's rows sorted by timestamp rather
+    than over part names, so it holds when ``ResponseStore.compact`` merges
+    the parts already consumed into ``compacted.npz``.
+    """
+    for day in store.days():
+        mark_ts, mark_count = marks.get(day, [-1, 0])
+        parts = []
+        for part in sorted((store.root / f'day={day}').glob('*.npz')):
+            with np.load(part) as data:
+                timestamp = data['timestamp']
+                if len(timestamp) and timestamp.max() >= mark_ts:
+                    parts.append({name: data[name] for name in ('timestamp', 'session', 'question', 'correct')})
+        if not parts:
+            continue
+        columns = {name: np.concatenate([p[name] for p in parts]) for name in parts[0]}
+        order = np.argsort(columns['timestamp'], kind='stable')
+        timestamp = columns['timestamp'][order]
+        # Rows at the mark's timestamp that were already consumed come first among equals.
+        start = np.searchsorted(timestamp, mark_ts, side='left')
+        start += min(mark_count, np.searchsorted(timestamp, mark_ts, side='right') - start)
+        if start == len(timestamp):
+            continue
+        order = order[start:]
+        for session, question, value in zip(columns['session'][order].tolist(), columns['question'][order].tolist(),
+                                            columns['correct'][order].tolist()):
+            yield session.decode('utf-8'), question.decode('utf-8'), bool(value)
+        last = int(timestamp[-1])
+        marks[day] = [last, int(len(timestamp) - np.searchsorted(timestamp, last, side='left'))]
+
+
+def consume(calibrator, bank, responses):
+    """Feed (session, question id, correct) into ``calibrator``; returns (used, unknown items)."""
+    used = unknown = 0
+    for session, question, correct in responses:
+        try:
+            row = bank.row(question)
+        except KeyError:
+            unknown += 1
+            continue
+        calibrator.observe(session, row, correct)
+        used += 1
+    return used, unknown
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Recalibrate items online from streaming responses')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH)
+    parser.add_argument('--log', default=DEFAULT_LOG_PATH, type=Path)
+    parser.add_argument('--store', type=Path, help='Replay an iqbank.ingest store instead of tailing the log')
+    parser.add_argument('--state', default=DEFAULT_STATE_PATH, type=Path)
+    parser.add_argument('--model', choices=['2pl', '3pl'], default='2pl')
+    parser.add_argument('--half-life', type=int, default=200_000, help='Responses until old data weighs half')
+    parser.add_argument('--update-every', type=int, default=5_000, help='Responses between M-steps')
+    parser.add_argument('--follow', action='store_true', help='Keep polling the log for new lines')
+    parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --follow')
+    parser.add_argument('--write', action='store_true', help='Upsert moved items into the bank journal')
+    parser.add_argument('--write-every', type=float, default=300.0, help='Seconds between writes with --follow')
+    parser.add_argument('--min-change', type=float, default=0.05, help='Smallest parameter change to write')
+    args = parser.parse_args(argv)
+
+    store = BankStore(args.bank)
+    bank = ItemBank.from_questions(store.iter_questions())
+    calibrator = OnlineCalibrator(bank, args.model, half_life=args.half_life, update_every=args.update_every)
+    extra = calibrator.load(args.state) if args.state.exists() else {}
+    # Parameters as they stand in the bank; items are written once they move away from these.
+    written = (bank.discrimination.copy(), bank.difficulty.copy(), bank.guessing.copy())
+    last_write = time.monotonic()
+    once = args.store or not args.follow
+
+    while True:
+        if args.store:
+            marks = extra.setdefault('marks', {})
+            used, unknown = consume(calibrator, bank, store_responses(ResponseStore(args.store), marks))
+        else:
+            tailer = LogTailer(args.log, extra.get('log'))
+            pending = extra.get('pending', {})
+            used, unknown = consume(calibrator, bank, log_responses(tailer, pending))
+            extra = {'log': tailer.state, 'pending': pending}
+        calibrator.save(args.state, extra)
+        if used or not args.follow:
+            fitted = int((calibrator.observed >= calibrator.min_responses).sum())
+            print(f'Consumed {used} responses ({unknown} for unknown items); '
+                  f'{calibrator.responses} in total, {fitted} items updating')
+        if args.write and (once or time.monotonic() - last_write >= args.write_every):
+            moved = calibrator.moved(*written, args.min_change)
+            if moved.any():
+                updated = apply_calibration(store, bank, replace(calibrator.result(), fitted=moved), args.model)
+                written = tuple(np.where(moved, new, old) for new, old in
+                                zip((calibrator.a, calibrator.b, calibrator.c), written))
+                print(f'Upserted {updated} moved items into {store.journal_path}')
+            last_write = time.monotonic()
+        if once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Publish pending bank edits as a new version with a change manifest.
+
+Folds the journal (store.py) into questions.json under a new version and
+writes, before the bank itself, a change manifest next to it::
+
+    questions.changes/<previous version>..<version>.json
+
+    {"version", "previousVersion", "contentHash", "previousContentHash",
+     "lastUpdated", "added": [id], "removed": [id], "updated": [id],
+     "items": {id: item}}          # full content of added and updated items
+
+Both files are written to a temp file, fsynced and renamed into place, and
+the directory is fsynced, so a reader sees either the old or the new bank.
+A consumer holding version V finds its next step by the file name prefix
+``V..`` and applies it to its in-memory bank and indexes; if there is no such
+file it reloads the whole bank. refreshQuestionBank in @iq-test/question-bank
+does exactly that.
+
+The version is the one set in the journal (``store.set_metadata``), the one
+given with ``--version``, or the published version with its ``--bump`` part
+incremented. It must be greater than the published version, compared as
+major.minor.patch, so a stale pinned version cannot move the bank back.
+
+    python -m iqbank.publish [--bump minor] [--version 2.1.0] [--dry-run]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from .store import DEFAULT_BANK_PATH, BankStore, content_hash, write_json_atomic
+
+BUMP_PARTS = ('major', 'minor', 'patch')
+
+
+def changes_dir(bank_path):
+    bank_path = Path(bank_path)
+    return bank_path.with_name(f'{bank_path.stem}.changes')
+
+
+def version_key(version):
+    """'1.2' -> (1, 2, 0): major, minor and patch for comparison; missing parts count as 0."""
+    numbers = [int(x) for x in version.split('.')[:3]]
+    return tuple(numbers + [0] * (3 - len(numbers)))
+
+
+def bump_version(version, part='minor'):
+    """'1.2.3' -> '1.3.0' for part='minor'; missing parts count as 0."""
+    numbers = list(version_key(version))
+    index = BUMP_PARTS.index(part)
+    numbers[index] += 1
+    numbers[index + 1:] = [0] * (2 - index)
+    return '.'.join(str(n) for n in numbers)
+
+
+def diff_questions(old, new):
+    """Ids added, removed and updated from ``old`` to ``new`` (lists of items), in bank order."""
+    old_hashes = {q['id']: content_hash(q) for q in old}
+    new_ids = set()
+    added, updated = [], []
+    for q in new:
+        new_ids.add(q['id'])
+        before = old_hashes.get(q['id'])
+        if before is None:
+            added.append(q['id'])
+        elif before != content_hash(q):
+            updated.append(q['id'])
+    removed = [q['id'] for q in old if q['id'] not in new_ids]
+    return {'added': added, 'removed': removed, 'updated': updated}
+
+
+def publish(bank_path=DEFAULT_BANK_PATH, version=None, part='minor', last_updated=None, dry_run=False):
+    """Publish the journal as a new version. Returns the change manifest, or None if nothing changed."""
+    store = BankStore(bank_path)
+    with open(store.path, 'r', encoding='utf-8') as f:
+        published = json.load(f)
+    bank = store.load()
+
+    changes = diff_questions(published['questions'], bank['questions'])
+    if not any(changes.values()) and version is None and bank['version'] == published['version']:
+        return None
+    if version is None:
+        version = bank['version'] if bank['version'] != published['version'] else \
+            bump_version(published['version'], part)
+    if version_key(version) <= version_key(published['version']):
+        raise ValueError(f"version {version} is not greater than the published {published['version']}")
+
+    bank['version'] = version
+    if last_updated is not None or bank['lastUpdated'] == published['lastUpdated']:
+        bank['lastUpdated'] = last_updated or time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    changed = set(changes['added']) | set(changes['updated'])
+    manifest = {
+        'version': version,
+        'previousVersion': published['version'],
+        'contentHash': content_hash(bank['questions']),
+        'previousContentHash': content_hash(published['questions']),
+        'lastUpdated': bank['lastUpdated'],
+        **changes,
+        'items': {q['id']: q for q in bank['questions'] if q['id'] in changed},
+    }
+    if dry_run:
+        return manifest
+
+    # Manifest first: whoever sees the new bank can always find how to get there.
+    directory = changes_dir(store.path)
+    directory.mkdir(exist_ok=True)
+    write_json_atomic(directory / f"{manifest['previousVersion']}..{version}.json", manifest)
+    store.replace(bank['questions'], version, bank['lastUpdated'])
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Publish pending question bank edits as a new version')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH, type=Path)
+    parser.add_argument('--version', help='Version to publish (default: journal version or a bump)')
+    parser.add_argument('--bump', choices=BUMP_PARTS, default='minor')
+    parser.add_argument('--dry-run', action='store_true', help='Print the change summary without writing')
+    args = parser.parse_args(argv)
+
+    manifest = publish(args.bank, args.version, args.bump, dry_run=args.dry_run)
+    if manifest is None:
+        print('Nothing to publish')
+        return
+    action = 'Would publish' if args.dry_run else 'Published'
+    print(f"{action} {manifest['previousVersion']} -> {manifest['version']}: "
+          f"{len(manifest['added'])} added, {len(manifest['updated'])} updated, "
+          f"{len(manifest['removed'])} removed")
+
+
+if __name__ == '__main__':
+    main()
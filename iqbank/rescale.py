@@ -0,0 +1,56 @@
+"""Move authored 0–1 difficulties onto the IRT logit scale.
+
+Hand-written items (add_questions*.py, scripts/generate_questions.py) and the
+item models in iqbank.itemgen rate difficulty as the share ``p`` of average
+examinees (θ = 0) expected to miss the item. The scoring engine, calibration
+and linking all use ``difficulty`` as the logit-scale b, so a rating is
+converted once, through the item's own discrimination::
+
+    1 - σ(a (0 - b)) = p   =>   b = logit(p) / a
+
+``p`` is kept within [P_MIN, P_MAX] so the extremes stay finite.
+
+``python -m iqbank.rescale`` applied this to the whole bank when the schema
+moved to the logit scale; it refuses a bank that already has difficulties
+outside [0, 1]. Publish the journal afterwards (``python -m iqbank.publish
+--bump major``).
+"""
+
+import argparse
+import math
+from pathlib import Path
+
+from .store import DEFAULT_BANK_PATH, BankStore
+
+P_MIN, P_MAX = 0.02, 0.98
+
+
+def logit_difficulty(p, discrimination):
+    """Logit-scale b for an item that a share ``p`` of θ = 0 examinees miss."""
+    p = min(max(p, P_MIN), P_MAX)
+    return round(math.log(p / (1.0 - p)) / discrimination, 4)
+
+
+def rescale_questions(questions):
+    """Copies of ``questions`` with 0–1 difficulty ratings converted to logits."""
+    return [dict(q, difficulty=logit_difficulty(q['difficulty'], q['discrimination'])) for q in questions]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convert a 0-1 rated bank to logit-scale difficulties')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH, type=Path)
+    args = parser.parse_args(argv)
+
+    store = BankStore(args.bank)
+    questions = list(store.iter_questions())
+    outside = sum(1 for q in questions if not 0.0 <= q['difficulty'] <= 1.0)
+    if outside:
+        raise SystemExit(f'{outside} items already have difficulties outside [0, 1]; '
+                         'the bank looks rescaled')
+    store.upsert(rescale_questions(questions))
+    print(f'Rescaled {len(questions)} items into {store.journal_path}; '
+          'publish with `python -m iqbank.publish --bump major`')
+
+
+if __name__ == '__main__':
+    main()
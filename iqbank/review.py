@@ -0,0 +1,182 @@
+"""Batch LLM review of items, as validateQuestion in claude-integration.ts does one at a time.
+
+Reviews fan out concurrently under the client's concurrency and rate budgets
+(see llm.py). Verdicts are cached on disk keyed by a hash of exactly what the
+reviewer sees (domain, stem, options, key) plus the prompt version and model,
+so re-reviewing a bank after a few edits only sends the changed items.
+
+    python -m iqbank.review [--bank questions.json | --batch new.json] [--concurrency 8] [--rpm 50]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .llm import DEFAULT_BASE_URL, DEFAULT_MODEL, ClientConfig, LLMError, MessagesClient
+from .store import DEFAULT_BANK_PATH, REPO_ROOT, BankStore, content_hash, write_json_atomic
+
+# Bump when the prompt or verdict parsing changes so cached verdicts are dropped.
+PROMPT_VERSION = 1
+
+DEFAULT_CACHE_PATH = REPO_ROOT / '.iqbank-cache' / 'review.json'
+
+MAX_TOKENS = 100
+
+APPROVED = 'APPROVED'
+REJECTED = 'REJECTED'
+
+
+def review_prompt(question):
+    """The validateQuestion prompt from claude-integration.ts."""
+    return f"""
+Review this Arabic IQ test question for quality and cultural appropriateness:
+
+Domain: {question['domain']}
+Question: {question['text_ar']}
+Options: {', '.join(question['options'])}
+Correct Answer: {question['correct']}
+
+Check for:
+1. Cultural sensitivity and appropriateness for Arab world
+2. Clear and unambiguous wording
+3. Fair difficulty level
+4. No bias or discrimination issues
+
+Respond with only "APPROVED" or "REJECTED" followed by a brief reason.
+"""
+
+
+def parse_verdict(text):
+    """(verdict, reason); like validateQuestion, anything without APPROVED is a rejection."""
+    verdict = APPROVED if APPROVED in text else REJECTED
+    reason = text.strip()
+    for word in (APPROVED, REJECTED):
+        if reason.startswith(word):
+            reason = reason[len(word):].lstrip(' :.-\n')
+            break
+    return verdict, reason
+
+
+def review_key(question, model):
+    reviewed = {k: question.get(k) for k in ('domain', 'text_ar', 'options', 'correct')}
+    return content_hash({'prompt': PROMPT_VERSION, 'model': model, 'item': reviewed})
+
+
+@dataclass
+class Verdict:
+    item_id: str
+    verdict: str  # APPROVED, REJECTED, or None if the request failed
+    reason: str
+    cached: bool = False
+
+
+class ReviewCache:
+    """Verdicts keyed by review_key, stored as JSON."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            if data.get('version') == PROMPT_VERSION:
+                self.entries = data['entries']
+        self.dirty = False
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, verdict, reason):
+        self.entries[key] = {'verdict': verdict, 'reason': reason}
+        self.dirty = True
+
+    def save(self):
+        # Unlike the validation cache this is never pruned: verdicts cost API
+        # calls, and an item edited back to an earlier version should hit.
+        if self.dirty:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.path, {'version': PROMPT_VERSION, 'entries': self.entries})
+            self.dirty = False
+
+
+async def review_async(questions, client, cache=None):
+    """Verdicts for ``questions`` in order; only cache misses reach ``client``."""
+    model = client.config.model
+    results = [None] * len(questions)
+    pending = []
+    for i, q in enumerate(questions):
+        hit = cache.get(review_key(q, model)) if cache else None
+        if hit:
+            results[i] = Verdict(q['id'], hit['verdict'], hit['reason'], cached=True)
+        else:
+            pending.append(i)
+
+    async def review_one(i):
+        q = questions[i]
+        try:
+            text = await client.complete(review_prompt(q), MAX_TOKENS)
+        except LLMError as e:
+            results[i] = Verdict(q['id'], None, str(e))
+            return
+        verdict, reason = parse_verdict(text)
+        results[i] = Verdict(q['id'], verdict, reason)
+        if cache:
+            cache.put(review_key(q, model), verdict, reason)
+
+    try:
+        await asyncio.gather(*(review_one(i) for i in pending))
+    finally:
+        # Keep whatever finished, even if the run was interrupted.
+        if cache:
+            cache.save()
+    return results
+
+
+def review(questions, client=None, cache=None):
+    return asyncio.run(review_async(list(questions), client or MessagesClient(), cache))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Review items with the LLM reviewer')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH)
+    parser.add_argument('--batch', help='JSON file with a list of new items (or a bank dict) to review instead')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, type=Path)
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL)
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rpm', type=float, default=50, help='Requests per minute')
+    parser.add_argument('--tpm', type=float, default=40_000, help='Tokens per minute')
+    parser.add_argument('--json', action='store_true', help='Print verdicts as JSON')
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        with open(args.batch, 'r', encoding='utf-8') as f:
+            questions = json.load(f)
+        questions = questions['questions'] if isinstance(questions, dict) else questions
+    else:
+        questions = BankStore(args.bank).load()['questions']
+
+    client = MessagesClient(ClientConfig(base_url=args.base_url, model=args.model, concurrency=args.concurrency,
+                                         requests_per_minute=args.rpm, tokens_per_minute=args.tpm))
+    cache = None if args.no_cache else ReviewCache(args.cache)
+    verdicts = review(questions, client, cache)
+
+    if args.json:
+        print(json.dumps([asdict(v) for v in verdicts], ensure_ascii=False, indent=2))
+    else:
+        for v in verdicts:
+            if v.verdict != APPROVED:
+                print(f"{v.verdict or 'FAILED':8s} {v.item_id}  {v.reason}")
+    rejected = sum(v.verdict == REJECTED for v in verdicts)
+    failed = sum(v.verdict is None for v in verdicts)
+    cached = sum(v.cached for v in verdicts)
+    print(f"\n{len(verdicts)} items: {len(verdicts) - cached} reviewed, {cached} from cache; "
+          f"{rejected} rejected, {failed} failed", file=sys.stderr if args.json else sys.stdout)
+    return 1 if rejected or failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Python mirror of QuestionSchema in packages/question-bank/src/types.ts."""
+
+import re
+
+from .store import DOMAINS
+
+UUID_RE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.IGNORECASE)
+
+# (min, max) for the numeric fields, inclusive. Difficulty is the IRT b on
+# the logit scale (see iqbank.rescale for authored 0-1 ratings).
+PARAM_RANGES = {
+    'difficulty': (-6.0, 6.0),
+    'discrimination': (0.0, 3.0),
+    'guessing': (0.0, 1.0),
+    'exposureControl': (0.0, 1.0),
+}
+OPTIONAL_PARAMS = {'guessing', 'exposureControl'}
+
+OPTIONS_MIN, OPTIONS_MAX = 2, 5
+
+REQUIRED_STRINGS = ['text_ar', 'correct']
+OPTIONAL_STRINGS = ['explanation_ar', 'culturalContext']
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def schema_errors(item):
+    """Messages for every way ``item`` fails QuestionSchema; empty if it parses."""
+    errors = []
+    item_id = item.get('id')
+    if not isinstance(item_id, str) or not UUID_RE.match(item_id):
+        errors.append(f'id must be a UUID, got {item_id!r}')
+
+    if item.get('domain') not in DOMAINS:
+        errors.append(f"domain must be one of {', '.join(DOMAINS)}, got {item.get('domain')!r}")
+
+    for name, (lo, hi) in PARAM_RANGES.items():
+        if name not in item:
+            if name not in OPTIONAL_PARAMS:
+                errors.append(f'{name} is required')
+            continue
+        value = item[name]
+        if not _is_number(value):
+            errors.append(f'{name} must be a number, got {value!r}')
+        elif not lo <= value <= hi:
+            errors.append(f'{name} must be within [{lo}, {hi}], got {value}')
+
+    for name in REQUIRED_STRINGS:
+        if not isinstance(item.get(name), str):
+            errors.append(f'{name} must be a string')
+    for name in OPTIONAL_STRINGS:
+        if name in item and not isinstance(item[name], str):
+            errors.append(f'{name} must be a string when present')
+
+    options = item.get('options')
+    if not isinstance(options, list) or not all(isinstance(o, str) for o in options):
+        errors.append('options must be a list of strings')
+    elif not OPTIONS_MIN <= len(options) <= OPTIONS_MAX:
+        errors.append(f'options must have {OPTIONS_MIN}-{OPTIONS_MAX} entries, got {len(options)}')
+    return errors
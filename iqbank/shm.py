@@ -0,0 +1,168 @@
+"""One shared, read-only copy of the compiled bank per host.
+
+Every backend worker parses and zod-validates its own questions.json, so
+memory grows with the worker count. Instead, the compiled bank (compiled.py)
+is published once into a shared-memory directory (``/dev/shm/iqbank`` when
+available) and every worker maps the same file: mapped pages of a tmpfs or
+page-cached file are one physical copy however many processes map them.
+
+Layout of the directory::
+
+    bank-<version>-<hash12>.bin   immutable segments, named by content
+    manifest.json                 the current segment
+
+manifest.json is ``{"generation", "version", "contentHash", "segment",
+"items", "bytes", "publishedAt"}`` and is only ever replaced by rename.
+
+Loader contract (SharedBank implements it; any other runtime can too):
+
+1. read manifest.json and map ``segment`` read-only; never write to it,
+2. before serving, stat manifest.json; if its (inode, mtime) changed, read
+   it again and, if ``generation`` grew, map the new segment and drop the
+   old mapping once in-flight requests are done,
+3. a segment is never modified after publication, and one that a worker may
+   still map is only unlinked, which keeps its pages alive until unmapped,
+   so a swap never needs a restart or a lock.
+
+    python -m iqbank.shm publish [--bank path/to/questions.json] [--dir /dev/shm/iqbank]
+    python -m iqbank.shm status [--dir ...]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from .compiled import CompiledBank, compile_bank
+from .store import DEFAULT_BANK_PATH, REPO_ROOT, BankStore, content_hash, write_json_atomic
+
+SHM_ROOT = Path('/dev/shm')
+DEFAULT_SHARED_DIR = SHM_ROOT / 'iqbank' if SHM_ROOT.is_dir() else REPO_ROOT / 'var' / 'bank'
+
+MANIFEST_NAME = 'manifest.json'
+
+# Segments kept besides the current one, for workers that have not swapped yet.
+KEEP_SEGMENTS = 2
+
+
+def segment_name(version, digest):
+    return f'bank-{version}-{digest[:12]}.bin'
+
+
+def read_manifest(directory):
+    path = Path(directory) / MANIFEST_NAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def publish(bank_path=DEFAULT_BANK_PATH, directory=DEFAULT_SHARED_DIR, keep=KEEP_SEGMENTS):
+    """Compile the published bank into a new segment and point the manifest at it.
+
+    Unpublished journal edits are not included; publishing unchanged content is a no-op. Returns the current manifest.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    bank = BankStore(bank_path).published()
+    digest = content_hash(bank['questions'])
+    current = read_manifest(directory)
+    if current is not None and current['contentHash'] == digest and current['version'] == bank['version']:
+        return current
+
+    segment = directory / segment_name(bank['version'], digest)
+    if not segment.exists():
+        compile_bank(segment, bank, {'contentHash': digest})
+    manifest = {
+        'generation': (current['generation'] + 1) if current else 1,
+        'version': bank['version'],
+        'contentHash': digest,
+        'segment': segment.name,
+        'items': len(bank['questions']),
+        'bytes': segment.stat().st_size,
+        'publishedAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+    write_json_atomic(directory / MANIFEST_NAME, manifest)
+    collect_segments(directory, keep)
+    return manifest
+
+
+def collect_segments(directory, keep=KEEP_SEGMENTS):
+    """Unlink all but the current and ``keep`` most recent other segments; returns the names removed."""
+    directory = Path(directory)
+    manifest = read_manifest(directory)
+    current = manifest['segment'] if manifest else None
+    others = sorted((p for p in directory.glob('bank-*.bin') if p.name != current),
+                    key=lambda p: p.stat().st_mtime_ns, reverse=True)
+    removed = []
+    for path in others[keep:]:
+        path.unlink()
+        removed.append(path.name)
+    return removed
+
+
+class SharedBank:
+    """A worker's handle on the published bank, swapped in place when a new version appears."""
+
+    def __init__(self, directory=DEFAULT_SHARED_DIR):
+        self.directory = Path(directory)
+        self.manifest = None
+        self.bank = None
+        self._stamp = None
+        if not self.refresh():
+            raise FileNotFoundError(f'no bank published in {self.directory}')
+
+    @property
+    def generation(self):
+        return self.manifest['generation']
+
+    def _manifest_stamp(self):
+        try:
+            stat = (self.directory / MANIFEST_NAME).stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def refresh(self):
+        """Map the published segment if it changed since the last call; True if one is mapped.
+
+        Costs one stat() when nothing changed, so it can run before every request.
+        """
+        stamp = self._manifest_stamp()
+        if stamp is None or stamp == self._stamp:
+            return self.bank is not None
+        manifest = read_manifest(self.directory)
+        if self.manifest is None or manifest['generation'] > self.manifest['generation']:
+            # Map before publishing the swap so readers never see a half-open bank.
+            bank = CompiledBank(self.directory / manifest['segment'])
+            self.bank, self.manifest = bank, manifest
+        self._stamp = stamp
+        return True
+
+    def current(self):
+        self.refresh()
+        return self.bank
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Publish the compiled bank to a shared-memory segment')
+    parser.add_argument('command', choices=['publish', 'status'])
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH, type=Path)
+    parser.add_argument('--dir', default=DEFAULT_SHARED_DIR, type=Path)
+    parser.add_argument('--keep', type=int, default=KEEP_SEGMENTS, help='Old segments to keep')
+    args = parser.parse_args(argv)
+
+    if args.command == 'publish':
+        manifest = publish(args.bank, args.dir, args.keep)
+    else:
+        manifest = read_manifest(args.dir)
+        if manifest is None:
+            print(f'No bank published in {args.dir}')
+            return
+    print(f"Generation {manifest['generation']}: version {manifest['version']}, {manifest['items']} items, "
+          f"{manifest['bytes']:,} bytes in {args.dir / manifest['segment']}")
+    segments = sorted(p.name for p in args.dir.glob('bank-*.bin'))
+    print(f"Segments on disk: {', '.join(segments)}")
+
+
+if __name__ == '__main__':
+    main()
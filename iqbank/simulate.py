@@ -0,0 +1,360 @@
+"""Batch simulation of the adaptive test policy.
+
+Replays AdaptiveScoringEngine.getNextQuestion and updateTheta from
+packages/scoring-engine/src/index.ts for many simulated examinees with known
+true θ at once:
+
+- the first item is drawn uniformly from items with |b - θ| <= 1,
+- later items are drawn uniformly from the 15 most informative unused items,
+- θ is updated with a learning-rate 0.5 gradient step and clamped to ±3,
+- with exposure control, a drawn item is administered with probability
+  ``exposureControl`` (Sympson-Hetter); a rejected item is set aside for
+  that draw only and the draw is repeated, as the selector does.
+
+Examinees are vectorized within a chunk and chunks are spread over a process
+pool.
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from .irt import ItemBank, item_information
+from .store import DEFAULT_BANK_PATH, DOMAINS
+
+# Upper bound on the (examinees × items) working set held per chunk.
+CHUNK_CELLS = 4_000_000
+
+
+@dataclass
+class SimulationConfig:
+    test_length: int = 20
+    top_n: int = 15
+    first_item_window: float = 1.0
+    learning_rate: float = 0.5
+    theta_min: float = -3.0
+    theta_max: float = 3.0
+    start_theta: float = 0.0
+    # Model used to generate simulated answers. The engine itself scores with 2-PL.
+    response_model: str = '3pl'
+
+
+@dataclass
+class SimulationResult:
+    true_theta: np.ndarray
+    theta_hat: np.ndarray
+    test_length: np.ndarray
+    administered: np.ndarray  # (n_examinees, max_length) bank rows, -1 when unused
+    responses: np.ndarray  # (n_examinees, max_length) uint8
+    exposure_counts: np.ndarray  # (n_items,) times administered
+    selection_counts: np.ndarray = None  # (n_items,) examinees the selector drew each item for
+
+    @property
+    def n_examinees(self):
+        return len(self.true_theta)
+
+    @property
+    def exposure_rate(self):
+        return self.exposure_counts / max(self.n_examinees, 1)
+
+    @property
+    def error(self):
+        return self.theta_hat - self.true_theta
+
+
+def _select_first(rng, theta_hat, b, used, window):
+    suitable = (np.abs(b - theta_hat[:, None]) <= window) & ~used
+    keys = rng.random(suitable.shape)
+    keys[~suitable] = -1.0
+    choice = keys.argmax(axis=1)
+    return choice, suitable.any(axis=1)
+
+
+def _select_top_n(rng, theta_hat, a, b, used, top_n):
+    info = item_information(theta_hat, a, b)
+    info[used] = -np.inf
+    available = used.shape[1] - used.sum(axis=1)
+    k = int(min(top_n, available.min()))
+    top = np.argpartition(-info, k - 1, axis=1)[:, :k]
+    pick = rng.integers(0, k, size=len(theta_hat))
+    return top[np.arange(len(theta_hat)), pick]
+
+
+def _select(rng, step, theta_hat, a, b, used, config):
+    if step > 0:
+        return _select_top_n(rng, theta_hat, a, b, used, config.top_n)
+    item, found = _select_first(rng, theta_hat, b, used, config.first_item_window)
+    if not found.all():
+        fallback = _select_top_n(rng, theta_hat, a, b, used, config.top_n)
+        item = np.where(found, item, fallback)
+    return item
+
+
+def _candidates(step, theta_hat, b, blocked, config):
+    """Number of items each row's draw is made from (the first draw prefers |b - θ| <= window)."""
+    free = ~blocked
+    if step > 0:
+        return free.sum(axis=1)
+    suitable = (free & (np.abs(b - theta_hat[:, None]) <= config.first_item_window)).sum(axis=1)
+    return np.where(suitable > 0, suitable, free.sum(axis=1))
+
+
+def _select_controlled(rng, step, theta_hat, a, b, used, config, exposure, selected):
+    """Sympson-Hetter: redraw rows whose item fails its exposure lottery.
+
+    Rejected items are excluded for the rest of this draw only; the last
+    remaining candidate is always accepted. ``selected`` counts every draw.
+    """
+    item = _select(rng, step, theta_hat, a, b, used, config)
+    pending = np.arange(len(theta_hat))
+    blocked = used
+    while len(pending):
+        drawn = item[pending]
+        np.add.at(selected, drawn, 1)
+        reject = rng.random(len(pending)) >= exposure[drawn]
+        reject &= _candidates(step, theta_hat[pending], b, blocked, config) > 1
+        # Fancy indexing copies, so only rejected rows are duplicated and ``used`` is untouched.
+        pending, blocked = pending[reject], blocked[reject]
+        if not len(pending):
+            break
+        blocked[np.arange(len(pending)), item[pending]] = True
+        item[pending] = _select(rng, step, theta_hat[pending], a, b, blocked, config)
+    return item
+
+
+def _standard_error(theta_hat, administered, a, b):
+    """1 / sqrt(test information at θ̂) over each row's administered items (-1 = none)."""
+    given = administered >= 0
+    rows = np.where(given, administered, 0)
+    a_i, b_i = a[rows], b[rows]
+    p = 1.0 / (1.0 + np.exp(-a_i * (theta_hat[:, None] - b_i)))
+    info = (a_i * a_i * p * (1.0 - p) * given).sum(axis=1)
+    with np.errstate(divide='ignore'):
+        return 1.0 / np.sqrt(info)
+
+
+def _should_stop(stopping, step, theta_hat, administered, used, domain_counts, a, b):
+    se = _standard_error(theta_hat, administered[:, :step], a, b) if stopping.se_threshold is not None else None
+    max_info = None
+    if stopping.info_threshold is not None:
+        info = item_information(theta_hat, a, b)
+        info[used] = -np.inf
+        max_info = info.max(axis=1)
+    return stopping.stop(step, se, max_info, domain_counts)
+
+
+def simulate_chunk(a, b, c, true_theta, config, seed, exposure=None, stopping=None, domain=None):
+    """Run one vectorized chunk of examinees through the adaptive policy.
+
+    ``exposure`` holds per-item Sympson-Hetter probabilities (None: no control).
+    With a ``stopping`` rule (see stopping.py) each examinee stops as soon as
+    the rule says so and ``domain`` (item domain codes) must be given;
+    otherwise every test has ``config.test_length`` items.
+    Returns (theta_hat, administered, responses, selection counts).
+    """
+    rng = np.random.default_rng(seed)
+    n, n_items = len(true_theta), len(a)
+    max_length = stopping.max_length if stopping is not None else config.test_length
+    length = min(max_length, n_items)
+
+    used = np.zeros((n, n_items), dtype=bool)
+    theta_hat = np.full(n, config.start_theta, dtype=np.float64)
+    administered = np.full((n, length), -1, dtype=np.int32)
+    responses = np.zeros((n, length), dtype=np.uint8)
+    selected = np.zeros(n_items, dtype=np.int64)
+    answer_c = c if config.response_model == '3pl' else np.zeros_like(c)
+    domain_counts = np.zeros((n, len(DOMAINS)), dtype=np.int64) if stopping is not None else None
+    active = np.arange(n)
+
+    for step in range(length):
+        if stopping is not None and step > 0:
+            stop = _should_stop(stopping, step, theta_hat[active], administered[active], used[active],
+                                domain_counts[active], a, b)
+            active = active[~stop]
+            if not len(active):
+                break
+        # Work on views while every examinee is still testing.
+        everyone = len(active) == n
+        act_used = used if everyone else used[active]
+        act_theta = theta_hat if everyone else theta_hat[active]
+
+        if exposure is None:
+            item = _select(rng, step, act_theta, a, b, act_used, config)
+            np.add.at(selected, item, 1)
+        else:
+            item = _select_controlled(rng, step, act_theta, a, b, act_used, config, exposure, selected)
+
+        a_i, b_i, c_i = a[item], b[item], answer_c[item]
+        p_true = c_i + (1.0 - c_i) / (1.0 + np.exp(-a_i * (true_theta[active] - b_i)))
+        correct = rng.random(len(active)) < p_true
+
+        p_hat = 1.0 / (1.0 + np.exp(-a_i * (act_theta - b_i)))
+        theta_hat[active] = np.clip(act_theta + a_i * (correct - p_hat) * config.learning_rate,
+                                    config.theta_min, config.theta_max)
+
+        used[active, item] = True
+        administered[active, step] = item
+        responses[active, step] = correct
+        if domain_counts is not None:
+            domain_counts[active, domain[item]] += 1
+
+    return theta_hat, administered, responses, selected
+
+
+def _chunks(n, n_items):
+    size = max(1, CHUNK_CELLS // max(n_items, 1))
+    return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+
+def simulate(bank, true_theta, config=None, workers=None, seed=None, exposure=None, stopping=None):
+    """Simulate one session per entry of ``true_theta`` against ``bank``.
+
+    ``exposure`` overrides the bank's Sympson-Hetter parameters; exposure
+    control is skipped when every parameter is 1. ``stopping`` is a
+    stopping.StoppingRule for variable-length tests.
+    """
+    config = config or SimulationConfig()
+    true_theta = np.asarray(true_theta, dtype=np.float64)
+    a, b, c = bank.discrimination, bank.difficulty, bank.guessing
+    exposure = bank.exposure if exposure is None else np.asarray(exposure, dtype=np.float64)
+    if exposure is not None and (exposure >= 1).all():
+        exposure = None
+    spans = _chunks(len(true_theta), len(bank))
+    seeds = np.random.SeedSequence(seed).spawn(len(spans))
+    workers = workers or os.cpu_count() or 1
+
+    args = [(a, b, c, true_theta[lo:hi], config, s, exposure, stopping, bank.domain)
+            for (lo, hi), s in zip(spans, seeds)]
+    if workers == 1 or len(spans) == 1:
+        parts = [simulate_chunk(*arg) for arg in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(simulate_chunk, *zip(*args)))
+
+    administered = np.concatenate([p[1] for p in parts])
+    return SimulationResult(
+        true_theta=true_theta,
+        theta_hat=np.concatenate([p[0] for p in parts]),
+        test_length=(administered >= 0).sum(axis=1),
+        administered=administered,
+        responses=np.concatenate([p[2] for p in parts]),
+        exposure_counts=np.bincount(administered[administered >= 0], minlength=len(bank)),
+        selection_counts=sum(p[3] for p in parts),
+    )
+
+
+def sample_population(n, distribution='normal', seed=None):
+    rng = np.random.default_rng(seed)
+    if distribution == 'normal':
+        return rng.standard_normal(n)
+    if distribution == 'uniform':
+        return rng.uniform(-3.0, 3.0, n)
+    raise ValueError(f'Unknown population distribution: {distribution!r}')
+
+
+def summarize(result, bank, bins=(-3, -2, -1, 0, 1, 2, 3), exposure_threshold=0.2):
+    """Bias, RMSE, test length and exposure statistics as a plain dict."""
+    error = result.error
+    rate = result.exposure_rate
+    conditional = []
+    which = np.digitize(result.true_theta, bins[1:-1])
+    for i in range(len(bins) - 1):
+        sel = which == i
+        if sel.any():
+            conditional.append({
+                'range': [bins[i], bins[i + 1]],
+                'n': int(sel.sum()),
+                'bias': float(error[sel].mean()),
+                'rmse': float(np.sqrt((error[sel] ** 2).mean())),
+            })
+
+    spread = result.true_theta.std() > 0 and result.theta_hat.std() > 0
+    correlation = float(np.corrcoef(result.true_theta, result.theta_hat)[0, 1]) if spread else float('nan')
+
+    by_domain = {}
+    for code, domain in enumerate(DOMAINS):
+        sel = bank.domain == code
+        if sel.any():
+            by_domain[domain] = float(result.exposure_counts[sel].sum() / max(result.test_length.sum(), 1))
+
+    return {
+        'examinees': result.n_examinees,
+        'bias': float(error.mean()),
+        'rmse': float(np.sqrt((error ** 2).mean())),
+        'correlation': correlation,
+        'mean_test_length': float(result.test_length.mean()),
+        'conditional': conditional,
+        'exposure': {
+            'max': float(rate.max()),
+            'mean': float(rate.mean()),
+            'items_over_threshold': int((rate > exposure_threshold).sum()),
+            'threshold': exposure_threshold,
+            'never_used': int((result.exposure_counts == 0).sum()),
+            'domain_share': by_domain,
+        },
+    }
+
+
+def format_report(summary):
+    lines = [
+        f"Examinees:        {summary['examinees']}",
+        f"Bias:             {summary['bias']:+.3f}",
+        f"RMSE:             {summary['rmse']:.3f}",
+        f"Correlation:      {summary['correlation']:.3f}",
+        f"Mean test length: {summary['mean_test_length']:.1f}",
+        '',
+        'Conditional on true θ:',
+    ]
+    for row in summary['conditional']:
+        lo, hi = row['range']
+        lines.append(f"  [{lo:+d}, {hi:+d})  n={row['n']:<8d} bias={row['bias']:+.3f}  rmse={row['rmse']:.3f}")
+    exposure = summary['exposure']
+    lines += [
+        '',
+        f"Exposure: max={exposure['max']:.3f} mean={exposure['mean']:.3f} "
+        f"over {exposure['threshold']:.2f}: {exposure['items_over_threshold']} items, "
+        f"never used: {exposure['never_used']} items",
+        '  Domain share: ' + ', '.join(f'{d}={s:.2f}' for d, s in exposure['domain_share'].items()),
+    ]
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulate the adaptive test policy against the bank')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH)
+    parser.add_argument('--examinees', type=int, default=10000)
+    parser.add_argument('--population', choices=['normal', 'uniform'], default='normal')
+    parser.add_argument('--test-length', type=int, default=SimulationConfig.test_length)
+    parser.add_argument('--response-model', choices=['2pl', '3pl'], default=SimulationConfig.response_model)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+    args = parser.parse_args(argv)
+
+    bank = ItemBank.load(args.bank)
+    config = SimulationConfig(test_length=args.test_length, response_model=args.response_model)
+    true_theta = sample_population(args.examinees, args.population, args.seed)
+
+    started = time.perf_counter()
+    result = simulate(bank, true_theta, config, workers=args.workers, seed=args.seed)
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(result, bank)
+    summary['config'] = asdict(config)
+    summary['seconds'] = elapsed
+    summary['sessions_per_minute'] = args.examinees / elapsed * 60 if elapsed else None
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(format_report(summary))
+        print(f"\nSimulated {args.examinees} sessions in {elapsed:.2f}s "
+              f"({summary['sessions_per_minute']:,.0f} sessions/minute)")
+
+
+if __name__ == '__main__':
+    main()
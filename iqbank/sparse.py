@@ -0,0 +1,247 @@
+"""Sparse examinee × item response matrix.
+
+A CAT session answers ~20 of the bank's items, so responses are held in
+compressed sparse row (CSR) form:
+
+- ``ptr`` (int64, n_persons + 1): person p's responses are ``ptr[p]:ptr[p + 1]``,
+- ``items`` (int32): bank row of each response, in answer order per person,
+- ``scores`` (uint8): 1 if correct.
+
+The compressed sparse column (CSC) transpose, grouping responses by item, is
+built on first use with one stable argsort. ``person(p)`` and ``item(i)``
+return slices, i.e. views without copies, so per-person and per-item loops
+touch only their own responses. 10M responses take about 50 MB as CSR and as
+much again for the CSC transpose.
+
+Matrices are built from response logs, from an iqbank.ingest store, or from
+arrays, and can be saved to a memory-mapped binary file (binfile.py). Session
+ids are saved as a UTF-8 heap plus offsets, as compiled.py stores strings,
+so the file header stays small however many sessions it holds.
+"""
+
+import json
+from array import array
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .binfile import read_binfile, string_column, write_binfile
+
+KIND = 'responses'
+
+# Responses collected from logs per typed-array chunk.
+CHUNK_RESPONSES = 1 << 20
+
+
+def iter_response_records(paths):
+    """Yield (session_id, question_id, is_correct) from JSON Lines files."""
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if 'responses' in record:
+                    for response in record['responses']:
+                        yield record['sessionId'], response['questionId'], bool(response['isCorrect'])
+                else:
+                    yield record['sessionId'], record['questionId'], bool(record['isCorrect'])
+
+
+def _bank_row(bank, item_id):
+    try:
+        return bank.row(item_id)
+    except KeyError:
+        return -1
+
+
+@dataclass
+class ItemMajor:
+    """CSC transpose: item i's responses are ``ptr[i]:ptr[i + 1]`` of ``persons``/``scores``."""
+
+    ptr: np.ndarray  # int64 (n_items + 1,)
+    persons: np.ndarray  # int32
+    scores: np.ndarray  # uint8
+
+
+@dataclass
+class ResponseMatrix:
+    """Responses grouped by examinee: ``items[ptr[p]:ptr[p + 1]]`` belong to person p."""
+
+    ptr: np.ndarray  # int64 (n_persons + 1,)
+    items: np.ndarray  # int32 bank rows
+    scores: np.ndarray  # uint8
+    persons: list = field(default_factory=list)  # session ids
+    skipped: int = 0  # responses to items not in the bank
+    n_items: int = None  # columns; defaults to the largest item row + 1
+    _csc: ItemMajor = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.n_items is None:
+            self.n_items = int(self.items.max()) + 1 if len(self.items) else 0
+
+    @property
+    def n_persons(self):
+        return len(self.ptr) - 1
+
+    @property
+    def n_responses(self):
+        return len(self.items)
+
+    @property
+    def shape(self):
+        return self.n_persons, self.n_items
+
+    @property
+    def nbytes(self):
+        total = self.ptr.nbytes + self.items.nbytes + self.scores.nbytes
+        if self._csc is not None:
+            total += self._csc.ptr.nbytes + self._csc.persons.nbytes + self._csc.scores.nbytes
+        return total
+
+    # -- builders -------------------------------------------------------------
+
+    @classmethod
+    def from_triples(cls, persons, items, scores, person_ids=None, n_items=None):
+        """Build from parallel arrays; each person's responses keep their input order."""
+        persons = np.asarray(persons, dtype=np.int64)
+        if len(persons) and np.all(persons[1:] >= persons[:-1]):
+            order = slice(None)  # already grouped, e.g. replayed from a saved matrix
+        else:
+            order = np.argsort(persons, kind='stable')
+            persons = persons[order]
+        unique, counts = np.unique(persons, return_counts=True)
+        ptr = np.zeros(len(unique) + 1, dtype=np.int64)
+        np.cumsum(counts, out=ptr[1:])
+        if person_ids is not None:
+            person_ids = [person_ids[p] for p in unique]
+        return cls(
+            ptr=ptr,
+            items=np.asarray(items, dtype=np.int32)[order],
+            scores=np.asarray(scores, dtype=np.uint8)[order],
+            persons=person_ids or [],
+            n_items=n_items,
+        )
+
+    @classmethod
+    def from_logs(cls, paths, bank, chunk=CHUNK_RESPONSES):
+        """Build for ``bank`` from JSON Lines response logs.
+
+        Responses are collected in typed arrays (13 bytes each) handed to NumPy
+        every ``chunk`` responses, not as Python objects per response.
+        """
+        session_index = {}
+        chunks = []
+        persons, items, scores = array('q'), array('i'), array('B')
+        skipped = 0
+        for session_id, question_id, correct in iter_response_records(paths):
+            row = _bank_row(bank, question_id)
+            if row < 0:
+                skipped += 1
+                continue
+            persons.append(session_index.setdefault(session_id, len(session_index)))
+            items.append(row)
+            scores.append(correct)
+            if len(items) == chunk:
+                chunks.append((persons, items, scores))
+                persons, items, scores = array('q'), array('i'), array('B')
+        chunks.append((persons, items, scores))
+        persons, items, scores = (
+            np.concatenate([np.frombuffer(c[k], dtype=dtype) for c in chunks])
+            for k, dtype in enumerate((np.int64, np.int32, np.uint8))
+        )
+        matrix = cls.from_triples(persons, items, scores, person_ids=list(session_index), n_items=len(bank))
+        matrix.skipped = skipped
+        return matrix
+
+    @classmethod
+    def from_store(cls, store, bank, start=None, end=None):
+        """Build from an iqbank.ingest ResponseStore, one part at a time.
+
+        Ids are mapped per distinct value in each part rather than per response,
+        so months of traffic load without a Python object per row.
+        """
+        session_index = {}
+        persons, items, scores = [], [], []
+        skipped = 0
+        for cols in store.iter_columns(start, end, ('session', 'question', 'correct')):
+            questions, question_inverse = np.unique(cols['question'], return_inverse=True)
+            rows = np.array([_bank_row(bank, q.decode('utf-8')) for q in questions.tolist()],
+                            dtype=np.int64)[question_inverse]
+            known = rows >= 0
+            skipped += int((~known).sum())
+            sessions, session_inverse = np.unique(cols['session'][known], return_inverse=True)
+            ids = np.array([session_index.setdefault(sid.decode('utf-8'), len(session_index))
+                            for sid in sessions.tolist()], dtype=np.int64)
+            persons.append(ids[session_inverse])
+            items.append(rows[known])
+            scores.append(cols['correct'][known])
+        if not persons:
+            return cls.from_triples([], [], [], person_ids=[], n_items=len(bank))
+        matrix = cls.from_triples(np.concatenate(persons), np.concatenate(items), np.concatenate(scores),
+                                  person_ids=list(session_index), n_items=len(bank))
+        matrix.skipped = skipped
+        return matrix
+
+    # -- access ---------------------------------------------------------------
+
+    def person(self, p):
+        """(items, scores) views of person p's responses."""
+        start, end = self.ptr[p], self.ptr[p + 1]
+        return self.items[start:end], self.scores[start:end]
+
+    @property
+    def csc(self):
+        if self._csc is None:
+            order = np.argsort(self.items, kind='stable')
+            ptr = np.zeros(self.n_items + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.items, minlength=self.n_items), out=ptr[1:])
+            self._csc = ItemMajor(ptr=ptr, persons=self.person_index()[order], scores=self.scores[order])
+        return self._csc
+
+    def item(self, i):
+        """(persons, scores) views of item i's responses, persons ascending."""
+        csc = self.csc
+        start, end = csc.ptr[i], csc.ptr[i + 1]
+        return csc.persons[start:end], csc.scores[start:end]
+
+    def person_index(self):
+        """Person of each response (int32), aligned with ``items``."""
+        return np.repeat(np.arange(self.n_persons, dtype=np.int32), np.diff(self.ptr))
+
+    def item_counts(self):
+        return np.bincount(self.items, minlength=self.n_items)
+
+    def item_correct(self):
+        return np.bincount(self.items, weights=self.scores, minlength=self.n_items).astype(np.int64)
+
+    def person_counts(self):
+        return np.diff(self.ptr)
+
+    def person_correct(self):
+        return np.bincount(self.person_index(), weights=self.scores, minlength=self.n_persons).astype(np.int64)
+
+    def select(self, keep):
+        """Matrix of the responses where ``keep`` is true; persons left empty are dropped."""
+        person = self.person_index()[keep]
+        ids = self.persons
+        return type(self).from_triples(person, self.items[keep], self.scores[keep],
+                                       person_ids=ids if ids else None, n_items=self.n_items)
+
+    # -- persistence ----------------------------------------------------------
+
+    def save(self, path, meta=None):
+        meta = dict(meta or {}, n_items=self.n_items, skipped=self.skipped)
+        heap, offsets = string_column(self.persons)
+        write_binfile(path, KIND, {'ptr': self.ptr, 'items': self.items, 'scores': self.scores,
+                                   'persons.heap': heap, 'persons.offsets': offsets}, meta)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-mapped matrix; arrays are read-only views of the file."""
+        binfile = read_binfile(path, KIND)
+        meta = binfile.meta
+        return cls(ptr=binfile['ptr'], items=binfile['items'], scores=binfile['scores'],
+                   persons=binfile.strings('persons'), skipped=meta.get('skipped', 0),
+                   n_items=meta['n_items'])
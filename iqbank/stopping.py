@@ -0,0 +1,169 @@
+"""Stopping rules for variable-length adaptive tests, and a simulation sweep.
+
+A test stops once it reaches ``max_length`` items, or once it has at least
+``min_length`` items, meets every per-domain minimum, and either
+
+- the standard error 1 / sqrt(Σ I_i(θ̂)) is at most ``se_threshold``, or
+- no remaining item would add ``info_threshold`` information at θ̂.
+
+Without either threshold the test has exactly ``max_length`` items (the
+current behaviour at 20). The same rule is implemented for the backend in
+packages/scoring-engine/src/stopping.ts.
+
+The sweep simulates a population against the bank for every combination of
+rule parameters and reports mean and 90th-percentile length, HTTP requests
+per session (one /next and one /submit per item, plus session creation and
+results), RMSE/bias/correlation of the engine's final θ̂, and the RMSE and
+mean SE of an EAP rescoring of the same responses (estimate.py). The SE rule
+uses test information at the engine's running θ̂, which is what the backend
+can compute per request.
+
+    python -m iqbank.stopping --se 0.5 0.4 0.35 0.3 --max-length 20 30 [--domain-min 2]
+"""
+
+import argparse
+import itertools
+import json
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from .estimate import LikelihoodTable, _score_shard
+from .irt import ItemBank
+from .simulate import SimulationConfig, sample_population, simulate
+from .store import DEFAULT_BANK_PATH, DOMAINS
+
+# /sessions + /results, and /questions/next + /answers/submit per item.
+FIXED_REQUESTS = 2
+REQUESTS_PER_ITEM = 2
+
+
+@dataclass
+class StoppingRule:
+    min_length: int = 1
+    max_length: int = 20
+    se_threshold: float = None
+    info_threshold: float = None
+    domain_minimums: tuple = None  # items per domain, in DOMAINS order
+
+    def stop(self, length, se, max_info, domain_counts):
+        """Vectorized decision for n examinees that have each taken ``length`` items.
+
+        ``domain_counts`` is (n, len(DOMAINS)); ``se`` and ``max_info`` are
+        length-n arrays, or None when the rule has no such threshold.
+        """
+        n = len(domain_counts)
+        if length >= self.max_length:
+            return np.ones(n, dtype=bool)
+        if self.se_threshold is None and self.info_threshold is None:
+            return np.zeros(n, dtype=bool)
+
+        eligible = np.full(n, length >= self.min_length)
+        if self.domain_minimums is not None:
+            eligible &= (domain_counts >= np.asarray(self.domain_minimums)).all(axis=1)
+        precise = np.zeros(n, dtype=bool)
+        if self.se_threshold is not None:
+            precise |= se <= self.se_threshold
+        if self.info_threshold is not None:
+            precise |= max_info < self.info_threshold
+        return eligible & precise
+
+    @property
+    def label(self):
+        parts = [f'len {self.min_length}-{self.max_length}']
+        if self.se_threshold is not None:
+            parts.append(f'SE<={self.se_threshold:g}')
+        if self.info_threshold is not None:
+            parts.append(f'maxI<{self.info_threshold:g}')
+        if self.domain_minimums is not None:
+            parts.append('dom>=' + '/'.join(str(m) for m in self.domain_minimums))
+        return ', '.join(parts)
+
+
+def rescore_eap(table, result):
+    """(θ, SE) from EAP over each simulated session's administered items."""
+    given = result.administered >= 0
+    ptr = np.concatenate([[0], np.cumsum(result.test_length)])
+    return _score_shard(ptr, result.administered[given], result.responses[given], table.log_p, table.log_q,
+                        table.log_prior, table.nodes, 'eap')
+
+
+def evaluate(bank, rule, true_theta, config=None, workers=None, seed=None, table=None):
+    """Length and precision summary for one rule."""
+    config = config or SimulationConfig()
+    result = simulate(bank, true_theta, config, workers=workers, seed=seed, stopping=rule)
+    error = result.error
+    length = result.test_length
+    eap_theta, eap_se = rescore_eap(table or LikelihoodTable(bank, config.response_model), result)
+    return {
+        'rule': asdict(rule),
+        'label': rule.label,
+        'mean_length': float(length.mean()),
+        'p90_length': float(np.percentile(length, 90)),
+        'max_length_share': float((length >= rule.max_length).mean()),
+        'requests_per_session': float(FIXED_REQUESTS + REQUESTS_PER_ITEM * length.mean()),
+        'rmse': float(np.sqrt((error ** 2).mean())),
+        'bias': float(error.mean()),
+        'correlation': float(np.corrcoef(result.true_theta, result.theta_hat)[0, 1]),
+        'eap_rmse': float(np.sqrt(((eap_theta - result.true_theta) ** 2).mean())),
+        'eap_se': float(eap_se.mean()),
+    }
+
+
+def sweep(bank, rules, examinees=20_000, population='normal', config=None, workers=None, seed=0):
+    """Evaluate every rule against the same simulated population."""
+    config = config or SimulationConfig()
+    true_theta = sample_population(examinees, population, seed)
+    table = LikelihoodTable(bank, config.response_model)
+    return [evaluate(bank, rule, true_theta, config, workers, seed, table) for rule in rules]
+
+
+def rule_grid(se_thresholds=(None,), info_thresholds=(None,), max_lengths=(20,), min_length=5,
+              domain_minimum=None):
+    minimums = (domain_minimum,) * len(DOMAINS) if domain_minimum else None
+    return [StoppingRule(min_length=min(min_length, max_length), max_length=max_length, se_threshold=se,
+                         info_threshold=info, domain_minimums=minimums)
+            for se, info, max_length in itertools.product(se_thresholds, info_thresholds, max_lengths)]
+
+
+def format_sweep(rows):
+    lines = [f"{'rule':44s} {'mean len':>8s} {'p90':>5s} {'at max':>6s} {'requests':>8s} "
+             f"{'RMSE':>6s} {'bias':>7s} {'r':>6s} {'EAP RMSE':>8s} {'EAP SE':>6s}"]
+    for r in rows:
+        lines.append(f"{r['label']:44s} {r['mean_length']:8.2f} {r['p90_length']:5.0f} "
+                     f"{r['max_length_share']:6.1%} {r['requests_per_session']:8.1f} "
+                     f"{r['rmse']:6.3f} {r['bias']:+7.3f} {r['correlation']:6.3f} "
+                     f"{r['eap_rmse']:8.3f} {r['eap_se']:6.3f}")
+    return '\n'.join(lines)
+
+
+def _thresholds(values):
+    return [None if v.lower() == 'none' else float(v) for v in values]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sweep CAT stopping rules by simulation')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH)
+    parser.add_argument('--se', nargs='+', default=['none', '0.5', '0.4', '0.35', '0.3'],
+                        help="SE thresholds ('none' for no SE rule)")
+    parser.add_argument('--info', nargs='+', default=['none'],
+                        help="Max remaining item information thresholds ('none' for no rule)")
+    parser.add_argument('--max-length', type=int, nargs='+', default=[20])
+    parser.add_argument('--min-length', type=int, default=5)
+    parser.add_argument('--domain-min', type=int, default=None, help='Minimum items per domain')
+    parser.add_argument('--examinees', type=int, default=20_000)
+    parser.add_argument('--population', choices=['normal', 'uniform'], default='normal')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    bank = ItemBank.load(args.bank)
+    rules = rule_grid(_thresholds(args.se), _thresholds(args.info), args.max_length, args.min_length,
+                      args.domain_min)
+    rows = sweep(bank, rules, args.examinees, args.population, SimulationConfig(), args.workers, args.seed)
+    print(json.dumps(rows, indent=2) if args.json else format_sweep(rows))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+"""Incremental question-bank store.
+
+questions.json stays the canonical file loaded by @iq-test/question-bank. New
+and edited items are appended to a JSON Lines journal next to it, so adding a
+batch costs proportional to the batch rather than the bank. The journal is
+folded back into questions.json on demand with ``compact()``.
+
+Journal records are one JSON object per line:
+
+    {"op": "put", "item": {...}}          insert or replace by id
+    {"op": "del", "id": "..."}            remove an item
+    {"op": "meta", "version": "...", "lastUpdated": "..."}
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BANK_PATH = REPO_ROOT / 'packages' / 'question-bank' / 'src' / 'questions.json'
+
+DOMAINS = ['Gf', 'Gc', 'Gwm', 'Gv', 'Gs']
+
+
+def content_hash(obj):
+    """Stable SHA-256 of a JSON-serializable object, independent of key order."""
+    canonical = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def fsync_dir(path):
+    """Flush a directory entry (e.g. a rename) to disk; a no-op where directories can't be opened."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_json_atomic(path, data):
+    """Write JSON next to ``path``, fsync it and rename it into place.
+
+    Readers see either the old or the new file, never a truncated one, and
+    the rename survives a crash once this returns.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    fsync_dir(path.parent)
+
+
+class BankStore:
+    def __init__(self, path=DEFAULT_BANK_PATH):
+        self.path = Path(path)
+        self.journal_path = self.path.with_name(f'{self.path.stem}.journal.jsonl')
+
+    # -- writes -------------------------------------------------------------
+
+    def append(self, items):
+        """Add new items, assigning ids to any that lack one. Returns the ids."""
+        records = []
+        for item in items:
+            item = dict(item)
+            item.setdefault('id', str(uuid.uuid4()))
+            records.append({'op': 'put', 'item': item})
+        self._write_journal(records)
+        return [record['item']['id'] for record in records]
+
+    def upsert(self, items):
+        """Insert or replace items by id. Returns the ids."""
+        records = []
+        for item in items:
+            if 'id' not in item:
+                raise ValueError('upsert requires every item to have an id')
+            records.append({'op': 'put', 'item': dict(item)})
+        self._write_journal(records)
+        return [record['item']['id'] for record in records]
+
+    def remove(self, ids):
+        self._write_journal([{'op': 'del', 'id': item_id} for item_id in ids])
+
+    def set_metadata(self, version=None, last_updated=None):
+        record = {'op': 'meta'}
+        if version is not None:
+            record['version'] = version
+        if last_updated is not None:
+            record['lastUpdated'] = last_updated
+        self._write_journal([record])
+
+    def replace(self, questions, version, last_updated):
+        """Write a whole new bank, discarding any pending journal."""
+        write_json_atomic(self.path, {
+            'version': version,
+            'lastUpdated': last_updated,
+            'questions': list(questions),
+        })
+        self._clear_journal()
+
+    def compact(self):
+        """Fold the journal into questions.json. Returns the merged bank."""
+        bank = self.load()
+        if self.pending():
+            write_json_atomic(self.path, bank)
+            self._clear_journal()
+        return bank
+
+    # -- reads --------------------------------------------------------------
+
+    def published(self):
+        """Return the bank dict as last published, without the journal."""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load(self):
+        """Return the bank dict with the journal replayed on top of the base file."""
+        bank = self.published()
+
+        order = {q['id']: i for i, q in enumerate(bank['questions'])}
+        questions = bank['questions']
+        removed = set()
+
+        for record in self.iter_journal():
+            op = record['op']
+            if op == 'put':
+                item = record['item']
+                item_id = item['id']
+                removed.discard(item_id)
+                if item_id in order:
+                    questions[order[item_id]] = item
+                else:
+                    order[item_id] = len(questions)
+                    questions.append(item)
+            elif op == 'del':
+                removed.add(record['id'])
+            elif op == 'meta':
+                for key in ('version', 'lastUpdated'):
+                    if key in record:
+                        bank[key] = record[key]
+            else:
+                raise ValueError(f'Unknown journal op: {op!r}')
+
+        if removed:
+            questions = [q for q in questions if q['id'] not in removed]
+        bank['questions'] = questions
+        return bank
+
+    def iter_questions(self):
+        yield from self.load()['questions']
+
+    def iter_journal(self):
+        if not self.journal_path.exists():
+            return
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def pending(self):
+        """Number of journal records not yet compacted."""
+        return sum(1 for _ in self.iter_journal())
+
+    # -- internals ----------------------------------------------------------
+
+    def _write_journal(self, records):
+        if not records:
+            return
+        lines = ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records)
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _clear_journal(self):
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Inspect or compact the question bank journal')
+    parser.add_argument('command', choices=['status', 'compact'])
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH, type=Path)
+    args = parser.parse_args(argv)
+
+    store = BankStore(args.bank)
+    if args.command == 'status':
+        bank = store.load()
+        print(f"Version: {bank['version']} ({bank['lastUpdated']})")
+        print(f"Questions: {len(bank['questions'])}")
+        print(f"Pending journal records: {store.pending()}")
+    else:
+        pending = store.pending()
+        bank = store.compact()
+        print(f"Compacted {pending} journal records into {store.path}")
+        print(f"Questions: {len(bank['questions'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Synthetic question banks with the questions.json schema, for benchmarks and tests."""
+
+import uuid
+
+import numpy as np
+
+from .store import DOMAINS, write_json_atomic
+
+_STEMS = [
+    'أكمل النمط: {a}، {b}، {c}، ؟',
+    'ما العدد المختلف: {a}، {b}، {c}، {d}؟',
+    'إذا كان اليوم هو {day}، فماذا سيكون بعد {a} أيام؟',
+    'كم عدد الأحرف في كلمة {word}؟',
+]
+_DAYS = ['الأحد', 'الاثنين', 'الثلاثاء', 'الأربعاء', 'الخميس']
+_WORDS = ['الاستقلال', 'المعرفة', 'الحكمة', 'الكتاب', 'المدرسة']
+
+
+def synthetic_questions(n, seed=0):
+    """Yield ``n`` schema-valid items with random parameters and filler Arabic text."""
+    rng = np.random.default_rng(seed)
+    id_rng = uuid.UUID(int=int(rng.integers(2 ** 63)))
+    domains = rng.integers(0, len(DOMAINS), n)
+    difficulty = np.round(rng.uniform(-3.0, 3.0, n), 2)
+    discrimination = np.round(rng.uniform(0.5, 2.5, n), 2)
+    numbers = rng.integers(1, 100, (n, 4))
+    for i in range(n):
+        a, b, c, d = (int(x) for x in numbers[i])
+        options = [str(a + k) for k in range(4)]
+        yield {
+            'id': str(uuid.UUID(int=(id_rng.int + i) % (1 << 128), version=4)),
+            'domain': DOMAINS[domains[i]],
+            'difficulty': float(difficulty[i]),
+            'discrimination': float(discrimination[i]),
+            'guessing': 0.25,
+            'text_ar': _STEMS[i % len(_STEMS)].format(
+                a=a, b=b, c=c, d=d, day=_DAYS[i % len(_DAYS)], word=_WORDS[i % len(_WORDS)]),
+            'options': options,
+            'correct': options[i % 4],
+            'explanation_ar': 'شرح تجريبي',
+            'culturalContext': 'بيانات اصطناعية',
+        }
+
+
+def write_synthetic_bank(path, n, seed=0):
+    write_json_atomic(path, {
+        'version': f'synthetic-{n}',
+        'lastUpdated': '2025-01-01T00:00:00Z',
+        'questions': list(synthetic_questions(n, seed)),
+    })
@@ -0,0 +1,17 @@
+import json
+
+import pytest
+
+from iqbank.tests.factories import make_question
+
+
+@pytest.fixture
+def bank_path(tmp_path):
+    path = tmp_path / 'questions.json'
+    bank = {
+        'version': '1.0.0',
+        'lastUpdated': '2025-01-01T00:00:00Z',
+        'questions': [make_question(i) for i in range(3)],
+    }
+    path.write_text(json.dumps(bank, ensure_ascii=False, indent=2), encoding='utf-8')
+    return path
@@ -0,0 +1,13 @@
+def make_question(i, domain='Gf', difficulty=0.5, discrimination=1.2):
+    return {
+        'id': f'00000000-0000-4000-8000-{i:012d}',
+        'domain': domain,
+        'difficulty': difficulty,
+        'discrimination': discrimination,
+        'guessing': 0.25,
+        'text_ar': f'سؤال رقم {i}',
+        'options': ['1', '2', '3', '4'],
+        'correct': '2',
+        'explanation_ar': 'شرح',
+        'culturalContext': 'سياق',
+    }
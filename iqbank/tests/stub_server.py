@@ -0,0 +1,52 @@
+"""A local stand-in for the Messages API, for tests of llm.py and its users."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['content-length'])))
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            throttle = server.throttle_every and server.requests % server.throttle_every == 0
+        if throttle:
+            self.send_response(429)
+            self.send_header('retry-after', '0')
+            self.end_headers()
+            return
+        text = server.reply(body['messages'][0]['content'])
+        payload = json.dumps({'content': [{'type': 'text', 'text': text}]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('content-type', 'application/json')
+        self.send_header('content-length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """Answers each prompt with ``reply(prompt)``; every ``throttle_every``-th request gets a 429."""
+
+    def __init__(self, reply, throttle_every=0):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.reply = reply
+        self.throttle_every = throttle_every
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
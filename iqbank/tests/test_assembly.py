@@ -0,0 +1,79 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from iqbank.assembly import PlanCache, ShadowTestAssembler, domain_quotas
+from iqbank.irt import ItemBank, item_information
+from iqbank.tests.factories import make_question
+
+DOMAINS = ['Gf', 'Gc', 'Gwm', 'Gv', 'Gs']
+
+
+def bank(n=30, seed=0):
+    rng = np.random.default_rng(seed)
+    return ItemBank.from_questions([
+        make_question(i, domain=DOMAINS[i % 5], difficulty=float(rng.uniform(0, 1)),
+                      discrimination=float(rng.uniform(0.5, 2.5)))
+        for i in range(n)
+    ])
+
+
+def test_quotas_spread_the_remainder():
+    assert domain_quotas(20).tolist() == [4, 4, 4, 4, 4]
+    assert domain_quotas(12).tolist() == [3, 3, 2, 2, 2]
+
+
+def test_shadow_test_is_optimal_and_balanced():
+    items = bank()
+    assembler = ShadowTestAssembler(items, test_length=10)
+    shadow = assembler.assemble(0.3, [0, 1])
+
+    assert shadow.items[:2].tolist() == [0, 1]
+    assert np.bincount(items.domain[shadow.items], minlength=5).tolist() == [2, 2, 2, 2, 2]
+
+    # Brute force over every balanced completion.
+    info = item_information(0.3, items.discrimination, items.difficulty)
+    best = info[[0, 1]].sum()
+    for d in range(5):
+        rows = [r for r in np.flatnonzero(items.domain == d) if r not in (0, 1)]
+        best += max(info[list(c)].sum() for c in itertools.combinations(rows, 2 - (d < 2)))
+    assert shadow.information == pytest.approx(best)
+    assert shadow.next_item == shadow.free[np.argmax(info[shadow.free])]
+
+
+def test_overfull_domain_keeps_the_test_length():
+    items = bank()
+    assembler = ShadowTestAssembler(items, test_length=10)
+    used = [0, 5, 10]  # three Gf items: over the Gf quota of 2
+    shadow = assembler.assemble(0.3, used)
+
+    assert len(shadow.items) == 10 and shadow.items[:3].tolist() == used
+    counts = np.bincount(items.domain[shadow.items], minlength=5)
+    assert counts[0] == 3 and sorted(counts[1:].tolist()) == [1, 2, 2, 2]
+
+    # The short domain is the one whose second-best item adds least.
+    info = item_information(0.3, items.discrimination, items.difficulty)
+    best = {d: sorted(info[items.domain == d])[::-1] for d in range(1, 5)}
+    expected = info[used].sum() + max(
+        sum(best[d][0] + (best[d][1] if d != j else 0.0) for d in best) for j in best)
+    assert shadow.information == pytest.approx(expected)
+
+
+def test_full_length_session_has_no_next_item():
+    items = bank()
+    assembler = ShadowTestAssembler(items, test_length=10)
+    used = list(range(10))
+    shadow = assembler.assemble(0.0, used)
+
+    assert shadow.items.tolist() == used and shadow.next_item is None
+    assert assembler.assemble(0.0, list(range(12))).next_item is None
+
+
+def test_plan_cache_reuses_nearby_states():
+    cache = PlanCache(ShadowTestAssembler(bank(), test_length=10), theta_step=0.1, maxsize=2)
+    first = cache.get(0.51, [3])
+    assert cache.get(0.49, [3]) is first
+    cache.get(1.0)
+    cache.get(-1.0)
+    assert len(cache) == 2 and cache.hits == 1 and cache.misses == 3
@@ -0,0 +1,27 @@
+import json
+
+from iqbank import bench
+from iqbank.schema import schema_errors
+from iqbank.synth import synthetic_questions
+
+
+def test_synthetic_items_are_valid_and_deterministic():
+    items = list(synthetic_questions(50, seed=3))
+    assert all(schema_errors(q) == [] for q in items)
+    assert len({q['id'] for q in items}) == 50
+    assert items == list(synthetic_questions(50, seed=3))
+
+
+def test_run_records_history_and_compares_with_previous(tmp_path):
+    history = tmp_path / 'history.jsonl'
+
+    first = bench.run([200], history, repeat=1)
+    second = bench.run([200], history, repeat=1)
+
+    names = {r['benchmark'] for r in first}
+    assert {'load.json', 'lookup.index', 'domain.index', 'select.table'} <= names
+    assert all(r['ratio'] is None for r in first)
+    assert all(r['ratio'] is not None for r in second)
+    lines = history.read_text().splitlines()
+    assert len(lines) == len(first) + len(second)
+    assert json.loads(lines[0])['size'] == 200
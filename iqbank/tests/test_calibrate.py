@@ -0,0 +1,101 @@
+import json
+
+import numpy as np
+import pytest
+
+from iqbank import calibrate as cal
+from iqbank.irt import ItemBank
+from iqbank.store import BankStore
+from iqbank.tests.factories import make_question
+
+
+def simulated_responses(a, b, n_persons=4000, per_person=4, seed=0):
+    rng = np.random.default_rng(seed)
+    theta = rng.standard_normal(n_persons)
+    items = np.argsort(rng.random((n_persons, len(a))), axis=1)[:, :per_person]
+    persons = np.repeat(np.arange(n_persons), per_person)
+    items = items.ravel()
+    p = 1 / (1 + np.exp(-a[items] * (theta[persons] - b[items])))
+    return cal.ResponseData.from_triples(persons, items, rng.random(len(p)) < p)
+
+
+def test_em_recovers_2pl_parameters():
+    a = np.array([0.8, 1.2, 1.6, 2.0, 1.0, 1.4])
+    b = np.array([-1.5, -0.5, 0.0, 0.5, 1.0, 1.5])
+    data = simulated_responses(a, b)
+
+    result = cal.calibrate(data, len(a), workers=1)
+
+    assert result.converged
+    assert np.abs(result.difficulty - b).max() < 0.25
+    assert np.abs(result.discrimination - a).max() < 0.4
+
+
+def test_sharded_pool_matches_single_process(monkeypatch):
+    a = np.array([1.0, 1.5, 2.0])
+    b = np.array([-0.5, 0.0, 0.5])
+    data = simulated_responses(a, b, n_persons=600, per_person=3)
+
+    single = cal.calibrate(data, 3, workers=1, max_iter=5)
+    monkeypatch.setattr(cal, 'SHARD_RESPONSES', 500)
+    sharded = cal.calibrate(data, 3, workers=2, max_iter=5)
+
+    np.testing.assert_allclose(single.difficulty, sharded.difficulty)
+    np.testing.assert_allclose(single.log_likelihood, sharded.log_likelihood)
+
+
+def test_load_responses_accepts_sessions_and_rows(tmp_path):
+    bank = ItemBank.from_questions([make_question(i) for i in range(2)])
+    ids = bank.ids
+    log = tmp_path / 'responses.jsonl'
+    log.write_text('\n'.join([
+        json.dumps({'sessionId': 's1', 'responses': [
+            {'questionId': ids[0], 'isCorrect': True},
+            {'questionId': ids[1], 'isCorrect': False},
+        ]}),
+        json.dumps({'sessionId': 's2', 'questionId': ids[1], 'isCorrect': True}),
+        json.dumps({'sessionId': 's2', 'questionId': 'missing', 'isCorrect': True}),
+    ]), encoding='utf-8')
+
+    data = cal.load_responses([log], bank)
+
+    assert data.n_persons == 2
+    assert data.n_responses == 3
+    assert data.skipped == 1
+    assert data.persons == ['s1', 's2']
+
+
+def test_apply_calibration_writes_logit_difficulties(bank_path):
+    store = BankStore(bank_path)
+    bank = ItemBank.from_questions(store.iter_questions())
+    result = cal.CalibrationResult(
+        discrimination=np.array([1.1, 2.5, 1.0]),
+        difficulty=np.array([-1.7, 2.35, 0.0]),
+        guessing=np.zeros(3),
+        n_responses=np.array([50, 50, 5]),
+        fitted=np.array([True, True, False]),
+        iterations=1, converged=True, log_likelihood=[0.0],
+    )
+
+    assert cal.apply_calibration(store, bank, result) == 2
+
+    questions = store.load()['questions']
+    assert [q['difficulty'] for q in questions] == [-1.7, 2.35, 0.5]
+    assert questions[1]['discrimination'] == 2.5
+
+
+def test_apply_calibration_refuses_out_of_range_values(bank_path):
+    store = BankStore(bank_path)
+    bank = ItemBank.from_questions(store.iter_questions())
+    result = cal.CalibrationResult(
+        discrimination=np.array([1.1, 3.5, 1.0]),
+        difficulty=np.zeros(3),
+        guessing=np.zeros(3),
+        n_responses=np.full(3, 50),
+        fitted=np.ones(3, dtype=bool),
+        iterations=1, converged=True, log_likelihood=[0.0],
+    )
+
+    with pytest.raises(ValueError, match='discrimination 3.5'):
+        cal.apply_calibration(store, bank, result)
+    assert store.pending() == 0
@@ -0,0 +1,39 @@
+import numpy as np
+
+from iqbank.compiled import CompiledBank, compile_bank
+from iqbank.irt import ItemBank
+from iqbank.tests.factories import make_question
+
+
+def test_compiled_bank_round_trips_items(tmp_path):
+    sparse = make_question(1, domain='Gs')
+    for key in ('guessing', 'explanation_ar', 'culturalContext'):
+        del sparse[key]
+    extra = dict(make_question(2, domain='Gv'), exposureControl=0.4, options=['أ', 'ب', 'ج'])
+    bank = {
+        'version': '3.0.0',
+        'lastUpdated': '2025-12-01T00:00:00Z',
+        'questions': [make_question(0), sparse, extra],
+    }
+    path = tmp_path / 'questions.bank.bin'
+
+    compile_bank(path, bank, {'contentHash': 'abc'})
+    compiled = CompiledBank(path)
+
+    assert compiled.to_bank() == bank
+    assert list(compiled.question(1)) == list(sparse)
+    assert compiled.meta['contentHash'] == 'abc'
+    assert compiled.options(2) == ['أ', 'ب', 'ج']
+
+
+def test_item_bank_from_compiled_matches_json(tmp_path):
+    questions = [make_question(i, difficulty=i / 10) for i in range(5)]
+    path = tmp_path / 'questions.bank.bin'
+    compile_bank(path, {'version': '1', 'lastUpdated': 'x', 'questions': questions})
+
+    mapped = ItemBank.load(path)
+    parsed = ItemBank.from_questions(questions)
+
+    assert mapped.ids == parsed.ids
+    np.testing.assert_array_equal(mapped.difficulty, parsed.difficulty)
+    np.testing.assert_array_equal(mapped.domain, parsed.domain)
@@ -0,0 +1,44 @@
+from iqbank.arabic import normalize
+from iqbank.dedup import MinHashIndex
+from iqbank.tests.factories import make_question
+
+
+def item(i, text, options=('1', '2', '3', '4')):
+    return dict(make_question(i), text_ar=text, options=list(options))
+
+
+def test_normalize_folds_digits_diacritics_and_separators():
+    assert normalize('أكمل: ١، ٤، ٩؟') == normalize('اكمل 1, 4, 9 ?') == 'اكمل 1 4 9'
+    assert normalize('مُعَلِّمٌ') == 'معلم'
+
+
+def test_variants_of_the_same_stem_are_found():
+    bank = [
+        item(0, 'أكمل النمط: 1، 4، 9، 16، 25، ؟', ['30', '36', '40', '49']),
+        item(1, 'ما هو مرادف كلمة الإيثار؟', ['أنانية', 'تفضيل الغير', 'شجاعة', 'كرم']),
+        item(2, 'كم عدد الأحرف في كلمة الاستقلال؟', ['8', '9', '10', '11']),
+    ]
+    index = MinHashIndex.build(bank)
+    batch = [
+        item(10, 'أكمل النمط: ١، ٤، ٩، ١٦، ٢٥، ؟', ['30', '36', '40', '49']),
+        item(11, 'إذا كان اليوم هو الاثنين، فماذا سيكون بعد 3 أيام؟', ['الأربعاء', 'الخميس', 'الجمعة', 'السبت']),
+    ]
+
+    found = index.duplicates_of(batch)
+
+    assert list(found) == [batch[0]['id']]
+    assert found[batch[0]['id']][0] == (bank[0]['id'], 1.0)
+
+
+def test_clusters_and_saved_index(tmp_path):
+    bank = [
+        item(0, 'أكمل النمط: 1، 4، 9، 16، 25، ؟', ['30', '36', '40', '49']),
+        item(1, 'أكمل النمط: 1، 4، 9، 16، 25، 36، ؟', ['42', '45', '48', '49']),
+        item(2, 'ما هو مرادف كلمة الإيثار؟', ['أنانية', 'تفضيل الغير', 'شجاعة', 'كرم']),
+    ]
+    path = tmp_path / 'questions.minhash.bin'
+    MinHashIndex.build(bank).save(path)
+
+    index = MinHashIndex.load(path)
+
+    assert index.clusters() == [[bank[0]['id'], bank[1]['id']]]
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from iqbank.calibrate import ResponseData
+from iqbank.estimate import LikelihoodTable, Posterior, score_sessions
+from iqbank.irt import ItemBank, probability
+from iqbank.simulate import SimulationConfig, simulate
+from iqbank.tests.factories import make_question
+
+
+def bank(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    return ItemBank.from_questions([
+        dict(make_question(i, difficulty=float(rng.uniform(-2, 2)), discrimination=float(rng.uniform(0.8, 2.0))),
+             guessing=0.2)
+        for i in range(n)
+    ])
+
+
+def test_posterior_matches_direct_integration():
+    items = bank()
+    table = LikelihoodTable(items)
+    responses = [(3, True), (10, False), (25, True), (40, True)]
+    posterior = Posterior(table)
+    for row, correct in responses:
+        posterior.update(row, correct)
+
+    theta = np.linspace(-4, 4, 4001)
+    density = np.exp(-0.5 * theta ** 2)
+    p = probability(theta, items.discrimination, items.difficulty, items.guessing)
+    for row, correct in responses:
+        density *= p[:, row] if correct else 1 - p[:, row]
+    mean = (theta * density).sum() / density.sum()
+    sd = np.sqrt(((theta - mean) ** 2 * density).sum() / density.sum())
+    mode = theta[density.argmax()]
+
+    estimate = posterior.eap()
+    assert estimate.theta == pytest.approx(mean, abs=1e-3)
+    assert estimate.se == pytest.approx(sd, abs=1e-3)
+    assert posterior.map().theta == pytest.approx(mode, abs=0.02)
+
+
+def test_batch_scoring_matches_incremental_and_recovers_theta():
+    items = bank()
+    true_theta = np.random.default_rng(1).normal(size=400)
+    result = simulate(items, true_theta, SimulationConfig(test_length=25), workers=1, seed=2)
+    persons = np.repeat(np.arange(400), 25)
+    data = ResponseData.from_triples(persons, result.administered.ravel(), result.responses.ravel())
+    table = LikelihoodTable(items)
+
+    theta, se = score_sessions(table, data, workers=1)
+
+    posterior = Posterior(table)
+    for row, correct in zip(result.administered[7], result.responses[7]):
+        posterior.update(row, correct)
+    assert theta[7] == pytest.approx(posterior.eap().theta)
+    assert se[7] == pytest.approx(posterior.eap().se)
+    assert np.corrcoef(theta, true_theta)[0, 1] > 0.85
+    assert (se < 0.6).all()
+    map_theta, _ = score_sessions(table, data, method='map', workers=1)
+    assert np.corrcoef(map_theta, theta)[0, 1] > 0.98
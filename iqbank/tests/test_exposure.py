@@ -0,0 +1,43 @@
+import numpy as np
+
+from iqbank import simulate as sim
+from iqbank.exposure import apply_exposure, sympson_hetter
+from iqbank.irt import ItemBank
+from iqbank.store import BankStore
+from iqbank.tests.factories import make_question
+
+
+def skewed_questions(n=40):
+    # A few very discriminating items that uncontrolled selection overuses.
+    return [make_question(i, domain=['Gf', 'Gc'][i % 2], difficulty=round(0.3 + 0.01 * i, 2),
+                          discrimination=2.5 if i < 4 else 0.8)
+            for i in range(n)]
+
+
+def test_exposure_control_caps_administration_rate():
+    bank = ItemBank.from_questions(skewed_questions())
+    config = sim.SimulationConfig(test_length=5, top_n=3)
+    theta = np.zeros(2000)
+
+    free = sim.simulate(bank, theta, config, workers=1, seed=1)
+    result = sympson_hetter(bank, r_max=0.3, examinees=2000, config=config, workers=1, seed=1)
+    controlled = sim.simulate(bank, theta, config, workers=1, seed=2, exposure=result.k)
+
+    assert free.exposure_rate.max() > 0.5
+    assert result.converged and set(result.history[0]) == {'Gf', 'Gc'}
+    assert controlled.exposure_rate.max() <= 0.3 + 0.03
+    assert (controlled.test_length == 5).all()
+    for row in controlled.administered:
+        assert len(set(row.tolist())) == 5
+
+
+def test_apply_exposure_writes_and_clears_field(bank_path):
+    store = BankStore(bank_path)
+    bank = ItemBank.from_questions(store.iter_questions())
+
+    assert apply_exposure(store, bank, np.array([0.5, 1.0, 0.25])) == 2
+    reloaded = ItemBank.load(bank_path)
+    assert reloaded.exposure.tolist() == [0.5, 1.0, 0.25]
+
+    assert apply_exposure(store, bank, np.ones(3)) == 2
+    assert all('exposureControl' not in q for q in store.iter_questions())
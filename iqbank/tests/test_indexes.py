@@ -0,0 +1,50 @@
+import numpy as np
+
+from iqbank.indexes import BankIndex, write_index
+from iqbank.irt import ItemBank
+from iqbank.tests.factories import make_question
+
+DOMAINS = ['Gf', 'Gc', 'Gwm', 'Gv', 'Gs']
+
+
+def indexed_bank(tmp_path, n=500):
+    rng = np.random.default_rng(4)
+    bank = ItemBank.from_questions([
+        make_question(i, domain=DOMAINS[int(rng.integers(5))], difficulty=float(rng.uniform(-2, 2)))
+        for i in range(n)
+    ])
+    path = tmp_path / 'questions.index.bin'
+    write_index(path, bank)
+    return bank, BankIndex(path)
+
+
+def test_id_lookup_finds_every_row(tmp_path):
+    bank, index = indexed_bank(tmp_path)
+
+    assert [index.row(item_id) for item_id in bank.ids] == list(range(len(bank)))
+    assert index.row('not-an-id') is None
+
+
+def test_domain_and_near_queries_match_full_scan(tmp_path):
+    bank, index = indexed_bank(tmp_path)
+
+    for code, domain in enumerate(DOMAINS):
+        rows = index.domain_rows(domain)
+        assert sorted(rows.tolist()) == np.flatnonzero(bank.domain == code).tolist()
+        assert (np.diff(bank.difficulty[rows]) >= 0).all()
+
+        near = index.near(domain, 0.3, width=0.5)
+        expected = np.flatnonzero((bank.domain == code) & (np.abs(bank.difficulty - 0.3) <= 0.5))
+        assert sorted(near.tolist()) == expected.tolist()
+
+
+def test_buckets_partition_each_domain(tmp_path):
+    bank, index = indexed_bank(tmp_path)
+    buckets = index.meta['buckets']
+
+    for domain in DOMAINS:
+        rows = np.concatenate([index.bucket_rows(domain, k) for k in range(buckets)])
+        assert rows.tolist() == index.domain_rows(domain).tolist()
+        for k in range(buckets):
+            for row in index.bucket_rows(domain, k):
+                assert index.bucket(bank.difficulty[row]) == k
@@ -0,0 +1,40 @@
+import numpy as np
+
+from iqbank.binfile import read_binfile, write_binfile
+from iqbank.build import build
+from iqbank.infotable import InfoTable
+from iqbank.irt import ItemBank
+from iqbank.publish import publish
+from iqbank.store import BankStore
+
+
+def test_binfile_round_trip(tmp_path):
+    path = tmp_path / 'arrays.bin'
+    arrays = {'a': np.arange(5, dtype=np.int32), 'b': np.eye(3), 'empty': np.zeros(0)}
+
+    write_binfile(path, 'test', arrays, {'note': 'نص'})
+    loaded = read_binfile(path, 'test')
+
+    assert loaded.meta == {'note': 'نص'}
+    for name, value in arrays.items():
+        np.testing.assert_array_equal(loaded[name], value)
+        assert loaded[name].ctypes.data % 64 == 0 or value.size == 0
+
+
+def test_table_lookup_matches_full_sort(bank_path):
+    store = BankStore(bank_path)
+    store.upsert([dict(q, difficulty=d, discrimination=a) for q, d, a in
+                  zip(store.iter_questions(), [0.1, 0.5, 0.9], [1.0, 2.0, 1.5])])
+    publish(bank_path, version='1.1.0')
+    paths = build(bank_path)
+    table = InfoTable(next(p for p in paths if p.name.endswith('.info.bin')))
+    bank = ItemBank.load(bank_path)
+
+    for theta in (-3.0, -0.4, 0.5, 2.2):
+        expected = np.argsort(-bank.information(table.grid[table.grid_index(theta)]), kind='stable')
+        assert table.top_n(theta, n=3) == expected.tolist()
+        assert table.top_n(theta, used={int(expected[0])}, n=2) == expected[1:].tolist()
+
+    np.testing.assert_allclose(table.information(0.5), bank.information(0.5), rtol=1e-6)
+    assert table.meta['version'] == '1.1.0'
+    assert table.ids[0].decode() == bank.ids[0]
@@ -0,0 +1,78 @@
+import json
+import os
+
+import numpy as np
+
+from iqbank.calibrate import load_store_responses
+from iqbank.ingest import ResponseStore, ingest
+from iqbank.irt import ItemBank
+from iqbank.tests.factories import make_question
+
+QUESTIONS = [make_question(i) for i in range(3)]
+
+
+def served(session, item, ts):
+    return {'level': 'info', 'message': f"Served question {QUESTIONS[item]['id']} for session {session}",
+            'service': 'iq-test-backend', 'timestamp': ts}
+
+
+def answered(session, correct, ts):
+    return {'level': 'info', 'message': f"Answer submitted for session {session}: "
+                                        f"{'correct' if correct else 'incorrect'}",
+            'service': 'iq-test-backend', 'timestamp': ts}
+
+
+def write(path, records, partial=''):
+    with open(path, 'a', encoding='utf-8') as f:
+        f.writelines(json.dumps(r) + '\n' for r in records)
+        f.write(partial)
+
+
+def test_ingest_pairs_answers_across_runs_and_rotation(tmp_path):
+    log = tmp_path / 'combined.log'
+    store = ResponseStore(tmp_path / 'responses')
+    write(log, [
+        {'level': 'info', 'message': 'Created new session: s1'},
+        served('s1', 0, '2025-11-25T23:59:50.000Z'),
+        answered('s1', True, '2025-11-26T00:00:02.000Z'),
+        served('s1', 1, '2025-11-26T00:00:05.000Z'),
+    ], partial='{"level":"info","mess')
+
+    assert ingest(log, store) == (1, 0)
+    assert ingest(log, store) == (0, 0)  # nothing new; partial line left alone
+
+    with open(log, 'a', encoding='utf-8') as f:
+        f.write('age":"Results retrieved for session s1"}\n')
+    write(log, [answered('s1', False, '2025-11-26T00:00:09.000Z')])
+    os.rename(log, tmp_path / 'combined.log.1')
+    write(log, [served('s2', 2, '2025-11-27T10:00:00.000Z'), answered('s2', True, '2025-11-27T10:00:30.000Z'),
+                answered('s3', True, '2025-11-27T10:00:31.000Z')])
+
+    assert ingest(log, store) == (2, 1)
+    assert store.days() == ['2025-11-26', '2025-11-27']
+
+    rows = list(store.iter_responses())
+    assert sorted(rows) == sorted([('s1', QUESTIONS[0]['id'], True), ('s1', QUESTIONS[1]['id'], False),
+                                   ('s2', QUESTIONS[2]['id'], True)])
+    latency = np.concatenate([c['latency'] for c in store.iter_columns()])
+    assert sorted(latency.tolist()) == [4000, 12000, 30000]
+
+
+def test_reingesting_from_a_stale_checkpoint_does_not_duplicate(tmp_path):
+    log = tmp_path / 'combined.log'
+    store = ResponseStore(tmp_path / 'responses')
+    records = []
+    for i in range(6):
+        records += [served(f's{i}', i % 3, '2025-11-26T08:00:00.000Z'),
+                    answered(f's{i}', i % 2 == 0, '2025-11-26T08:00:10.000Z')]
+    write(log, records)
+
+    ingest(log, store)
+    store.checkpoint_path.unlink()  # crash before the checkpoint was written
+    ingest(log, store)
+    assert len(list(store.parts())) == 1
+
+    bank = ItemBank.from_questions(QUESTIONS)
+    data = load_store_responses(store, bank)
+    assert data.n_responses == 6 and data.n_persons == 6
+    assert data.scores.sum() == 3
@@ -0,0 +1,40 @@
+from iqbank.interpret import DOMAIN_REPRESENTATIVE, OVERALL_REPRESENTATIVE, InterpretationStore, generate, profile_key
+from iqbank.llm import ClientConfig, MessagesClient
+from iqbank.tests.factories import make_question
+from iqbank.tests.stub_server import StubServer
+
+
+def client(url):
+    return MessagesClient(ClientConfig(api_key='test', base_url=url, concurrency=16, requests_per_minute=600_000,
+                                       tokens_per_minute=100_000_000))
+
+
+def test_profile_key_matches_results_route_bands():
+    assert profile_key(145, {'Gf': 130, 'Gc': 110, 'Gwm': 109, 'Gv': 90, 'Gs': 55}) == '4:22110'
+    assert profile_key(89, {'Gwm': 120}) == '0:--2--'
+
+
+def test_profile_representatives_fall_in_their_own_bands():
+    assert [profile_key(score, {})[0] for score in OVERALL_REPRESENTATIVE] == list('01234')
+    assert [profile_key(100, {'Gf': score})[2] for score in DOMAIN_REPRESENTATIVE] == list('012')
+
+
+def test_generate_fills_store_and_only_regenerates_changed_prompts(tmp_path):
+    questions = [make_question(i) for i in range(3)]
+    path = tmp_path / 'interpretations.json'
+
+    with StubServer(lambda prompt: 'نص') as server:
+        report = generate(client(server.url), InterpretationStore(path), questions)
+        store = InterpretationStore(path)
+        assert report.generated == 5 * 4 ** 5 + 3 * 4 and not report.failed
+        assert store.get('interpretations', '2:2-110') == 'نص'
+        assert store.get('feedback', f"{questions[0]['id']}:1") == 'نص'
+
+        questions[1]['explanation_ar'] = 'شرح جديد'
+        del questions[2]
+        before = server.requests
+        report = generate(client(server.url), InterpretationStore(path), questions)
+
+    assert server.requests - before == 4  # one call per option of the edited item
+    assert report.cached == 5 * 4 ** 5 + 4
+    assert len(InterpretationStore(path).data['feedback']) == 8
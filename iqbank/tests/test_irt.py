@@ -0,0 +1,63 @@
+import math
+
+import numpy as np
+
+from iqbank import irt
+from iqbank.irt import ItemBank
+from iqbank.tests.factories import make_question
+
+
+def scalar_probability(theta, a, b):
+    return 1 / (1 + math.exp(-a * (theta - b)))
+
+
+def test_probability_matches_scalar_2pl():
+    a = np.array([1.5, 0.8, 2.0])
+    b = np.array([0.5, -1.0, 0.2])
+    thetas = np.linspace(-3, 3, 7)
+
+    p = irt.probability(thetas, a, b)
+
+    assert p.shape == (7, 3)
+    for i, theta in enumerate(thetas):
+        for j in range(3):
+            assert math.isclose(p[i, j], scalar_probability(theta, a[j], b[j]))
+
+
+def test_probability_is_half_at_difficulty():
+    assert irt.probability(0.5, np.array([1.5]), np.array([0.5]))[0] == 0.5
+
+
+def test_3pl_with_zero_guessing_reduces_to_2pl():
+    a = np.array([1.2, 1.7])
+    b = np.array([0.1, 0.9])
+    thetas = np.linspace(-2, 2, 5)
+
+    np.testing.assert_allclose(
+        irt.item_information(thetas, a, b, np.zeros(2)),
+        irt.item_information(thetas, a, b),
+    )
+
+
+def test_test_information_sums_masked_items():
+    a = np.array([1.0, 2.0, 1.5])
+    b = np.array([0.0, 0.5, 1.0])
+    mask = np.array([True, False, True])
+
+    total = irt.test_information(0.3, a, b, mask=mask)
+    info = irt.item_information(0.3, a, b)
+
+    assert math.isclose(total, info[0] + info[2])
+
+
+def test_select_next_skips_used_items():
+    bank = ItemBank.from_questions([
+        make_question(0, difficulty=0.0, discrimination=2.0),
+        make_question(1, difficulty=0.1, discrimination=1.0),
+        make_question(2, difficulty=0.9, discrimination=1.0),
+    ])
+    used = np.array([True, False, False])
+
+    assert bank.select_next(0.0, np.zeros(3, dtype=bool)) == 0
+    assert bank.select_next(0.0, used) == 1
+    assert bank.row(make_question(2)['id']) == 2
@@ -0,0 +1,82 @@
+import csv
+
+import numpy as np
+import pytest
+
+from iqbank import itemfit
+from iqbank.irt import ItemBank
+from iqbank.itemfit import analyze, chi2_sf, group_codes, load_groups, misfit
+from iqbank.sparse import ResponseMatrix
+from iqbank.tests.factories import make_question
+
+N_ITEMS = 30
+PERSONS = 12_000
+LENGTH = 15
+
+
+def responses(seed=0):
+    """Bank and responses where item 0 misfits (true a = 0.2) and item 1 is harder for group 1."""
+    rng = np.random.default_rng(seed)
+    a, b = rng.uniform(0.8, 2.0, N_ITEMS), rng.uniform(-1.5, 1.5, N_ITEMS)
+    bank = ItemBank.from_questions([
+        make_question(i, difficulty=float(b[i]), discrimination=float(a[i])) for i in range(N_ITEMS)
+    ])
+    theta = rng.standard_normal(PERSONS)
+    group = (rng.random(PERSONS) < 0.4).astype(np.int16)
+    items = np.argsort(rng.random((PERSONS, N_ITEMS)), axis=1)[:, :LENGTH]
+    true_a, true_b = a[items], b[items]
+    true_a[items == 0] = 0.2
+    true_b[(items == 1) & (group[:, None] == 1)] += 0.8
+    p = 1.0 / (1.0 + np.exp(-true_a * (theta[:, None] - true_b)))
+    correct = rng.random(p.shape) < p
+    data = ResponseMatrix.from_triples(np.repeat(np.arange(PERSONS), LENGTH), items.ravel(), correct.ravel(),
+                                       n_items=N_ITEMS)
+    return bank, data, group
+
+
+def test_fit_flags_the_misfitting_item_and_dif_the_shifted_one():
+    bank, data, group = responses()
+    fit, (dif,) = analyze(data, bank, {'locale': (group, ['ar', 'en'])}, workers=1)
+
+    assert fit.responses.sum() == PERSONS * LENGTH
+    assert fit.outfit[0] > 1.3 and fit.infit[0] > 1.2
+    good = np.arange(2, N_ITEMS)
+    assert np.all(np.abs(fit.infit[good] - 1) < 0.1)
+    assert np.median(fit.chi2[good] / fit.df[good]) < 2 and fit.chi2[0] > 20 * fit.df[0]
+    assert np.flatnonzero(misfit(fit)).tolist()[:1] == [0]
+
+    assert (dif.reference, dif.focal) == ('ar', 'en')
+    assert dif.mh_delta[1] < -1.5 and dif.ets[1] == 'C'
+    assert set(dif.ets[good].tolist()) <= {'A', 'B'} and (dif.ets[good] == 'A').mean() > 0.9
+    assert dif.lr_p[1] < 1e-6 and dif.lr_uniform[1] > 10 * dif.lr_nonuniform[1]
+    assert dif.r2_delta[1] > np.nanmax(dif.r2_delta[good])
+
+
+def test_process_pool_matches_serial(monkeypatch):
+    bank, data, group = responses(seed=1)
+    serial, (dif_serial,) = analyze(data, bank, {'locale': (group, ['ar', 'en'])}, workers=1)
+    monkeypatch.setattr(itemfit, 'BLOCK_RESPONSES', 20_000)
+    pooled, (dif_pooled,) = analyze(data, bank, {'locale': (group, ['ar', 'en'])}, workers=2)
+    np.testing.assert_allclose(pooled.chi2, serial.chi2)
+    np.testing.assert_allclose(dif_pooled.mh_delta, dif_serial.mh_delta)
+
+
+def test_chi2_sf_matches_known_quantiles():
+    assert chi2_sf(3.841, 1) == pytest.approx(0.05, abs=1e-3)
+    assert chi2_sf(5.991, 2) == pytest.approx(0.05, abs=1e-4)
+    assert chi2_sf(18.307, 10) == pytest.approx(0.05, abs=2e-3)
+    assert np.isnan(chi2_sf(1.0, 0))
+
+
+def test_group_codes_from_csv(tmp_path):
+    path = tmp_path / 'sessions.csv'
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['session', 'locale'])
+        writer.writerows([['s1', 'ar'], ['s2', 'en'], ['s3', 'ar'], ['s4', '']])
+    labels = load_groups(path, ['locale'])['locale']
+
+    codes, order = group_codes(['s1', 's2', 's3', 's4', 's5'], labels)
+    assert order == ['ar', 'en'] and codes.tolist() == [0, 1, 0, -1, -1]
+    codes, order = group_codes(['s1', 's2', 's3'], labels, reference='en')
+    assert order == ['en', 'ar'] and codes.tolist() == [1, 0, 1]
@@ -0,0 +1,61 @@
+import re
+import time
+from itertools import islice
+
+from iqbank import itemgen
+from iqbank.itemgen import generate, unique
+from iqbank.store import BankStore
+from iqbank.validate import check_item
+
+
+def test_generated_items_are_valid_and_distinct():
+    items = list(islice(unique(generate(seed=1)), 3000))
+    assert all(check_item(item) == [] for item in items)
+    assert len({item['text_ar'] for item in items}) == len(items)
+    assert {item['domain'] for item in items} == {'Gf', 'Gs'}
+    assert all(-6.0 <= item['difficulty'] <= 6.0 for item in items)
+    assert all(item['guessing'] == round(1 / len(item['options']), 2) for item in items)
+
+
+def test_counting_and_ordering_keys_are_correct():
+    for item in islice(generate(['counting'], seed=2), 200):
+        target, digits = re.match(r'^كم مرة يظهر الرقم (\d) في السلسلة: ([\d ]+)؟$', item['text_ar']).groups()
+        assert item['correct'] == str(digits.split().count(target))
+
+    relations = {r[0]: r for r in itemgen._RELATIONS} | {r[1]: r for r in itemgen._RELATIONS}
+    for item in islice(generate(['ordering'], seed=3), 200):
+        premises, question = item['text_ar'].split('. من ')
+        above = {}  # name -> names it outranks in the asked-about direction
+        for premise in premises.split('، و'):
+            left, right = premise.split(' من ')
+            name, relation = left.split(' ', 1)
+            more, less, most, least = relations[relation]
+            upper, lower = (name, right) if relation == more else (right, name)
+            above.setdefault(upper, set()).add(lower)
+        names = set(above) | set().union(*above.values())
+        top = [n for n in names if all(n not in lower for lower in above.values())]
+        bottom = [n for n in names if n not in above]
+        assert len(top) == len(bottom) == 1
+        assert item['correct'] == (top[0] if question[:-1] == most else bottom[0])
+
+
+def test_analogies_have_one_consistent_answer():
+    for item in islice(generate(['analogy'], seed=4), 200):
+        a, b, c, d, e = (int(x) for x in re.findall(r'\d+', item['text_ar']))
+        assert itemgen._analogy_answers([(a, b), (c, d)], e) == {int(item['correct'])}
+
+
+def test_unique_stops_when_the_models_are_exhausted():
+    repeated = ({'text_ar': 'سؤال'} for _ in iter(int, 1))
+    assert len(list(unique(repeated, max_misses=50))) == 1
+
+
+def test_cli_appends_to_the_journal_skipping_existing_stems(bank_path):
+    started = time.perf_counter()
+    itemgen.main(['--bank', str(bank_path), '--count', '2000', '--seed', '7', '--sample', '0', '--write'])
+    itemgen.main(['--bank', str(bank_path), '--count', '2000', '--seed', '7', '--sample', '0', '--write'])
+    assert time.perf_counter() - started < 10
+
+    questions = BankStore(bank_path).load()['questions']
+    assert len(questions) == 3 + 4000
+    assert len({q['text_ar'] for q in questions}) == len(questions)
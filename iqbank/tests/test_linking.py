@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from iqbank.irt import ItemBank
+from iqbank.linking import METHODS, Linker, linked_items
+from iqbank.tests.factories import make_question
+
+
+def scaled_batch(bank_questions, slope, intercept, extra=()):
+    # Batch scale: θ_bank = A·θ_batch + B, so b_batch = (b - B) / A and a_batch = a·A.
+    batch = [dict(q, difficulty=(q['difficulty'] - intercept) / slope, discrimination=q['discrimination'] * slope)
+             for q in bank_questions]
+    return batch + list(extra)
+
+
+def test_all_methods_recover_a_known_transformation():
+    rng = np.random.default_rng(0)
+    questions = [make_question(i, difficulty=round(float(rng.uniform(-2, 2)), 3),
+                               discrimination=round(float(rng.uniform(0.6, 2.0)), 3)) for i in range(30)]
+    bank = ItemBank.from_questions(questions)
+    batch = ItemBank.from_questions(scaled_batch(questions, 1.3, -0.4))
+    linker = Linker(bank, batch)
+
+    for method in METHODS:
+        result = linker.link(method)
+        assert result.anchors == 30
+        assert result.slope == pytest.approx(1.3, abs=1e-3) and result.intercept == pytest.approx(-0.4, abs=1e-3)
+
+
+def test_linked_items_exclude_anchors_and_keep_the_logit_scale():
+    anchors = [make_question(i, difficulty=0.2 + 0.1 * i) for i in range(5)]
+    new = [make_question(10, difficulty=0.0), make_question(11, difficulty=2.0),
+           make_question(12, difficulty=60.0)]
+    batch_questions = scaled_batch(anchors, 0.5, 0.1, new)
+    bank = ItemBank.from_questions(anchors)
+    result = Linker(bank, ItemBank.from_questions(batch_questions)).link('haebara')
+
+    items = linked_items(batch_questions[:-1], result, bank_ids=bank.ids)
+    assert [q['id'] for q in items] == [q['id'] for q in new[:2]]
+    assert items[0]['difficulty'] == pytest.approx(0.1, abs=1e-3)
+    assert items[1]['difficulty'] == pytest.approx(1.1, abs=1e-3)
+    with pytest.raises(ValueError, match='difficulty'):
+        linked_items(batch_questions, result, bank_ids=bank.ids)
+
+
+def test_linker_needs_two_anchors():
+    bank = ItemBank.from_questions([make_question(0)])
+    with pytest.raises(ValueError):
+        Linker(bank, ItemBank.from_questions([make_question(0), make_question(1)]))
@@ -0,0 +1,41 @@
+import numpy as np
+
+from iqbank import simulate as sim
+from iqbank.irt import ItemBank
+from iqbank.norming import build_norms, convert, normal_cdf, replay_theta, scale_thetas, simulated_data
+from iqbank.store import DOMAINS
+from iqbank.tests.factories import make_question
+
+
+def bank(n=60):
+    return ItemBank.from_questions([
+        make_question(i, domain=DOMAINS[i % 3], difficulty=round(-1.5 + 3 * i / n, 2)) for i in range(n)])
+
+
+def test_replay_reproduces_engine_theta():
+    b = bank()
+    result = sim.simulate(b, sim.sample_population(300, seed=1), workers=1, seed=1)
+    data = simulated_data(b, 300, seed=1, workers=1)
+
+    assert np.allclose(replay_theta(data, b.discrimination, b.difficulty), result.theta_hat)
+    thetas = scale_thetas(data, b)
+    assert set(thetas) == {'overall', 'Gf', 'Gc', 'Gwm'}
+    assert len(thetas['Gf']) <= 300
+
+
+def test_norm_tables_are_monotone_and_centred():
+    rng = np.random.default_rng(0)
+    sample = np.clip(rng.normal(0.5, 0.8, 5000), -3, 3)
+    norms = build_norms({'overall': sample, 'Gf': sample[:100]}, 'test', min_sessions=500)
+
+    assert set(norms['scales']) == {'overall'} and norms['sessions'] == {'overall': 5000}
+    table = norms['scales']['overall']
+    assert len(table['iq']) == 121
+    assert np.all(np.diff(table['iq']) >= 0) and np.all(np.diff(table['percentile']) >= 0)
+    iq, percentile = convert(norms, 'overall', float(np.median(sample)))
+    assert abs(iq - 100) < 1.5 and abs(percentile - 50) < 2
+    assert convert(norms, 'overall', 0.5 + 0.8)[0] > 112
+
+
+def test_normal_cdf_matches_reference_points():
+    assert np.allclose(normal_cdf(np.array([-1.96, 0.0, 1.0])), [0.0249979, 0.5, 0.8413447], atol=1e-6)
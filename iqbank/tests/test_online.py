@@ -0,0 +1,84 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from iqbank.ingest import ResponseStore
+from iqbank.irt import ItemBank, probability
+from iqbank.online import OnlineCalibrator, store_responses
+from iqbank.tests.factories import make_question
+
+
+def stream(a, b, sessions, seed=0):
+    rng = np.random.default_rng(seed)
+    for s in range(sessions):
+        theta = rng.standard_normal()
+        for row in rng.choice(len(a), size=4, replace=False):
+            p = probability(theta, a[row:row + 1], b[row:row + 1])[0]
+            yield f's{s}', int(row), bool(rng.random() < p)
+
+
+def test_streaming_updates_move_items_towards_true_parameters():
+    true_b = np.array([-1.0, -0.3, 0.4, 1.2, 0.0, 0.8])
+    true_a = np.full(6, 1.2)
+    bank = ItemBank.from_questions([make_question(i, difficulty=0.5) for i in range(6)])
+    calibrator = OnlineCalibrator(bank, update_every=500, half_life=10**9, prior_weight=20)
+
+    for session, row, correct in stream(true_a, true_b, 3000):
+        calibrator.observe(session, row, correct)
+    calibrator.update(flush=True)
+
+    assert not calibrator.sessions and calibrator.responses == 12_000 and calibrator.result().fitted.all()
+    assert np.abs(calibrator.b - true_b).max() < 0.3
+    assert np.corrcoef(calibrator.b, true_b)[0, 1] > 0.97
+
+    written = (calibrator.a.copy(), calibrator.b.copy(), calibrator.c.copy())
+    written[1][2] += 0.1
+    np.testing.assert_array_equal(calibrator.moved(*written, 0.05), np.arange(6) == 2)
+
+
+def test_checkpoint_round_trip(tmp_path):
+    bank = ItemBank.from_questions([make_question(i) for i in range(3)])
+    calibrator = OnlineCalibrator(bank, update_every=2)
+    for session, row, correct in [('a', 0, True), ('a', 1, False), ('b', 2, True)]:
+        calibrator.observe(session, row, correct)
+    calibrator.save(tmp_path / 'state.npz', {'log': {'inode': 1, 'offset': 10}})
+
+    restored = OnlineCalibrator(bank, update_every=2)
+    assert restored.load(tmp_path / 'state.npz') == {'log': {'inode': 1, 'offset': 10}}
+    assert restored.responses == 3 and list(restored.sessions) == ['a', 'b']
+    np.testing.assert_allclose(restored.n, calibrator.n)
+    assert restored.sessions == calibrator.sessions
+
+
+def test_checkpoint_is_remapped_by_item_id(tmp_path):
+    questions = [make_question(i) for i in range(3)]
+    calibrator = OnlineCalibrator(ItemBank.from_questions(questions), update_every=100)
+    for session, row, correct in [('a', 0, True), ('a', 1, False), ('b', 2, True), ('c', 1, True)]:
+        calibrator.observe(session, row, correct)
+    calibrator.b[:] = [0.1, 0.2, 0.3]
+    calibrator.save(tmp_path / 'state.npz')
+
+    bank = ItemBank.from_questions([questions[2], make_question(7), questions[0]])
+    restored = OnlineCalibrator(bank, update_every=100)
+    fresh = restored.n[1].copy()
+    restored.load(tmp_path / 'state.npz')
+
+    np.testing.assert_allclose(restored.b, [0.3, 0.5, 0.1])
+    np.testing.assert_array_equal(restored.observed, [1, 0, 1])
+    np.testing.assert_allclose(restored.n[1], fresh)
+    assert restored.sessions == OrderedDict([('a', [[2], [True], 2]), ('b', [[0], [True], 3])])
+
+
+def test_store_marks_survive_compaction(tmp_path):
+    store = ResponseStore(tmp_path / 'responses')
+    day = 1_764_115_200_000  # 2025-11-26T00:00:00Z
+    rows = [(day + t, f's{t}', 'q', t % 2, 100) for t in (0, 5, 5, 9)]
+    store.append(rows[:3], 'part-1-000000000000')
+    marks = {}
+    assert [s for s, _, _ in store_responses(store, marks)] == ['s0', 's5', 's5']
+
+    store.append(rows[3:], 'part-1-000000000100')
+    store.append([(day + 5, 's5b', 'q', 1, 100)], 'part-1-000000000200')
+    store.compact('2025-11-26')
+    assert sorted(s for s, _, _ in store_responses(store, marks)) == ['s5b', 's9']
+    assert list(store_responses(store, marks)) == []
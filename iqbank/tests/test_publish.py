@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from iqbank.publish import bump_version, changes_dir, publish, version_key
+from iqbank.store import BankStore
+from iqbank.tests.factories import make_question
+
+
+def test_bump_version():
+    assert bump_version('1.2.3') == '1.3.0'
+    assert bump_version('1.2.3', 'patch') == '1.2.4'
+    assert bump_version('2.0', 'major') == '3.0.0'
+    assert version_key('2.0.10') > version_key('2.0.9') and version_key('2') == (2, 0, 0)
+
+
+def test_publish_writes_bank_and_change_manifest(bank_path):
+    store = BankStore(bank_path)
+    assert publish(bank_path) is None
+
+    edited = dict(make_question(1), difficulty=0.9)
+    store.upsert([edited, make_question(7)])
+    store.remove([make_question(2)['id']])
+    manifest = publish(bank_path, last_updated='2025-02-01T00:00:00Z')
+
+    bank = json.loads(bank_path.read_text(encoding='utf-8'))
+    assert bank['version'] == manifest['version'] == '1.1.0'
+    assert store.pending() == 0 and [q['id'] for q in bank['questions']] == [
+        make_question(i)['id'] for i in (0, 1, 7)]
+    assert manifest['added'] == [make_question(7)['id']]
+    assert manifest['updated'] == [edited['id']] and manifest['removed'] == [make_question(2)['id']]
+    assert manifest['items'][edited['id']]['difficulty'] == 0.9
+
+    on_disk = json.loads((changes_dir(bank_path) / '1.0.0..1.1.0.json').read_text(encoding='utf-8'))
+    assert on_disk == manifest
+    assert not list(bank_path.parent.glob('.*.tmp'))
+
+
+def test_journal_version_is_used_and_republishing_is_rejected(bank_path):
+    store = BankStore(bank_path)
+    store.upsert([make_question(5)])
+    store.set_metadata(version='2.0.0')
+    assert publish(bank_path)['version'] == '2.0.0'
+    with pytest.raises(ValueError):
+        publish(bank_path, version='2.0.0')
+
+    store.upsert([make_question(6)])
+    store.set_metadata(version='1.2.0')
+    with pytest.raises(ValueError, match='not greater'):
+        publish(bank_path)
+    assert publish(bank_path, version='2.0.10')['previousVersion'] == '2.0.0'
+    with pytest.raises(ValueError):
+        publish(bank_path, version='2.0.9')
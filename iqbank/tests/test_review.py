@@ -0,0 +1,36 @@
+from iqbank.llm import ClientConfig, MessagesClient
+from iqbank.review import APPROVED, REJECTED, ReviewCache, review
+from iqbank.tests.factories import make_question
+from iqbank.tests.stub_server import StubServer
+
+
+def reviewer(prompt):
+    return 'REJECTED: unclear wording' if 'سيء' in prompt else 'APPROVED'
+
+
+def client(url):
+    return MessagesClient(ClientConfig(api_key='test', base_url=url, concurrency=4, requests_per_minute=60_000,
+                                       tokens_per_minute=10_000_000, backoff=0.01))
+
+
+def test_review_retries_and_only_sends_changed_items(tmp_path):
+    questions = [make_question(i) for i in range(12)]
+    questions[5]['text_ar'] = 'سؤال سيء'
+    cache_path = tmp_path / 'review.json'
+
+    with StubServer(reviewer, throttle_every=3) as server:
+        first = client(server.url)
+        verdicts = review(questions, first, ReviewCache(cache_path))
+
+        assert [v.verdict for v in verdicts] == [REJECTED if i == 5 else APPROVED for i in range(12)]
+        assert verdicts[5].reason == 'unclear wording'
+        assert first.calls > 12  # throttled requests were retried
+
+        questions[2]['text_ar'] = 'سؤال معدل'
+        questions[3]['difficulty'] = 0.9  # not shown to the reviewer
+        second = client(server.url)
+        verdicts = review(questions, second, ReviewCache(cache_path))
+
+    assert [v.cached for v in verdicts].count(False) == 1
+    assert not verdicts[2].cached and verdicts[2].verdict == APPROVED
+    assert second.calls in (1, 2)
@@ -0,0 +1,25 @@
+from iqbank import publish as bank_publish
+from iqbank.shm import SharedBank, publish, read_manifest
+from iqbank.store import BankStore
+from iqbank.tests.factories import make_question
+
+
+def test_publish_and_swap_without_restart(bank_path, tmp_path):
+    shared = tmp_path / 'shm'
+    first = publish(bank_path, shared)
+    worker = SharedBank(shared)
+    old = worker.current()
+
+    assert first['generation'] == 1 and len(old) == 3
+    assert publish(bank_path, shared) == first  # unchanged content: no new generation
+
+    BankStore(bank_path).upsert([make_question(3)])
+    assert publish(bank_path, shared) == first  # journal edits are not served until published
+    bank_publish.publish(bank_path, version='1.0.1')
+    second = publish(bank_path, shared, keep=0)
+
+    assert second['generation'] == 2 and not (shared / first['segment']).exists()
+    assert len(worker.current()) == 4 and worker.generation == 2
+    # The unlinked old segment stays readable for requests still holding it.
+    assert old.question(0)['id'] == make_question(0)['id']
+    assert read_manifest(shared)['segment'] == second['segment']
@@ -0,0 +1,53 @@
+import numpy as np
+
+from iqbank import simulate as sim
+from iqbank.irt import ItemBank
+from iqbank.tests.factories import make_question
+
+
+def small_bank(n=40):
+    rng = np.random.default_rng(0)
+    domains = ['Gf', 'Gc', 'Gwm', 'Gv', 'Gs']
+    return ItemBank.from_questions([
+        make_question(i, domain=domains[i % 5], difficulty=float(rng.uniform(-2, 2)),
+                      discrimination=float(rng.uniform(0.8, 2.0)))
+        for i in range(n)
+    ])
+
+
+def test_sessions_never_repeat_items():
+    bank = small_bank()
+    result = sim.simulate(bank, np.linspace(-2, 2, 200), sim.SimulationConfig(test_length=10),
+                          workers=1, seed=3)
+
+    assert result.administered.shape == (200, 10)
+    for row in result.administered:
+        assert len(set(row.tolist())) == 10
+    assert result.exposure_counts.sum() == 200 * 10
+    assert (np.abs(result.theta_hat) <= 3).all()
+
+
+def test_estimates_track_true_theta():
+    bank = small_bank()
+    result = sim.simulate(bank, np.repeat([-2.0, 2.0], 500), sim.SimulationConfig(test_length=20),
+                          workers=1, seed=7)
+
+    assert result.theta_hat[:500].mean() < result.theta_hat[500:].mean() - 1.0
+
+
+def test_test_length_is_capped_by_bank_size():
+    bank = small_bank(8)
+    result = sim.simulate(bank, np.zeros(10), sim.SimulationConfig(test_length=20), workers=1, seed=1)
+
+    assert (result.test_length == 8).all()
+
+
+def test_chunked_process_pool_matches_shapes(monkeypatch):
+    monkeypatch.setattr(sim, 'CHUNK_CELLS', 40 * 50)
+    bank = small_bank()
+    result = sim.simulate(bank, np.zeros(120), sim.SimulationConfig(test_length=5), workers=2, seed=5)
+
+    summary = sim.summarize(result, bank)
+    assert summary['examinees'] == 120
+    assert summary['mean_test_length'] == 5
+    assert set(summary['exposure']['domain_share']) == {'Gf', 'Gc', 'Gwm', 'Gv', 'Gs'}
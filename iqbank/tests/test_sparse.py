@@ -0,0 +1,66 @@
+import json
+
+import numpy as np
+
+from iqbank.binfile import read_binfile
+from iqbank.irt import ItemBank
+from iqbank.sparse import ResponseMatrix
+from iqbank.tests.factories import make_question
+
+
+def matrix():
+    persons = [2, 0, 2, 1, 0, 2]
+    items = [3, 1, 0, 1, 2, 1]
+    scores = [1, 0, 1, 1, 1, 0]
+    return ResponseMatrix.from_triples(persons, items, scores, person_ids=['a', 'b', 'c'], n_items=5)
+
+
+def test_csr_and_csc_views_agree():
+    m = matrix()
+    assert m.shape == (3, 5) and m.n_responses == 6
+    assert m.items.dtype == np.int32 and m.scores.dtype == np.uint8
+    items, scores = m.person(2)
+    assert items.tolist() == [3, 0, 1] and scores.tolist() == [1, 1, 0]
+    assert np.shares_memory(items, m.items)
+
+    persons, scores = m.item(1)
+    assert persons.tolist() == [0, 1, 2] and scores.tolist() == [0, 1, 0]
+    assert m.item(4)[0].tolist() == []
+    assert m.item_counts().tolist() == [1, 3, 1, 1, 0]
+    assert m.person_correct().tolist() == [1, 1, 2]
+
+    sub = m.select(m.items == 1)
+    assert sub.n_persons == 3 and sub.persons == ['a', 'b', 'c'] and sub.n_responses == 3
+
+
+def test_save_and_load_is_memory_mapped(tmp_path):
+    m = matrix()
+    m.save(tmp_path / 'responses.bin')
+    loaded = ResponseMatrix.load(tmp_path / 'responses.bin')
+    assert isinstance(loaded.items, np.memmap) or isinstance(loaded.items.base, np.memmap)
+    assert loaded.persons == ['a', 'b', 'c'] and loaded.n_items == 5
+    assert 'persons' not in read_binfile(tmp_path / 'responses.bin').meta
+    assert loaded.item(1)[0].tolist() == m.item(1)[0].tolist()
+
+
+def test_from_logs_skips_unknown_items(tmp_path):
+    bank = ItemBank.from_questions([make_question(i) for i in range(2)])
+    log = tmp_path / 'responses.jsonl'
+    log.write_text(json.dumps({'sessionId': 's', 'responses': [
+        {'questionId': make_question(1)['id'], 'isCorrect': True},
+        {'questionId': 'missing', 'isCorrect': False}]}) + '\n', encoding='utf-8')
+    m = ResponseMatrix.from_logs([log], bank)
+    assert (m.n_persons, m.n_items, m.skipped) == (1, 2, 1)
+    assert m.person(0)[0].tolist() == [1]
+
+
+def test_from_logs_chunks_match_one_pass(tmp_path):
+    bank = ItemBank.from_questions([make_question(i) for i in range(3)])
+    log = tmp_path / 'responses.jsonl'
+    log.write_text('\n'.join(json.dumps({'sessionId': f's{k % 4}', 'questionId': make_question(k % 3)['id'],
+                                          'isCorrect': k % 2 == 0}) for k in range(11)), encoding='utf-8')
+    whole, chunked = ResponseMatrix.from_logs([log], bank), ResponseMatrix.from_logs([log], bank, chunk=3)
+    assert chunked.items.dtype == np.int32 and chunked.scores.dtype == np.uint8
+    for name in ('ptr', 'items', 'scores'):
+        np.testing.assert_array_equal(getattr(chunked, name), getattr(whole, name))
+    assert chunked.persons == whole.persons == ['s0', 's1', 's2', 's3']
@@ -0,0 +1,49 @@
+import numpy as np
+
+from iqbank import simulate as sim
+from iqbank.irt import ItemBank
+from iqbank.stopping import StoppingRule, rule_grid, sweep
+from iqbank.store import DOMAINS
+from iqbank.tests.factories import make_question
+
+
+def bank(n=100):
+    return ItemBank.from_questions([
+        make_question(i, domain=DOMAINS[i % len(DOMAINS)], difficulty=round(-2 + 4 * i / n, 2),
+                      discrimination=1.8)
+        for i in range(n)])
+
+
+def test_se_rule_respects_min_max_and_precision():
+    rule = StoppingRule(min_length=4, max_length=15, se_threshold=0.6)
+    result = sim.simulate(bank(), np.zeros(500), workers=1, seed=0, stopping=rule)
+
+    assert result.test_length.min() >= 4 and result.test_length.max() <= 15
+    assert result.test_length.min() < 15
+    for row, length in zip(result.administered, result.test_length):
+        assert (row[:length] >= 0).all() and (row[length:] == -1).all()
+
+
+def test_domain_minimums_hold_for_every_session():
+    b = bank()
+    rule = StoppingRule(min_length=1, max_length=20, se_threshold=10.0, domain_minimums=(2, 0, 0, 0, 1))
+    result = sim.simulate(b, np.zeros(300), workers=1, seed=0, stopping=rule)
+
+    early = result.test_length < 20
+    assert early.any()
+    for row, length in zip(result.administered[early], result.test_length[early]):
+        counts = np.bincount(b.domain[row[:length]], minlength=len(DOMAINS))
+        assert counts[0] >= 2 and counts[4] >= 1
+
+
+def test_fixed_rule_matches_fixed_length_and_sweep_trades_length_for_precision():
+    b = bank()
+    fixed = sim.simulate(b, np.zeros(200), workers=1, seed=0, stopping=StoppingRule(max_length=12))
+    assert (fixed.test_length == 12).all()
+
+    rows = sweep(b, rule_grid(se_thresholds=(None, 0.7, 0.45), min_length=3), examinees=1000, workers=1)
+    lengths = [r['mean_length'] for r in rows]
+    assert lengths[0] == 20 and lengths[0] > lengths[2] > lengths[1]
+    assert rows[0]['eap_se'] < rows[2]['eap_se'] < rows[1]['eap_se']
+    assert rows[1]['eap_rmse'] > rows[0]['eap_rmse']
+    assert rows[0]['requests_per_session'] == 42
@@ -0,0 +1,43 @@
+import json
+
+from iqbank.store import BankStore
+from iqbank.tests.factories import make_question
+
+
+def test_append_writes_only_the_journal(bank_path):
+    before = bank_path.read_text(encoding='utf-8')
+    store = BankStore(bank_path)
+
+    ids = store.append([{k: v for k, v in make_question(10).items() if k != 'id'}])
+
+    assert bank_path.read_text(encoding='utf-8') == before
+    assert store.pending() == 1
+    questions = store.load()['questions']
+    assert len(questions) == 4
+    assert questions[-1]['id'] == ids[0]
+
+
+def test_upsert_and_remove_replay_in_order(bank_path):
+    store = BankStore(bank_path)
+    updated = make_question(1, difficulty=0.9)
+
+    store.upsert([updated])
+    store.remove([make_question(0)['id']])
+    store.set_metadata(version='1.1.0')
+
+    bank = store.load()
+    assert bank['version'] == '1.1.0'
+    assert [q['id'] for q in bank['questions']] == [make_question(1)['id'], make_question(2)['id']]
+    assert bank['questions'][0]['difficulty'] == 0.9
+
+
+def test_compact_folds_journal_into_bank(bank_path):
+    store = BankStore(bank_path)
+    store.append([make_question(5)])
+
+    merged = store.compact()
+
+    assert not store.journal_path.exists()
+    on_disk = json.loads(bank_path.read_text(encoding='utf-8'))
+    assert on_disk == merged
+    assert len(on_disk['questions']) == 4
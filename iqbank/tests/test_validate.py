@@ -0,0 +1,53 @@
+from iqbank.validate import ValidationCache, check_item, validate
+from iqbank.tests.factories import make_question
+
+
+def codes(issues):
+    return sorted(issue.code for issue in issues)
+
+
+def test_check_item_flags_key_and_schema_problems():
+    item = dict(make_question(0), correct='57', difficulty=7.4, options=['62', '63', '64', '62'])
+
+    assert codes(check_item(item)) == ['duplicate-options', 'key-not-in-options', 'schema']
+
+
+def test_explanation_pointing_at_another_option_is_flagged():
+    item = dict(make_question(0), options=['9', '10', '11', '12'], correct='10',
+                explanation_ar='الناتج هو ٩')
+
+    assert codes(check_item(item)) == ['explanation-contradicts-key']
+    assert check_item(make_question(1)) == []
+
+
+def test_bank_checks_find_duplicate_ids_and_stems():
+    first, second = make_question(0), make_question(1)
+    second['text_ar'] = first['text_ar'] + '  ؟'
+
+    report = validate([first, second, dict(first)], workers=1)
+
+    assert codes(report.issues) == ['duplicate-id', 'duplicate-stem', 'duplicate-stem']
+
+
+def test_malformed_stems_and_options_are_reported_not_raised():
+    second = make_question(1)
+    second['options'] = second['options'][:-1] + [7]
+    questions = [dict(make_question(0), text_ar=None), second]
+
+    report = validate(questions, workers=1)
+
+    assert codes(report.errors) == ['schema', 'schema']
+
+
+def test_cache_skips_unchanged_items(tmp_path):
+    stems = ['ما عاصمة مصر؟', 'أكمل: 2، 4، 8', 'كم ضلعاً للمثلث؟', 'ما ضد كلمة طويل؟', 'رتب الأيام']
+    questions = [dict(make_question(i), text_ar=stem) for i, stem in enumerate(stems)]
+    cache_path = tmp_path / 'validate.json'
+
+    first = validate(questions, ValidationCache(cache_path), workers=1)
+    questions[2] = dict(questions[2], correct='missing')
+    second = validate(questions, ValidationCache(cache_path), workers=1)
+
+    assert (first.checked, first.cached) == (5, 0)
+    assert (second.checked, second.cached) == (1, 4)
+    assert codes(second.issues) == ['key-not-in-options']
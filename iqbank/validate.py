@@ -0,0 +1,223 @@
+"""Question bank validation and linting.
+
+Per-item checks (schema, key in options, duplicate options, explanation that
+points at a different option than the key, suspicious parameters) run in a
+process pool, and their results are cached by item content hash: revalidating
+a large bank after editing a few items only re-checks those items.
+
+Bank-wide checks (duplicate ids, duplicate and near-duplicate stems) are
+hash/LSH-based and always run, since they depend on every item.
+
+    python -m iqbank.validate [--bank questions.json] [--no-cache] [--workers N]
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .arabic import normalize
+from .dedup import MinHashIndex
+from .schema import schema_errors
+from .store import DEFAULT_BANK_PATH, REPO_ROOT, BankStore, content_hash, write_json_atomic
+
+# Bump when item checks change so cached results are recomputed.
+CHECKS_VERSION = 2
+
+DEFAULT_CACHE_PATH = REPO_ROOT / '.iqbank-cache' / 'validate.json'
+
+# Items per process-pool task.
+CHUNK_SIZE = 500
+
+MIN_DISCRIMINATION = 0.2
+
+ERROR = 'error'
+WARNING = 'warning'
+
+
+@dataclass
+class Issue:
+    item_id: str
+    severity: str
+    code: str
+    message: str
+
+
+def _tokens(text):
+    return set(normalize(text).split())
+
+
+def check_item(item):
+    """Issues that depend only on ``item`` itself (safe to cache by content)."""
+    item_id = item.get('id', '<missing id>')
+    issues = [Issue(item_id, ERROR, 'schema', message) for message in schema_errors(item)]
+    options = item.get('options')
+    correct = item.get('correct')
+    if (not isinstance(options, list) or not all(isinstance(o, str) for o in options)
+            or not isinstance(correct, str)):
+        return issues
+
+    if correct not in options:
+        issues.append(Issue(item_id, ERROR, 'key-not-in-options',
+                            f'correct answer {correct!r} is not among options {options}'))
+    if len(set(options)) != len(options):
+        issues.append(Issue(item_id, ERROR, 'duplicate-options', f'options repeat: {options}'))
+    if not str(item.get('text_ar', '')).strip():
+        issues.append(Issue(item_id, ERROR, 'empty-stem', 'text_ar is empty'))
+
+    explanation = item.get('explanation_ar')
+    if isinstance(explanation, str) and correct in options:
+        mentioned = _tokens(explanation)
+        others = [o for o in options if o != correct and _tokens(o) and _tokens(o) <= mentioned]
+        if others and not _tokens(correct) <= mentioned:
+            issues.append(Issue(item_id, WARNING, 'explanation-contradicts-key',
+                                f'explanation mentions {others} but not the key {correct!r}'))
+
+    discrimination = item.get('discrimination')
+    if isinstance(discrimination, (int, float)) and discrimination < MIN_DISCRIMINATION:
+        issues.append(Issue(item_id, WARNING, 'low-discrimination',
+                            f'discrimination {discrimination} is below {MIN_DISCRIMINATION}'))
+    guessing = item.get('guessing')
+    if isinstance(guessing, (int, float)) and isinstance(options, list) and options:
+        if guessing > 1.0 / len(options) + 0.1:
+            issues.append(Issue(item_id, WARNING, 'high-guessing',
+                                f'guessing {guessing} is well above 1/{len(options)} options'))
+    return issues
+
+
+def _check_chunk(items):
+    return [[asdict(issue) for issue in check_item(item)] for item in items]
+
+
+def check_bank(questions):
+    """Issues that need the whole bank: duplicate ids, duplicate and near-duplicate stems."""
+    issues = []
+    by_id = defaultdict(int)
+    by_stem = defaultdict(list)
+    for q in questions:
+        by_id[q.get('id')] += 1
+        if isinstance(q.get('text_ar'), str):
+            by_stem[normalize(q['text_ar'])].append(q.get('id'))
+
+    for item_id, count in by_id.items():
+        if count > 1:
+            issues.append(Issue(item_id, ERROR, 'duplicate-id', f'id appears {count} times'))
+    exact = set()
+    for stem, ids in by_stem.items():
+        for item_id in ids[1:]:
+            exact.add(item_id)
+            issues.append(Issue(item_id, WARNING, 'duplicate-stem',
+                                f'stem duplicates item {ids[0]}'))
+
+    # Shingling needs a string stem and string options; schema errors cover the rest
+    comparable = [q for q in questions if isinstance(q.get('id'), str) and not schema_errors(q)]
+    for group in MinHashIndex.build(comparable).clusters():
+        for item_id in group[1:]:
+            if item_id not in exact:
+                issues.append(Issue(item_id, WARNING, 'near-duplicate-stem',
+                                    f'stem and options closely match item {group[0]}'))
+    return issues
+
+
+class ValidationCache:
+    """Per-item check results keyed by content hash, stored as JSON."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            if data.get('version') == CHECKS_VERSION:
+                self.entries = data['entries']
+        self.dirty = False
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, issues):
+        self.entries[key] = issues
+        self.dirty = True
+
+    def save(self, keep=None):
+        """Persist, dropping entries not in ``keep`` (the hashes of the current bank)."""
+        if keep is not None and set(self.entries) - keep:
+            self.entries = {k: v for k, v in self.entries.items() if k in keep}
+            self.dirty = True
+        if self.dirty:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.path, {'version': CHECKS_VERSION, 'entries': self.entries})
+            self.dirty = False
+
+
+@dataclass
+class ValidationReport:
+    issues: list
+    checked: int  # items re-checked this run
+    cached: int  # items served from the cache
+
+    @property
+    def errors(self):
+        return [i for i in self.issues if i.severity == ERROR]
+
+    @property
+    def warnings(self):
+        return [i for i in self.issues if i.severity == WARNING]
+
+
+def validate(questions, cache=None, workers=None):
+    questions = list(questions)
+    hashes = [content_hash(q) for q in questions]
+    results = [cache.get(h) if cache else None for h in hashes]
+    todo = [i for i, r in enumerate(results) if r is None]
+
+    chunks = [todo[i:i + CHUNK_SIZE] for i in range(0, len(todo), CHUNK_SIZE)]
+    batches = [[questions[i] for i in chunk] for chunk in chunks]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) <= 1:
+        checked = [_check_chunk(batch) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            checked = list(pool.map(_check_chunk, batches))
+
+    for chunk, chunk_results in zip(chunks, checked):
+        for i, issues in zip(chunk, chunk_results):
+            results[i] = issues
+            if cache:
+                cache.put(hashes[i], issues)
+    if cache:
+        cache.save(keep=set(hashes))
+
+    issues = [Issue(**issue) for item_issues in results for issue in item_issues]
+    issues.extend(check_bank(questions))
+    return ValidationReport(issues=issues, checked=len(todo), cached=len(questions) - len(todo))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Validate and lint the question bank')
+    parser.add_argument('--bank', default=DEFAULT_BANK_PATH)
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, type=Path)
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--json', action='store_true', help='Print issues as JSON')
+    args = parser.parse_args(argv)
+
+    questions = BankStore(args.bank).load()['questions']
+    cache = None if args.no_cache else ValidationCache(args.cache)
+    report = validate(questions, cache, args.workers)
+
+    if args.json:
+        print(json.dumps([asdict(i) for i in report.issues], ensure_ascii=False, indent=2))
+    else:
+        for issue in report.issues:
+            print(f"{issue.severity.upper():7s} {issue.code:28s} {issue.item_id}  {issue.message}")
+        print(f"\n{len(questions)} items: {report.checked} checked, {report.cached} from cache; "
+              f"{len(report.errors)} errors, {len(report.warnings)} warnings")
+    return 1 if report.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+
+function question(k: number, text = `سؤال ${k}`) {
+  return {
+    id: `00000000-0000-4000-8000-00000000000${k}`,
+    domain: 'Gf',
+    difficulty: 0,
+    discrimination: 1,
+    guessing: 0.25,
+    text_ar: text,
+    options: ['1', '2', '3', '4'],
+    correct: '1',
+  };
+}
+
+describe('refreshQuestionBank', () => {
+  let dir: string;
+  let bankFile: string;
+  let publishes = 0;
+
+  function publish(version: string, questions: object[]) {
+    fs.writeFileSync(bankFile, JSON.stringify({ version, lastUpdated: '2025-01-01T00:00:00Z', questions }));
+    // Distinct mtimes however fast the test runs: refresh only looks again when the mtime moves
+    const mtime = new Date(Date.UTC(2025, 0, 1, 0, 0, ++publishes));
+    fs.utimesSync(bankFile, mtime, mtime);
+  }
+
+  function writeChange(previousVersion: string, version: string, change: object) {
+    const changes = path.join(dir, 'questions.changes');
+    fs.mkdirSync(changes, { recursive: true });
+    fs.writeFileSync(
+      path.join(changes, `${previousVersion}..${version}.json`),
+      JSON.stringify({ version, previousVersion, lastUpdated: '2025-01-02T00:00:00Z',
+                       added: [], removed: [], updated: [], items: {}, ...change })
+    );
+  }
+
+  beforeEach(() => {
+    dir = fs.mkdtempSync(path.join(os.tmpdir(), 'question-bank-'));
+    bankFile = path.join(dir, 'questions.json');
+    process.env.QUESTION_BANK_PATH = bankFile;
+    jest.resetModules();
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+    delete process.env.QUESTION_BANK_PATH;
+    fs.rmSync(dir, { recursive: true, force: true });
+  });
+
+  it('follows a chain of change manifests without rereading the bank', () => {
+    const bank = require('./index');
+    publish('1.0.0', [question(0), question(1)]);
+    bank.loadQuestionBank();
+
+    writeChange('1.0.0', '1.1.0', { added: [question(2).id], items: { [question(2).id]: question(2) } });
+    writeChange('1.1.0', '1.2.0', {
+      removed: [question(0).id],
+      updated: [question(1).id],
+      items: { [question(1).id]: question(1, 'سؤال معدل') },
+    });
+    publish('1.2.0', [question(1, 'سؤال معدل'), question(2)]);
+    // The module itself, not this file's import wrapper, so index.ts sees the spy
+    const reads = jest.spyOn(require('fs') as typeof fs, 'readFileSync');
+
+    const refreshed = bank.refreshQuestionBank();
+
+    expect(refreshed.version).toBe('1.2.0');
+    expect(refreshed.questions).toEqual([question(1, 'سؤال معدل'), question(2)]);
+    expect(reads.mock.calls.some(([file]) => file === bankFile)).toBe(false);
+  });
+
+  it('reloads the whole bank when the chain is broken', () => {
+    const bank = require('./index');
+    publish('1.0.0', [question(0), question(1)]);
+    bank.loadQuestionBank();
+
+    writeChange('1.0.0', '1.1.0', { added: [question(2).id], items: { [question(2).id]: question(2) } });
+    // No 1.1.0..1.2.0 manifest
+    publish('1.2.0', [question(1, 'سؤال معدل'), question(2)]);
+
+    const refreshed = bank.refreshQuestionBank();
+
+    expect(refreshed.version).toBe('1.2.0');
+    expect(refreshed.questions).toEqual([question(1, 'سؤال معدل'), question(2)]);
+  });
+
+  it('keeps the loaded bank while the file is unchanged', () => {
+    const bank = require('./index');
+    publish('1.0.0', [question(0)]);
+    const loaded = bank.loadQuestionBank();
+
+    expect(bank.refreshQuestionBank()).toBe(loaded);
+  });
+});
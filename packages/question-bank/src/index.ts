@@ -1,23 +1,119 @@
 import * as fs from 'fs';
 import * as path from 'path';
-import { QuestionBankSchema, Question, Domain } from './types';
+import { QuestionBankSchema, QuestionSchema, Question, Domain, QuestionBank } from './types';
+import { infoTableFor, mostInformativeRows } from './infotable';
+
+/**
+ * Change manifest written by `python -m iqbank.publish` next to the bank as
+ * `<stem>.changes/<previousVersion>..<version>.json`.
+ */
+export interface ChangeManifest {
+  version: string;
+  previousVersion: string;
+  lastUpdated: string;
+  added: string[];
+  removed: string[];
+  updated: string[];
+  items: Record<string, unknown>;
+}
 
 let cachedQuestionBank: any = null;
+let cachedMtimeMs = 0;
+
+function bankPath(): string {
+  // The bank `python -m iqbank.publish` writes, not the copy made into dist/ at build time,
+  // so a publish reaches a running backend; resolves to the same file from src/ and dist/.
+  return process.env.QUESTION_BANK_PATH ?? path.resolve(__dirname, '..', 'src', 'questions.json');
+}
+
+function readBank(questionsPath: string): QuestionBank {
+  const rawData = fs.readFileSync(questionsPath, 'utf-8');
+  const parsed = JSON.parse(rawData);
+
+  // Validate against schema
+  return QuestionBankSchema.parse(parsed);
+}
 
 export function loadQuestionBank() {
   if (cachedQuestionBank) {
     return cachedQuestionBank;
   }
 
-  const questionsPath = path.join(__dirname, 'questions.json');
-  const rawData = fs.readFileSync(questionsPath, 'utf-8');
-  const parsed = JSON.parse(rawData);
+  const questionsPath = bankPath();
+  cachedMtimeMs = fs.statSync(questionsPath).mtimeMs;
+  cachedQuestionBank = readBank(questionsPath);
 
-  // Validate against schema
-  const validated = QuestionBankSchema.parse(parsed);
-  cachedQuestionBank = validated;
+  return cachedQuestionBank;
+}
+
+function nextChange(questionsPath: string, version: string): ChangeManifest | null {
+  const dir = path.join(
+    path.dirname(questionsPath),
+    `${path.basename(questionsPath, '.json')}.changes`
+  );
+  const name = fs.existsSync(dir)
+    ? fs.readdirSync(dir).find((file) => file.startsWith(`${version}..`))
+    : undefined;
+  return name ? (JSON.parse(fs.readFileSync(path.join(dir, name), 'utf-8')) as ChangeManifest) : null;
+}
+
+function applyChange(bank: QuestionBank, change: ChangeManifest): QuestionBank {
+  const removed = new Set(change.removed);
+  const questions = bank.questions
+    .filter((q) => !removed.has(q.id))
+    .map((q) => (q.id in change.items ? QuestionSchema.parse(change.items[q.id]) : q));
+  change.added.forEach((id) => questions.push(QuestionSchema.parse(change.items[id])));
+  return { version: change.version, lastUpdated: change.lastUpdated, questions };
+}
 
-  return validated;
+function readBankVersion(questionsPath: string): string {
+  // "version" is the first key iqbank writes; avoid parsing the whole bank for it.
+  const fd = fs.openSync(questionsPath, 'r');
+  try {
+    const head = Buffer.alloc(256);
+    const read = fs.readSync(fd, head, 0, head.length, 0);
+    const match = /"version"\s*:\s*"([^"]+)"/.exec(head.toString('utf-8', 0, read));
+    return match ? match[1] : readBank(questionsPath).version;
+  } finally {
+    fs.closeSync(fd);
+  }
+}
+
+/**
+ * Pick up a newly published bank version without a restart. Follows the
+ * change manifests from the loaded version (validating only changed items)
+ * and falls back to a full reload when the chain is broken. Costs one
+ * stat() when nothing changed.
+ */
+export function refreshQuestionBank(): QuestionBank {
+  if (!cachedQuestionBank) {
+    return loadQuestionBank();
+  }
+  const questionsPath = bankPath();
+  const mtimeMs = fs.statSync(questionsPath).mtimeMs;
+  if (mtimeMs === cachedMtimeMs) {
+    return cachedQuestionBank;
+  }
+
+  const target = readBankVersion(questionsPath);
+  let bank: QuestionBank = cachedQuestionBank;
+  if (bank.version === target) {
+    // Rewritten without a new version (e.g. a plain compact): nothing to follow.
+    bank = readBank(questionsPath);
+  }
+  const seen = new Set<string>();
+  while (bank.version !== target) {
+    seen.add(bank.version);
+    const change = nextChange(questionsPath, bank.version);
+    if (!change || seen.has(change.version)) {
+      bank = readBank(questionsPath);
+      break;
+    }
+    bank = applyChange(bank, change);
+  }
+  cachedQuestionBank = bank;
+  cachedMtimeMs = mtimeMs;
+  return bank;
 }
 
 export function getQuestionsByDomain(domain: Domain): Question[] {
@@ -30,4 +126,24 @@ export function getQuestionById(id: string): Question | undefined {
   return bank.questions.find((q: Question) => q.id === id);
 }
 
+/**
+ * The `count` most informative questions at `theta` that are not in
+ * `usedIds`, read from the information table built with the bank, or null
+ * when no table matches the loaded bank version (the caller then computes
+ * information itself).
+ */
+export function getMostInformative(theta: number, usedIds: string[], count: number): Question[] | null {
+  const bank: QuestionBank = loadQuestionBank();
+  const table = infoTableFor(bankPath(), bank.version);
+  if (!table || table.ids.length !== bank.questions.length) {
+    return null;
+  }
+  const used = new Set(usedIds);
+  const rows = mostInformativeRows(table, theta, count, (row) => used.has(table.ids[row]));
+  const questions = rows.map((row) => bank.questions[row]);
+  // Same version, same order; anything else means the table does not describe this bank
+  return rows.every((row, k) => questions[k]?.id === table.ids[row]) ? questions : null;
+}
+
+export { getInterpretation, getAnswerFeedback, profileKey } from './interpretations';
 export { Question, Domain, QuestionBank } from './types';
@@ -0,0 +1,140 @@
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+
+const IDS = [
+  '00000000-0000-4000-8000-000000000000',
+  '00000000-0000-4000-8000-000000000001',
+  '00000000-0000-4000-8000-000000000002',
+];
+
+/**
+ * Write an information table the way iqbank/binfile.py does: magic, u32
+ * header length, JSON header, then each array on a 64-byte boundary.
+ */
+function writeInfoTable(file: string, version: string, order: number[][], model = '2pl') {
+  const width = 36;
+  const ids = Buffer.alloc(IDS.length * width);
+  IDS.forEach((id, k) => ids.write(id, k * width, 'utf-8'));
+  const arrays: Record<string, { dtype: string; shape: number[]; data: Buffer }> = {
+    grid: { dtype: '<f8', shape: [3], data: Buffer.from(new Float64Array([-1, 0, 1]).buffer) },
+    order: { dtype: '<i4', shape: [3, IDS.length], data: Buffer.from(new Int32Array(order.flat()).buffer) },
+    ids: { dtype: `|S${width}`, shape: [IDS.length], data: ids },
+  };
+
+  const magic = Buffer.from('IQBANK\x00\x01', 'latin1');
+  const align = (n: number) => Math.ceil(n / 64) * 64;
+  let header = Buffer.alloc(0);
+  let layout: Record<string, { dtype: string; shape: number[]; offset: number }> = {};
+  let end = 0;
+  for (let length = -1; header.length !== length; ) {
+    length = header.length;
+    end = align(magic.length + 4 + length);
+    layout = {};
+    for (const [name, { dtype, shape, data }] of Object.entries(arrays)) {
+      layout[name] = { dtype, shape, offset: end };
+      end = align(end + data.length);
+    }
+    header = Buffer.from(
+      JSON.stringify({ kind: 'infotable', meta: { version, model }, arrays: layout }),
+      'utf-8'
+    );
+  }
+
+  const out = Buffer.alloc(end);
+  magic.copy(out, 0);
+  out.writeUInt32LE(header.length, magic.length);
+  header.copy(out, magic.length + 4);
+  Object.entries(arrays).forEach(([name, { data }]) => data.copy(out, layout[name].offset));
+  fs.writeFileSync(file, out);
+}
+
+function writeBank(file: string, version: string) {
+  const questions = IDS.map((id, k) => ({
+    id,
+    domain: 'Gf',
+    difficulty: k - 1,
+    discrimination: 1,
+    guessing: 0.25,
+    text_ar: `سؤال ${k}`,
+    options: ['1', '2', '3', '4'],
+    correct: '1',
+  }));
+  fs.writeFileSync(file, JSON.stringify({ version, lastUpdated: '2025-01-01T00:00:00Z', questions }));
+}
+
+// At θ = -1 the easiest item is most informative, at θ = 1 the hardest
+const ORDER = [
+  [0, 1, 2],
+  [1, 0, 2],
+  [2, 1, 0],
+];
+
+describe('Information table', () => {
+  let dir: string;
+
+  beforeEach(() => {
+    dir = fs.mkdtempSync(path.join(os.tmpdir(), 'infotable-'));
+    process.env.QUESTION_BANK_PATH = path.join(dir, 'questions.json');
+    jest.resetModules();
+  });
+
+  afterEach(() => {
+    delete process.env.QUESTION_BANK_PATH;
+    fs.rmSync(dir, { recursive: true, force: true });
+  });
+
+  it('reads the grid, order and ids', () => {
+    const { readInfoTable } = require('./infotable');
+    writeInfoTable(path.join(dir, 'questions.info.bin'), '1.0.0', ORDER);
+
+    const table = readInfoTable(path.join(dir, 'questions.info.bin'));
+
+    expect(table.version).toBe('1.0.0');
+    expect(Array.from(table.grid)).toEqual([-1, 0, 1]);
+    expect(Array.from(table.order)).toEqual(ORDER.flat());
+    expect(table.ids).toEqual(IDS);
+  });
+
+  it('rejects a table built for another model', () => {
+    const { readInfoTable } = require('./infotable');
+    writeInfoTable(path.join(dir, 'questions.info.bin'), '1.0.0', ORDER, '3pl');
+
+    expect(readInfoTable(path.join(dir, 'questions.info.bin'))).toBeNull();
+  });
+
+  it('walks the nearest grid point and skips used rows', () => {
+    const { readInfoTable, mostInformativeRows } = require('./infotable');
+    writeInfoTable(path.join(dir, 'questions.info.bin'), '1.0.0', ORDER);
+    const table = readInfoTable(path.join(dir, 'questions.info.bin'));
+
+    expect(mostInformativeRows(table, 0.8, 2, () => false)).toEqual([2, 1]);
+    expect(mostInformativeRows(table, -0.2, 2, (row: number) => row === 1)).toEqual([0, 2]);
+    expect(mostInformativeRows(table, -5, 5, () => false)).toEqual([0, 1, 2]);
+  });
+
+  it('serves the most informative unused questions for the loaded bank', () => {
+    writeBank(path.join(dir, 'questions.json'), '1.0.0');
+    writeInfoTable(path.join(dir, 'questions.info.bin'), '1.0.0', ORDER);
+    const { getMostInformative } = require('./index');
+
+    const questions = getMostInformative(1, [IDS[2]], 2);
+
+    expect(questions.map((q: { id: string }) => q.id)).toEqual([IDS[1], IDS[0]]);
+  });
+
+  it('returns null when the table was built for another bank version', () => {
+    writeBank(path.join(dir, 'questions.json'), '1.1.0');
+    writeInfoTable(path.join(dir, 'questions.info.bin'), '1.0.0', ORDER);
+    const { getMostInformative } = require('./index');
+
+    expect(getMostInformative(1, [], 2)).toBeNull();
+  });
+
+  it('returns null when no table was built', () => {
+    writeBank(path.join(dir, 'questions.json'), '1.0.0');
+    const { getMostInformative } = require('./index');
+
+    expect(getMostInformative(1, [], 2)).toBeNull();
+  });
+});
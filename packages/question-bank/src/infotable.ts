@@ -0,0 +1,123 @@
+import * as fs from 'fs';
+import * as path from 'path';
+
+/**
+ * Reader for the θ-grid information table `python -m iqbank.build` writes
+ * next to the bank as `<stem>.info.bin` (iqbank/infotable.py, container
+ * format in iqbank/binfile.py). Only the grid, the per-grid-point item order
+ * and the ids are read; the information matrix itself stays on disk.
+ */
+export interface InfoTable {
+  version: string;
+  grid: Float64Array;
+  /** grid × items bank rows, most informative first at each grid point */
+  order: Int32Array;
+  ids: string[];
+}
+
+interface ArrayLayout {
+  dtype: string;
+  shape: number[];
+  offset: number;
+}
+
+const MAGIC = Buffer.from('IQBANK\x00\x01', 'latin1');
+const KIND = 'infotable';
+
+function readRange(fd: number, offset: number, length: number): Buffer {
+  // Buffer.alloc is never pooled, so typed-array views over it start aligned
+  const buffer = Buffer.alloc(length);
+  fs.readSync(fd, buffer, 0, length, offset);
+  return buffer;
+}
+
+function byteLength(layout: ArrayLayout, itemSize: number): number {
+  return layout.shape.reduce((n, dim) => n * dim, 1) * itemSize;
+}
+
+export function readInfoTable(filePath: string): InfoTable | null {
+  const fd = fs.openSync(filePath, 'r');
+  try {
+    const prefix = readRange(fd, 0, MAGIC.length + 4);
+    if (!prefix.subarray(0, MAGIC.length).equals(MAGIC)) {
+      return null;
+    }
+    const header = JSON.parse(
+      readRange(fd, MAGIC.length + 4, prefix.readUInt32LE(MAGIC.length)).toString('utf-8')
+    );
+    const arrays: Record<string, ArrayLayout> = header.arrays;
+    // The engine scores with the 2-PL model; a 3-PL table orders items differently
+    if (header.kind !== KIND || header.meta.model !== '2pl' ||
+        arrays.grid?.dtype !== '<f8' || arrays.order?.dtype !== '<i4' || !/^\|S\d+$/.test(arrays.ids?.dtype)) {
+      return null;
+    }
+
+    const grid = readRange(fd, arrays.grid.offset, byteLength(arrays.grid, 8));
+    const order = readRange(fd, arrays.order.offset, byteLength(arrays.order, 4));
+    const width = Number(arrays.ids.dtype.slice(2));
+    const idBytes = readRange(fd, arrays.ids.offset, byteLength(arrays.ids, width));
+    const ids: string[] = [];
+    for (let start = 0; start < idBytes.length; start += width) {
+      // numpy pads fixed-width bytes with NULs
+      const slot = idBytes.subarray(start, start + width);
+      const end = slot.indexOf(0);
+      ids.push(slot.toString('utf-8', 0, end === -1 ? width : end));
+    }
+    return {
+      version: header.meta.version,
+      grid: new Float64Array(grid.buffer, grid.byteOffset, grid.length / 8),
+      order: new Int32Array(order.buffer, order.byteOffset, order.length / 4),
+      ids,
+    };
+  } finally {
+    fs.closeSync(fd);
+  }
+}
+
+let cached: { file: string; version: string; mtimeMs: number; table: InfoTable | null } | undefined;
+
+/**
+ * The information table built for `version` of the bank at `bankFile`, or
+ * null when there is none or it was built for another version (e.g. a
+ * publish since the last `python -m iqbank.build`). Costs one stat() when
+ * cached.
+ */
+export function infoTableFor(bankFile: string, version: string): InfoTable | null {
+  const file = path.join(path.dirname(bankFile), `${path.basename(bankFile, '.json')}.info.bin`);
+  const mtimeMs = fs.existsSync(file) ? fs.statSync(file).mtimeMs : 0;
+  if (!cached || cached.file !== file || cached.version !== version || cached.mtimeMs !== mtimeMs) {
+    let table: InfoTable | null = null;
+    try {
+      table = mtimeMs ? readInfoTable(file) : null;
+    } catch (error) {
+      // A missing or unreadable table only costs the fallback to computing information
+      console.error('Failed to read information table', error);
+    }
+    cached = { file, version, mtimeMs, table: table && table.version === version ? table : null };
+  }
+  return cached.table;
+}
+
+/**
+ * Bank rows of the `count` most informative items at the grid point nearest
+ * `theta` for which `skip` is false: a walk down the precomputed order
+ * instead of computing and sorting information for the whole bank.
+ */
+export function mostInformativeRows(
+  table: InfoTable,
+  theta: number,
+  count: number,
+  skip: (row: number) => boolean
+): number[] {
+  const points = table.grid.length;
+  const step = points > 1 ? (table.grid[points - 1] - table.grid[0]) / (points - 1) : 0;
+  const index = step ? Math.min(points - 1, Math.max(0, Math.round((theta - table.grid[0]) / step))) : 0;
+  const items = table.ids.length;
+  const rows: number[] = [];
+  for (let k = index * items; k < (index + 1) * items && rows.length < count; k++) {
+    if (!skip(table.order[k])) {
+      rows.push(table.order[k]);
+    }
+  }
+  return rows;
+}
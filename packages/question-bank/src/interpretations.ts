@@ -0,0 +1,56 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { Domain } from './types';
+
+/**
+ * Pregenerated result interpretations and answer feedback, written by
+ * `python -m iqbank.interpret`. Keys must match iqbank/interpret.py.
+ */
+interface InterpretationStore {
+  interpretations: Record<string, string>;
+  feedback: Record<string, string>;
+}
+
+const DOMAINS: Domain[] = ['Gf', 'Gc', 'Gwm', 'Gv', 'Gs'];
+const OVERALL_BANDS = [90, 110, 120, 130];
+const DOMAIN_LEVELS = [90, 110];
+const UNTESTED = '-';
+
+let cachedStore: InterpretationStore | null | undefined;
+
+function loadStore(): InterpretationStore | null {
+  if (cachedStore !== undefined) {
+    return cachedStore;
+  }
+  const storePath = path.join(__dirname, 'interpretations.json');
+  cachedStore = fs.existsSync(storePath)
+    ? (JSON.parse(fs.readFileSync(storePath, 'utf-8')) as InterpretationStore)
+    : null;
+  return cachedStore;
+}
+
+function level(score: number, edges: number[]): number {
+  return edges.filter((edge) => score >= edge).length;
+}
+
+/**
+ * Lookup key for a result; domains the session had no items in are keyed as untested
+ */
+export function profileKey(totalScore: number, domainScores: Partial<Record<Domain, number>>): string {
+  const levels = DOMAINS.map((d) => {
+    const score = domainScores[d];
+    return score === undefined ? UNTESTED : String(level(score, DOMAIN_LEVELS));
+  }).join('');
+  return `${level(totalScore, OVERALL_BANDS)}:${levels}`;
+}
+
+export function getInterpretation(
+  totalScore: number,
+  domainScores: Partial<Record<Domain, number>>
+): string | undefined {
+  return loadStore()?.interpretations[profileKey(totalScore, domainScores)];
+}
+
+export function getAnswerFeedback(questionId: string, optionIndex: number): string | undefined {
+  return loadStore()?.feedback[`${questionId}:${optionIndex}`];
+}
@@ -4,7 +4,7 @@ import { z } from 'zod';
 const QuestionSchema = z.object({
     id: z.string().uuid(),
     domain: z.enum(['Gf', 'Gc', 'Gwm', 'Gv', 'Gs']),
-    difficulty: z.number().min(0).max(1),
+    difficulty: z.number().min(-6).max(6),
     discrimination: z.number().min(0),
     guessing: z.number().min(0).max(1),
     text_ar: z.string().min(1),
@@ -6,7 +6,8 @@ export type Domain = z.infer<typeof DomainType>;
 export const QuestionSchema = z.object({
   id: z.string().uuid(),
   domain: DomainType,
-  difficulty: z.number().min(0).max(1),
+  // IRT b on the logit scale (iqbank.schema.PARAM_RANGES)
+  difficulty: z.number().min(-6).max(6),
   discrimination: z.number().min(0).max(3),
   guessing: z.number().min(0).max(1).default(0.25),
   text_ar: z.string(),
@@ -14,6 +15,8 @@ export const QuestionSchema = z.object({
   correct: z.string(),
   explanation_ar: z.string().optional(),
   culturalContext: z.string().optional(),
+  // Sympson-Hetter exposure control: probability of administering the item once selected
+  exposureControl: z.number().min(0).max(1).optional(),
 });
 
 export type Question = z.infer<typeof QuestionSchema>;
@@ -10,22 +10,21 @@ const anthropic = new Anthropic({
  */
 export async function generateResultInterpretation(
   overallScore: number,
-  domainScores: Record<Domain, number>,
-  responses: Record<string, boolean>
+  domainScores: Partial<Record<Domain, number>>
 ): Promise<string> {
+  // Kept in step with iqbank/interpret.py, which pregenerates this prompt per score profile
+  const score = (domain: Domain) => domainScores[domain] ?? 'not tested';
   const prompt = `
 You are an expert psychometrician specializing in Arabic IQ testing.
 Provide a detailed interpretation of the following test results in Arabic.
 
 Overall Score: ${overallScore}
 Domain Scores:
-- Fluid Reasoning (Gf): ${domainScores.Gf}
-- Crystallized Intelligence (Gc): ${domainScores.Gc}
-- Working Memory (Gwm): ${domainScores.Gwm}
-- Visual Processing (Gv): ${domainScores.Gv}
-- Processing Speed (Gs): ${domainScores.Gs}
-
-Correct Answers: ${Object.values(responses).filter((v) => v).length}/${Object.keys(responses).length}
+- Fluid Reasoning (Gf): ${score('Gf')}
+- Crystallized Intelligence (Gc): ${score('Gc')}
+- Working Memory (Gwm): ${score('Gwm')}
+- Visual Processing (Gv): ${score('Gv')}
+- Processing Speed (Gs): ${score('Gs')}
 
 Please provide:
 1. Overall assessment of cognitive abilities
@@ -0,0 +1,54 @@
+import { Question } from '@iq-test/question-bank';
+import { AdaptiveScoringEngine } from './index';
+
+function rankedQuestions(exposureControl: (rank: number) => number | undefined): Question[] {
+  return Array.from({ length: AdaptiveScoringEngine.CANDIDATES }, (_, rank): Question => ({
+    id: `q${rank}`,
+    domain: 'Gf',
+    difficulty: 0,
+    discrimination: 1,
+    guessing: 0.25,
+    text_ar: `سؤال ${rank}`,
+    options: ['1', '2', '3', '4'],
+    correct: '1',
+    exposureControl: exposureControl(rank),
+  }));
+}
+
+describe('AdaptiveScoringEngine exposure control', () => {
+  const engine = new AdaptiveScoringEngine();
+  const POOL = 15;
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it('draws only from the first K ranked candidates', async () => {
+    const ranked = rankedQuestions(() => undefined);
+    const drawn = new Set<number>();
+    for (let i = 0; i < 500; i++) {
+      const question = await engine.getNextQuestion(ranked, ['used'], 0, ranked);
+      drawn.add(ranked.indexOf(question!));
+    }
+
+    expect(Math.max(...drawn)).toBeLessThan(POOL);
+    expect(drawn.size).toBeGreaterThan(1);
+  });
+
+  it('reaches the last of the K candidates', async () => {
+    jest.spyOn(Math, 'random').mockReturnValue(0.999);
+    const ranked = rankedQuestions(() => undefined);
+
+    expect(await engine.getNextQuestion(ranked, ['used'], 0, ranked)).toBe(ranked[POOL - 1]);
+  });
+
+  it('replaces a set-aside candidate with the next ranked one', async () => {
+    // Every one of the top K is set aside, one at a time, so at most K more come into reach
+    const ranked = rankedQuestions((rank) => (rank < POOL ? 0 : 1));
+    for (let i = 0; i < 200; i++) {
+      const rank = ranked.indexOf((await engine.getNextQuestion(ranked, ['used'], 0, ranked))!);
+      expect(rank).toBeGreaterThanOrEqual(POOL);
+      expect(rank).toBeLessThan(2 * POOL);
+    }
+  });
+});
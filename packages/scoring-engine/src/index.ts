@@ -1,16 +1,18 @@
-import { Question, Domain } from '@iq-test/question-bank';
+import { Question } from '@iq-test/question-bank';
 import {
   calculateProbability,
   calculateItemInformation,
   selectNextQuestion,
   updateTheta as irtUpdateTheta,
 } from './irt';
+import { scoreResponses } from './norms';
 
 export interface ScoringEngine {
   getNextQuestion(
     questions: Question[],
     usedQuestionIds: string[],
-    currentTheta: number
+    currentTheta: number,
+    ranked?: Question[] | null
   ): Promise<Question | null>;
   updateTheta(
     currentTheta: number,
@@ -19,7 +21,7 @@ export interface ScoringEngine {
     discrimination: number
   ): number;
   calculateScores(
-    responses: Record<string, boolean>,
+    responses: { questionId: string; isCorrect: boolean }[],
     questions: Question[]
   ): Record<string, number>;
 }
@@ -27,10 +29,20 @@ export interface ScoringEngine {
 export class AdaptiveScoringEngine implements ScoringEngine {
   private learningRate = 0.5;
 
+  /** Candidates the exposure-controlled draw may reach; `ranked` lists should be this long */
+  static readonly CANDIDATES = 45;
+
+  /**
+   * `ranked`, when given, holds the unused questions most informative at
+   * `currentTheta`, best first (getMostInformative in @iq-test/question-bank
+   * reads them from the precomputed information table); otherwise
+   * information is computed and sorted for every available question.
+   */
   async getNextQuestion(
     questions: Question[],
     usedQuestionIds: string[],
-    currentTheta: number
+    currentTheta: number,
+    ranked?: Question[] | null
   ): Promise<Question | null> {
     const usedSet = new Set(usedQuestionIds);
     const availableQuestions = questions.filter(
@@ -49,11 +61,14 @@ export class AdaptiveScoringEngine implements ScoringEngine {
       );
 
       if (suitableQuestions.length > 0) {
-        const randomIndex = Math.floor(Math.random() * suitableQuestions.length);
-        return suitableQuestions[randomIndex];
+        return this.drawWithExposureControl(suitableQuestions, suitableQuestions.length);
       }
     }
 
+    if (ranked && ranked.length > 0) {
+      return this.drawWithExposureControl(ranked, 15);
+    }
+
     // Calculate information for all available questions
     const questionsWithInfo = availableQuestions.map((question) => ({
       question,
@@ -68,12 +83,29 @@ export class AdaptiveScoringEngine implements ScoringEngine {
 
     // Select from top questions to add variety
     // Increased pool size to 15 for subsequent questions to ensure variety
-    const topN = Math.min(15, questionsWithInfo.length);
-    const topQuestions = questionsWithInfo.slice(0, topN);
+    return this.drawWithExposureControl(
+      questionsWithInfo.map((q) => q.question),
+      15
+    );
+  }
 
-    // Randomly select one from the top questions
-    const randomIndex = Math.floor(Math.random() * topQuestions.length);
-    return topQuestions[randomIndex].question;
+  /**
+   * Draw uniformly from the first `poolSize` candidates (Sympson-Hetter).
+   * A drawn question is administered with probability `exposureControl`
+   * (default 1); otherwise it is set aside and the draw is repeated over the
+   * remaining candidates. The last remaining candidate is always accepted.
+   */
+  private drawWithExposureControl(candidates: Question[], poolSize: number): Question {
+    const remaining = [...candidates];
+    for (;;) {
+      const pool = Math.min(poolSize, remaining.length);
+      const index = Math.floor(Math.random() * pool);
+      const question = remaining[index];
+      if (remaining.length === 1 || Math.random() < (question.exposureControl ?? 1)) {
+        return question;
+      }
+      remaining.splice(index, 1);
+    }
   }
 
   updateTheta(
@@ -94,27 +126,25 @@ export class AdaptiveScoringEngine implements ScoringEngine {
   }
 
   calculateScores(
-    responses: Record<string, boolean>,
+    responses: { questionId: string; isCorrect: boolean }[],
     questions: Question[]
   ): Record<string, number> {
-    const domains: Domain[] = ['Gf', 'Gc', 'Gwm', 'Gv', 'Gs'];
-    const scores: Record<string, number> = {};
-
-    domains.forEach((domain) => {
-      const domainQuestions = questions.filter((q) => q.domain === domain);
-      const domainResponses = domainQuestions.map(
-        (q) => responses[q.id] || false
-      );
-      const correctCount = domainResponses.filter((r) => r).length;
-      const percentage =
-        domainQuestions.length > 0
-          ? (correctCount / domainQuestions.length) * 100
-          : 0;
-
-      // Convert to IQ scale (mean 100, SD 15)
-      scores[domain] = 100 + (percentage - 50) * 3;
+    // θ is replayed in answer order, as the results route does, then converted through the norm tables
+    const byId = new Map(questions.map((q) => [q.id, q]));
+    const answered = responses.flatMap((r) => {
+      const q = byId.get(r.questionId);
+      return q
+        ? [{ domain: q.domain, isCorrect: r.isCorrect, difficulty: q.difficulty, discrimination: q.discrimination }]
+        : [];
     });
+    const { domains } = scoreResponses(answered);
 
+    const scores: Record<string, number> = {};
+    Object.entries(domains).forEach(([domain, scale]) => {
+      if (scale) {
+        scores[domain] = scale.score;
+      }
+    });
     return scores;
   }
 }
@@ -122,3 +152,17 @@ export class AdaptiveScoringEngine implements ScoringEngine {
 export const scoringEngine = new AdaptiveScoringEngine();
 
 export { calculateProbability, calculateItemInformation } from './irt';
+export {
+  StoppingRule,
+  AdministeredItem,
+  FIXED_LENGTH_RULE,
+  shouldStop,
+  standardError,
+} from './stopping';
+export {
+  ScoredResponse,
+  ScaleScore,
+  convertTheta,
+  replayTheta,
+  scoreResponses,
+} from './norms';
@@ -0,0 +1,78 @@
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+
+// θ grid -1, 0, 1 for `overall` and Gf only
+const NORMS = {
+  version: 1,
+  source: 'test',
+  thetaMin: -1,
+  thetaStep: 1,
+  sessions: { overall: 1000, Gf: 1000 },
+  scales: {
+    overall: { iq: [80, 100, 130], percentile: [10, 50, 95] },
+    Gf: { iq: [70, 100, 120], percentile: [2, 50, 90] },
+  },
+};
+
+describe('Norm tables', () => {
+  let dir: string;
+
+  beforeEach(() => {
+    dir = fs.mkdtempSync(path.join(os.tmpdir(), 'norms-'));
+    process.env.NORMS_PATH = path.join(dir, 'norms.json');
+    jest.resetModules();
+  });
+
+  afterEach(() => {
+    delete process.env.NORMS_PATH;
+    fs.rmSync(dir, { recursive: true, force: true });
+  });
+
+  describe('convertTheta', () => {
+    it('interpolates between grid points and holds the ends', () => {
+      fs.writeFileSync(process.env.NORMS_PATH!, JSON.stringify(NORMS));
+      const { convertTheta } = require('./norms');
+
+      expect(convertTheta('overall', 0.5).score).toBeCloseTo(115);
+      expect(convertTheta('overall', 0.5).percentile).toBeCloseTo(72.5);
+      expect(convertTheta('Gf', -0.25).score).toBeCloseTo(92.5);
+      expect(convertTheta('overall', 3)).toEqual({ score: 130, percentile: 95 });
+      expect(convertTheta('overall', -3)).toEqual({ score: 80, percentile: 10 });
+    });
+
+    it('reads θ as a standard normal score without a table', () => {
+      const { convertTheta } = require('./norms');
+
+      expect(convertTheta('overall', 1).score).toBeCloseTo(115);
+      expect(convertTheta('overall', 1).percentile).toBeCloseTo(84.13, 1);
+      expect(convertTheta('overall', 0).percentile).toBeCloseTo(50);
+    });
+
+    it('falls back for a scale the tables leave out', () => {
+      fs.writeFileSync(process.env.NORMS_PATH!, JSON.stringify(NORMS));
+      const { convertTheta } = require('./norms');
+
+      expect(convertTheta('Gs', -1).score).toBeCloseTo(85);
+    });
+  });
+
+  describe('scoreResponses', () => {
+    it('scores only the domains the session answered items in', () => {
+      fs.writeFileSync(process.env.NORMS_PATH!, JSON.stringify(NORMS));
+      const { scoreResponses, replayTheta, convertTheta } = require('./norms');
+      const responses = [
+        { domain: 'Gf', isCorrect: true, difficulty: 0, discrimination: 1 },
+        { domain: 'Gv', isCorrect: false, difficulty: 0.5, discrimination: 1.2 },
+        { domain: 'Gf', isCorrect: false, difficulty: 1, discrimination: 0.8 },
+      ];
+
+      const { total, domains } = scoreResponses(responses);
+
+      expect(Object.keys(domains).sort()).toEqual(['Gf', 'Gv']);
+      expect(domains.Gc).toBeUndefined();
+      expect(domains.Gf).toEqual(convertTheta('Gf', replayTheta(responses.filter((r) => r.domain === 'Gf'))));
+      expect(total).toEqual(convertTheta('overall', replayTheta(responses)));
+    });
+  });
+});
@@ -0,0 +1,116 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { Domain } from '@iq-test/question-bank';
+import { updateTheta } from './irt';
+
+/**
+ * θ → IQ / percentile conversion tables written by `python -m iqbank.norming`.
+ * Each scale (`overall` and one per domain) is sampled on the grid
+ * thetaMin + k * thetaStep; the θ being converted is the engine's updateTheta
+ * replayed over the session's responses, as in iqbank/norming.py.
+ */
+interface NormTables {
+  thetaMin: number;
+  thetaStep: number;
+  scales: Record<string, { iq: number[]; percentile: number[] }>;
+}
+
+export interface ScoredResponse {
+  domain: string;
+  isCorrect: boolean;
+  difficulty: number;
+  discrimination: number;
+}
+
+export interface ScaleScore {
+  score: number;
+  percentile: number;
+}
+
+const DOMAINS: Domain[] = ['Gf', 'Gc', 'Gwm', 'Gv', 'Gs'];
+const LEARNING_RATE = 0.5;
+const THETA_BOUND = 3;
+
+let cachedNorms: NormTables | null | undefined;
+
+function loadNorms(): NormTables | null {
+  if (cachedNorms !== undefined) {
+    return cachedNorms;
+  }
+  const normsPath = process.env.NORMS_PATH ?? path.join(__dirname, 'norms.json');
+  cachedNorms = fs.existsSync(normsPath)
+    ? (JSON.parse(fs.readFileSync(normsPath, 'utf-8')) as NormTables)
+    : null;
+  return cachedNorms;
+}
+
+/**
+ * Standard normal CDF (Abramowitz & Stegun 7.1.26), matching iqbank/norming.py
+ */
+function normalCdf(x: number): number {
+  const z = Math.abs(x) / Math.SQRT2;
+  const t = 1 / (1 + 0.3275911 * z);
+  const poly =
+    t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))));
+  const erf = 1 - poly * Math.exp(-z * z);
+  return 0.5 * (1 + Math.sign(x) * erf);
+}
+
+function interpolate(values: number[], position: number): number {
+  const k = Math.max(0, Math.min(values.length - 1, position));
+  const lo = Math.floor(k);
+  const hi = Math.min(lo + 1, values.length - 1);
+  return values[lo] + (values[hi] - values[lo]) * (k - lo);
+}
+
+/**
+ * The engine's running θ after `responses`, in order
+ */
+export function replayTheta(responses: ScoredResponse[]): number {
+  return responses.reduce(
+    (theta, r) =>
+      Math.max(
+        -THETA_BOUND,
+        Math.min(
+          THETA_BOUND,
+          updateTheta(theta, r.isCorrect, { difficulty: r.difficulty, discrimination: r.discrimination }, LEARNING_RATE)
+        )
+      ),
+    0
+  );
+}
+
+/**
+ * IQ and percentile for θ on `scale`. Without a norm table for the scale,
+ * θ is read as a standard normal score.
+ */
+export function convertTheta(scale: string, theta: number): ScaleScore {
+  const table = loadNorms();
+  const scaleTable = table?.scales[scale];
+  if (!table || !scaleTable) {
+    return { score: 100 + 15 * theta, percentile: 100 * normalCdf(theta) };
+  }
+  const position = (theta - table.thetaMin) / table.thetaStep;
+  return {
+    score: interpolate(scaleTable.iq, position),
+    percentile: interpolate(scaleTable.percentile, position),
+  };
+}
+
+/**
+ * Overall and per-domain scores for a session's responses, in answer order.
+ * Domains with no responses are omitted rather than scored at θ = 0.
+ */
+export function scoreResponses(responses: ScoredResponse[]): {
+  total: ScaleScore;
+  domains: Partial<Record<Domain, ScaleScore>>;
+} {
+  const domains: Partial<Record<Domain, ScaleScore>> = {};
+  DOMAINS.forEach((domain) => {
+    const answered = responses.filter((r) => r.domain === domain);
+    if (answered.length > 0) {
+      domains[domain] = convertTheta(domain, replayTheta(answered));
+    }
+  });
+  return { total: convertTheta('overall', replayTheta(responses)), domains };
+}
@@ -0,0 +1,37 @@
+import { AdministeredItem, FIXED_LENGTH_RULE, shouldStop, standardError } from './stopping';
+
+function administered(count: number, domain: AdministeredItem['domain'] = 'Gf'): AdministeredItem[] {
+  return Array.from({ length: count }, () => ({ domain, difficulty: 0, discrimination: 1.5 }));
+}
+
+describe('Stopping rules', () => {
+  it('stops the fixed-length test at 20 items', () => {
+    expect(shouldStop(FIXED_LENGTH_RULE, 0, administered(19))).toBe(false);
+    expect(shouldStop(FIXED_LENGTH_RULE, 0, administered(20))).toBe(true);
+  });
+
+  it('stops once the standard error is small enough, after the minimum length', () => {
+    const rule = { minLength: 5, maxLength: 30, seThreshold: 0.5 };
+    // Each item adds a² p (1 - p) = 0.5625 information at θ = b
+    expect(standardError(0, administered(8))).toBeCloseTo(1 / Math.sqrt(4.5));
+
+    expect(shouldStop(rule, 0, administered(4))).toBe(false);
+    expect(shouldStop(rule, 0, administered(7))).toBe(false);
+    expect(shouldStop(rule, 0, administered(8))).toBe(true);
+  });
+
+  it('waits for every domain minimum', () => {
+    const rule = { minLength: 5, maxLength: 30, seThreshold: 0.5, domainMinimums: { Gc: 1 } };
+
+    expect(shouldStop(rule, 0, administered(10))).toBe(false);
+    expect(shouldStop(rule, 0, [...administered(10), ...administered(1, 'Gc')])).toBe(true);
+  });
+
+  it('stops when no remaining item is informative, however large the bank', () => {
+    const rule = { minLength: 5, maxLength: 30, infoThreshold: 0.1 };
+    const remaining = Array.from({ length: 200_000 }, () => ({ difficulty: 5, discrimination: 1 }));
+
+    expect(shouldStop(rule, 0, administered(5), remaining)).toBe(true);
+    expect(shouldStop(rule, 0, administered(5), [...remaining, { difficulty: 0, discrimination: 1 }])).toBe(false);
+  });
+});
@@ -0,0 +1,71 @@
+import { Domain } from '@iq-test/question-bank';
+import { IRTItem, calculateItemInformation, calculateTestInformation } from './irt';
+
+/**
+ * Variable-length stopping rule. Mirrors iqbank/stopping.py, where rule
+ * parameters are chosen by simulation against the real bank.
+ */
+export interface StoppingRule {
+  minLength: number;
+  maxLength: number;
+  seThreshold?: number; // stop once 1 / sqrt(test information at θ) <= this
+  infoThreshold?: number; // stop once no remaining item adds this much information
+  domainMinimums?: Partial<Record<Domain, number>>;
+}
+
+/** The current behaviour: a fixed 20-item test. */
+export const FIXED_LENGTH_RULE: StoppingRule = { minLength: 20, maxLength: 20 };
+
+export interface AdministeredItem extends IRTItem {
+  domain: Domain;
+}
+
+/**
+ * Standard error of θ from the 2-PL test information of the administered items
+ */
+export function standardError(theta: number, administered: IRTItem[]): number {
+  const info = calculateTestInformation(theta, administered);
+  return info > 0 ? 1 / Math.sqrt(info) : Infinity;
+}
+
+/**
+ * Decide whether a session at `theta` that has taken `administered` should stop.
+ * `remaining` (items not yet administered) is only needed for infoThreshold.
+ */
+export function shouldStop(
+  rule: StoppingRule,
+  theta: number,
+  administered: AdministeredItem[],
+  remaining: IRTItem[] = []
+): boolean {
+  const length = administered.length;
+  if (length >= rule.maxLength) {
+    return true;
+  }
+  if (rule.seThreshold === undefined && rule.infoThreshold === undefined) {
+    return false;
+  }
+  if (length < rule.minLength) {
+    return false;
+  }
+
+  for (const [domain, minimum] of Object.entries(rule.domainMinimums ?? {})) {
+    const count = administered.filter((item) => item.domain === domain).length;
+    if (count < (minimum ?? 0)) {
+      return false;
+    }
+  }
+
+  if (rule.seThreshold !== undefined && standardError(theta, administered) <= rule.seThreshold) {
+    return true;
+  }
+  if (rule.infoThreshold !== undefined) {
+    // A loop, not Math.max(...spread): spreading a 100k+ item bank overflows the call stack
+    let maxInfo = -Infinity;
+    for (const item of remaining) {
+      maxInfo = Math.max(maxInfo, calculateItemInformation(theta, item));
+    }
+    return maxInfo < rule.infoThreshold;
+  }
+  return false;
+}
@@ -1,6 +1,14 @@
-import json
+import sys
 import uuid
 import random
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from iqbank.publish import bump_version
+from iqbank.rescale import rescale_questions
+from iqbank.store import BankStore
 
 domains = ['Gf', 'Gc', 'Gwm', 'Gv', 'Gs']
 
@@ -192,6 +200,8 @@ existing_questions = [
 
 final_questions = existing_questions.copy()
 
+# Provisional parameters until the items collect enough responses for
+# `python -m iqbank.calibrate` to fit them.
 for q in new_questions:
     q["id"] = str(uuid.uuid4())
     q["difficulty"] = round(random.uniform(0.3, 0.8), 2)
@@ -199,13 +209,9 @@ for q in new_questions:
     q["guessing"] = 0.25
     final_questions.append(q)
 
-output = {
-    "version": "1.1.0",
-    "lastUpdated": "2025-11-24T00:00:00Z",
-    "questions": final_questions
-}
-
-with open('packages/question-bank/src/questions.json', 'w', encoding='utf-8') as f:
-    json.dump(output, f, ensure_ascii=False, indent=2)
+# Replaces the whole bank, so it goes out as the next major version rather than a pinned one.
+store = BankStore()
+store.replace(rescale_questions(final_questions), version=bump_version(store.load()["version"], "major"),
+              last_updated=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
 
 print(f"Generated {len(final_questions)} questions")